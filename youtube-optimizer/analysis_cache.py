@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Кеш результатів аналізу відео між запусками (таблиця analysis_cache в каталозі)
+Ключ - відбиток (назва, опис, теги, версія правил), тому при наступному запуску
+заново рахуються тільки нові відео та відео, в яких змінились метадані.
+Версія правил - хеш файлів з правилами: після зміни правил кеш перестає збігатися.
+Читання результату з кешу (відбиток, SQLite, json.loads) коштує приблизно як аналіз
+відео з описом на ~1000 символів: кеш виграє тільки на довших описах
+(python benchmarks.py cache). SEO оцінку (мікросекунди на відео) кешувати не варто
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from catalog import CATALOG_DB, open_catalog
+
+# Скільки відбитків шукати в базі одним запитом
+LOOKUP_CHUNK_SIZE = 500
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def rules_version(*files):
+    """Хеш вмісту файлів з правилами (шляхи відносно папки скриптів)"""
+    digest = hashlib.sha256()
+    for name in files:
+        with open(os.path.join(_BASE_DIR, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# optimize_videos: тип контенту, проблеми та оптимізовані опис/теги/заголовки
+REPORT_RULES_VERSION = rules_version('optimize_videos.py', 'generate_description.py', 'keyword_matcher.py')
+
+def fingerprint(kind, version, title, description, tags):
+    """Відбиток вхідних даних аналізу (поля розділені символом \\0, теги - символом \\1)"""
+    digest = hashlib.blake2b(f"{kind}\0{version}\0".encode('utf-8'), digest_size=16)
+    digest.update(title.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(description.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update('\1'.join(tags).encode('utf-8'))
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    Результати аналізу за відбитком метаданих відео.
+
+    Для кожного запису зберігається час, за який він був порахований,
+    тому print_summary показує, скільки часу заощадили влучання в кеш
+    та скільки коштувала робота з кешем (відбитки, читання та запис бази).
+    """
+
+    def __init__(self, db_path=CATALOG_DB):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.spent_seconds = 0.0
+        self.overhead_seconds = 0.0
+
+    def _lookup(self, db, fingerprints):
+        found = {}
+        fingerprints = list(fingerprints)
+        for start in range(0, len(fingerprints), LOOKUP_CHUNK_SIZE):
+            chunk = fingerprints[start:start + LOOKUP_CHUNK_SIZE]
+            rows = db.execute(
+                f"SELECT fingerprint, result, seconds FROM analysis_cache "
+                f"WHERE fingerprint IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                found[row[0]] = (json.loads(row[1]), row[2])
+        return found
+
+    def map(self, kind, version, items, compute):
+        """
+        Результати для items - кортежів (title, description, tags) - в тому ж порядку.
+        compute(items) рахує результати тільки для відсутніх у кеші (кожен відбиток один раз).
+        """
+        started = time.perf_counter()
+        keys = [fingerprint(kind, version, *item) for item in items]
+        db = open_catalog(self.db_path)
+        db.row_factory = None
+        try:
+            results = self._lookup(db, set(keys))
+            missing = {}
+            for key, item in zip(keys, items):
+                if key in results:
+                    self.hits += 1
+                    self.saved_seconds += results[key][1]
+                else:
+                    self.misses += 1
+                    missing.setdefault(key, item)
+
+            elapsed = 0.0
+            if missing:
+                compute_started = time.perf_counter()
+                computed = compute(list(missing.values()))
+                elapsed = time.perf_counter() - compute_started
+                self.spent_seconds += elapsed
+                seconds = elapsed / len(missing)
+                now = datetime.now().isoformat()
+                db.executemany(
+                    'INSERT OR REPLACE INTO analysis_cache (fingerprint, kind, result, seconds, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(key, kind, json.dumps(result, ensure_ascii=False), seconds, now)
+                     for key, result in zip(missing, computed)]
+                )
+                db.commit()
+                # Результати складаються тільки зі списків, словників, рядків і чисел,
+                # тому щойно пораховані збігаються з тими, що будуть прочитані з кешу
+                for key, result in zip(missing, computed):
+                    results[key] = (result, seconds)
+        finally:
+            db.close()
+        self.overhead_seconds += time.perf_counter() - started - elapsed
+        return [results[key][0] for key in keys]
+
+    def print_summary(self):
+        """Частка відео з кешу та заощаджений час"""
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"\n🗃️  Кеш аналізу: з кешу {self.hits}/{total} відео ({self.hits / total:.0%}), "
+              f"пораховано заново {self.misses} за {self.spent_seconds:.2f} с")
+        print(f"   Заощаджено обчислень ~{self.saved_seconds:.2f} с, робота з кешем {self.overhead_seconds:.2f} с")
+
+def benchmark(count=5000):
+    """Аналіз без кешу проти читання з заповненого кешу для коротких і довгих описів"""
+    from optimize_videos import _analyze_contents, _synthetic_videos, _video_content
+
+    print(f"⏱  Звіти оптимізації, {count} відео:")
+    with tempfile.TemporaryDirectory() as directory:
+        for repeat_description in (1, 10, 40):
+            items = []
+            for video in _synthetic_videos(count):
+                video['snippet']['description'] *= repeat_description
+                items.append(_video_content(video))
+            average = sum(len(item[1]) for item in items) // count
+
+            started = time.perf_counter()
+            expected = _analyze_contents(items)
+            compute_time = time.perf_counter() - started
+
+            cache = AnalysisCache(os.path.join(directory, f'cache{repeat_description}.sqlite3'))
+            cache.map('video_report', REPORT_RULES_VERSION, items, _analyze_contents)
+            started = time.perf_counter()
+            actual = cache.map('video_report', REPORT_RULES_VERSION, items, _analyze_contents)
+            cached_time = time.perf_counter() - started
+
+            print(f"   опис ~{average:5} символів: аналіз {compute_time:6.3f} с, "
+                  f"з кешу {cached_time:6.3f} с (x{compute_time / cached_time:.1f}), "
+                  f"результат однаковий: {'так' if expected == actual else 'НІ'}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Кеш результатів аналізу відео')
+    parser.add_argument('command', choices=['stats', 'clear'], help='Команда')
+    parser.add_argument('--db', default=CATALOG_DB, help='Шлях до бази каталогу')
+    args = parser.parse_args()
+
+    db = open_catalog(args.db)
+    try:
+        if args.command == 'clear':
+            deleted = db.execute('DELETE FROM analysis_cache').rowcount
+            db.commit()
+            print(f"🧹 Видалено записів кешу: {deleted}")
+            return
+        for row in db.execute(
+            'SELECT kind, COUNT(*) AS total, SUM(seconds) AS seconds, MAX(created_at) AS created_at '
+            'FROM analysis_cache GROUP BY kind'
+        ):
+            print(f"{row['kind']}: {row['total']} записів (~{row['seconds']:.2f} с обчислень, "
+                  f"останній {row['created_at']})")
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,18 @@
 Аналізує поточну оптимізацію та дає рекомендації
 """
 
+import argparse
 import os
 import json
-from googleapiclient.discovery import build
+from youtube_client import build_youtube, print_api_usage
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
+from catalog import get_catalog_videos, load_channel
+from fields import CHANNEL_DETAILS, VIDEO_DETAILS, read_params
+from channel_resolver import get_channel_id, get_uploads_playlist_id
+from parallel_fetch import DEFAULT_WORKERS, ParallelFetcher, fetch_playlist_videos
+from video_fetch import fetch_videos_by_ids, format_video_details, iter_playlist_videos, report_missing
+from seo_scoring import analyze_videos_seo, seo_distribution
 
 load_dotenv()
 
@@ -16,30 +23,12 @@ load_dotenv()
 API_KEY = os.getenv('YOUTUBE_API_KEY')
 CHANNEL_HANDLE = os.getenv('CHANNEL_ID', '@SmartBabies')
 
-def get_channel_id(youtube, handle):
-    """Отримує Channel ID з handle (@SmartBabies)"""
-    try:
-        request = youtube.search().list(
-            part='snippet',
-            q=handle,
-            type='channel',
-            maxResults=1
-        )
-        response = request.execute()
-        
-        if response['items']:
-            return response['items'][0]['snippet']['channelId']
-        return None
-    except HttpError as e:
-        print(f'Помилка пошуку каналу: {e}')
-        return None
-
 def analyze_channel(youtube, channel_id):
     """Аналізує інформацію про канал"""
     try:
         request = youtube.channels().list(
-            part='snippet,statistics,contentDetails',
-            id=channel_id
+            id=channel_id,
+            **read_params(CHANNEL_DETAILS)
         )
         response = request.execute()
         
@@ -47,52 +36,52 @@ def analyze_channel(youtube, channel_id):
             print('Канал не знайдено')
             return None
             
-        channel = response['items'][0]
-        stats = channel['statistics']
-        snippet = channel['snippet']
-        
-        return {
-            'title': snippet['title'],
-            'description': snippet['description'],
-            'subscribers': int(stats.get('subscriberCount', 0)),
-            'total_views': int(stats.get('viewCount', 0)),
-            'video_count': int(stats.get('videoCount', 0)),
-            'custom_url': snippet.get('customUrl', ''),
-            'published_at': snippet['publishedAt'],
-            'keywords': snippet.get('keywords', ''),
-            'country': snippet.get('country', ''),
-            'playlist_id': channel['contentDetails']['relatedPlaylists']['uploads']
-        }
+        return format_channel_data(response['items'][0])
     except HttpError as e:
         print(f'Помилка отримання даних каналу: {e}')
         return None
 
-def get_recent_videos(youtube, playlist_id, max_results=10):
-    """Отримує останні відео з каналу"""
+def format_channel_data(channel):
+    """Перетворює відповідь channels().list у запис для аналізу"""
+    stats = channel['statistics']
+    snippet = channel['snippet']
+    
+    return {
+        'title': snippet['title'],
+        'description': snippet['description'],
+        'subscribers': int(stats.get('subscriberCount', 0)),
+        'total_views': int(stats.get('viewCount', 0)),
+        'video_count': int(stats.get('videoCount', 0)),
+        'custom_url': snippet.get('customUrl', ''),
+        'published_at': snippet['publishedAt'],
+        'keywords': snippet.get('keywords', ''),
+        'country': snippet.get('country', ''),
+        'playlist_id': channel['contentDetails']['relatedPlaylists']['uploads']
+    }
+
+def get_recent_videos(youtube, playlist_id, max_results=10, fetcher=None):
+    """Отримує останні відео з каналу (паралельно, якщо передано ParallelFetcher)"""
     try:
-        videos = []
-        next_page_token = None
-        
-        while len(videos) < max_results:
-            request = youtube.playlistItems().list(
-                part='snippet,contentDetails',
-                playlistId=playlist_id,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
+        missing_ids = []
+        if fetcher:
+            raw_videos = fetch_playlist_videos(
+                fetcher,
+                playlist_id,
+                max_results=max_results,
+                missing_ids=missing_ids,
+                **read_params(VIDEO_DETAILS)
             )
-            response = request.execute()
-            
-            for item in response['items']:
-                video_id = item['contentDetails']['videoId']
-                video_data = get_video_details(youtube, video_id)
-                if video_data:
-                    videos.append(video_data)
-            
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-                
-        return videos[:max_results]
+        else:
+            raw_videos = iter_playlist_videos(
+                youtube,
+                playlist_id,
+                max_results=max_results,
+                missing_ids=missing_ids,
+                **read_params(VIDEO_DETAILS)
+            )
+        videos = [format_video_details(video) for video in raw_videos]
+        report_missing(missing_ids)
+        return videos
     except HttpError as e:
         print(f'Помилка отримання відео: {e}')
         return []
@@ -100,90 +89,22 @@ def get_recent_videos(youtube, playlist_id, max_results=10):
 def get_video_details(youtube, video_id):
     """Отримує детальну інформацію про відео"""
     try:
-        request = youtube.videos().list(
-            part='snippet,statistics,contentDetails',
-            id=video_id
-        )
-        response = request.execute()
+        videos, _ = fetch_videos_by_ids(youtube, [video_id], **read_params(VIDEO_DETAILS))
         
-        if not response['items']:
+        if not videos:
             return None
-            
-        video = response['items'][0]
-        snippet = video['snippet']
-        stats = video['statistics']
         
-        return {
-            'id': video_id,
-            'title': snippet['title'],
-            'description': snippet['description'],
-            'tags': snippet.get('tags', []),
-            'published_at': snippet['publishedAt'],
-            'views': int(stats.get('viewCount', 0)),
-            'likes': int(stats.get('likeCount', 0)),
-            'comments': int(stats.get('commentCount', 0)),
-            'duration': video['contentDetails']['duration'],
-            'category_id': snippet.get('categoryId', ''),
-            'thumbnails': snippet.get('thumbnails', {}),
-            'has_custom_thumbnail': 'high' in snippet.get('thumbnails', {})
-        }
+        return format_video_details(videos[0])
     except HttpError as e:
         print(f'Помилка отримання даних відео {video_id}: {e}')
         return None
 
 def analyze_video_seo(video):
-    """Аналізує SEO оптимізацію відео"""
-    issues = []
-    recommendations = []
-    
-    title = video['title']
-    description = video['description']
-    tags = video.get('tags', [])
-    
-    # Аналіз заголовку
-    if len(title) < 30:
-        issues.append('Заголовок занадто короткий (мінімум 30 символів)')
-    elif len(title) > 60:
-        issues.append('Заголовок занадто довгий (макс 60 символів для повного відображення)')
-    
-    if 'SmartBabies' not in title and 'ScoopyCap' not in title:
-        recommendations.append('Додайте назву бренду до заголовку')
-    
-    # Аналіз опису
-    desc_length = len(description)
-    if desc_length < 200:
-        issues.append(f'Опис занадто короткий ({desc_length} символів, мінімум 200)')
-        recommendations.append('Розширте опис до мінімум 200 символів')
-    elif desc_length < 1000:
-        recommendations.append('Ідеальний опис для SEO має 1000+ символів')
-    
-    # Перевірка наявності посилань
-    if 'http' not in description:
-        recommendations.append('Додайте посилання на ваш сайт/соцмережі в опис')
-    
-    # Перевірка тегів
-    if len(tags) < 10:
-        issues.append(f'Занадто мало тегів ({len(tags)}, рекомендується 10-15)')
-    elif len(tags) > 15:
-        issues.append(f'Занадто багато тегів ({len(tags)}, максимум 15)')
-    
-    # Перевірка таймкодів
-    if '# ' not in description and '0:00' not in description:
-        recommendations.append('Додайте таймкоди до опису для кращої навігації')
-    
-    # Перевірка хештегів
-    hashtags = [word for word in description.split() if word.startswith('#')]
-    if len(hashtags) < 3:
-        recommendations.append('Додайте хештеги (3-5 штук) в опис відео')
-    
-    return {
-        'issues': issues,
-        'recommendations': recommendations,
-        'seo_score': max(0, 100 - (len(issues) * 15 + len(recommendations) * 5))
-    }
+    """Аналізує SEO оптимізацію відео (правила - в seo_scoring, як для всього каталогу)"""
+    return analyze_videos_seo([video])[0]
 
-def print_analysis_report(channel_data, videos):
-    """Виводить звіт аналізу"""
+def print_analysis_report(channel_data, videos, analysis=None):
+    """Виводить звіт аналізу (analysis - готові результати analyze_video_seo по відео)"""
     print("\n" + "="*70)
     print("📊 АНАЛІЗ КАНАЛУ SMARTBABIES")
     print("="*70)
@@ -213,7 +134,7 @@ def print_analysis_report(channel_data, videos):
         print(f"\n--- Відео {i}: {video['title'][:60]}... ---")
         print(f"Перегляди: {video['views']:,} | Лайки: {video['likes']:,}")
         
-        seo_analysis = analyze_video_seo(video)
+        seo_analysis = analysis[i - 1] if analysis is not None else analyze_video_seo(video)
         total_seo_score += seo_analysis['seo_score']
         
         print(f"📈 SEO Score: {seo_analysis['seo_score']}/100")
@@ -236,12 +157,26 @@ def print_analysis_report(channel_data, videos):
     print("="*70)
 
 def main():
+    parser = argparse.ArgumentParser(description='Аналіз YouTube каналу SmartBabies')
+    parser.add_argument(
+        '--catalog',
+        action='store_true',
+        help='Читати дані з локального каталогу (з інкрементальною синхронізацією)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Кількість паралельних потоків для читання з API'
+    )
+    args = parser.parse_args()
+    
     if not API_KEY:
         print("❌ Помилка: YOUTUBE_API_KEY не знайдено в .env файлі")
         print("📝 Створіть .env файл та додайте ваш API ключ")
         return
     
-    youtube = build('youtube', 'v3', developerKey=API_KEY)
+    youtube = build_youtube(api_key=API_KEY)
     
     print("🔍 Шукаю канал SmartBabies...")
     channel_id = get_channel_id(youtube, CHANNEL_HANDLE)
@@ -253,28 +188,41 @@ def main():
     print(f"✅ Канал знайдено! ID: {channel_id}")
     print("📊 Аналізую канал...")
     
-    channel_data = analyze_channel(youtube, channel_id)
+    if args.catalog:
+        catalog_videos = get_catalog_videos(youtube, channel_id, max_results=10)
+        channel = load_channel(channel_id)
+        channel_data = format_channel_data(channel) if channel else None
+        videos = [format_video_details(video) for video in catalog_videos]
+    else:
+        # Канал та відео завантажуються паралельно, кожен потік - зі своїм клієнтом
+        with ParallelFetcher(lambda: build_youtube(api_key=API_KEY), args.workers) as fetcher:
+            channel_future = fetcher.submit(analyze_channel, channel_id)
+            playlist_id = get_uploads_playlist_id(youtube, channel_id)
+            videos = get_recent_videos(youtube, playlist_id, max_results=10, fetcher=fetcher)
+            channel_data = channel_future.result()
     
     if not channel_data:
         print("❌ Не вдалося отримати дані каналу")
         return
     
     print("🎥 Аналізую останні відео...")
-    videos = get_recent_videos(youtube, channel_data['playlist_id'], max_results=10)
     
-    print_analysis_report(channel_data, videos)
+    analysis = analyze_videos_seo(videos)
+    print_analysis_report(channel_data, videos, analysis)
     
     # Збереження результатів
     report = {
         'channel': channel_data,
         'videos': videos,
-        'analysis': [analyze_video_seo(v) for v in videos]
+        'analysis': analysis,
+        'seo_distribution': seo_distribution([result['seo_score'] for result in analysis])
     }
     
     with open('analysis_report.json', 'w', encoding='utf-8') as f:
         json.dump(report, f, ensure_ascii=False, indent=2)
     
     print("\n💾 Результати збережено в analysis_report.json")
+    print_api_usage()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Асинхронний клієнт YouTube Data API для завантаження каталогу
+Сторінки playlistItems гортаються послідовно, а videos().list для кожної
+сторінки запускається одразу, не чекаючи наступних сторінок.
+Запити проходять через той самий облік квоти та RateLimiter (повтори 429/5xx,
+зупинка на quotaExceeded), що й запити googleapiclient
+"""
+
+import asyncio
+import json
+import os
+import threading
+from urllib.parse import urlencode
+import httplib2
+import requests
+from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
+from http_cache import _extract_etag
+from fields import PLAYLIST_PAGE_FIELDS, VIDEO_DETAILS, read_params
+from rate_limiter import RateLimiter, error_reason
+from video_fetch import chunked, format_video_details
+
+load_dotenv()
+
+API_BASE_URL = os.getenv('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
+DEFAULT_CONCURRENCY = int(os.getenv('YOUTUBE_ASYNC_CONCURRENCY', 8))
+
+class AsyncApiError(Exception):
+    """Помилка відповіді API (status >= 400)"""
+
+    def __init__(self, status, reason, message):
+        super().__init__(f'{status} {reason}: {message}')
+        self.status = status
+        self.reason = reason
+
+class AsyncYouTubeClient:
+    """
+    Асинхронний клієнт тільки для читання (API ключ).
+
+    Args:
+        api_key: YouTube API ключ
+        base_url: адреса API (для тестів - локальний сервер)
+        concurrency: максимум одночасних HTTP запитів (asyncio.Semaphore)
+        cache: ETagCache для умовних запитів (необов'язково)
+        ledger: QuotaLedger для обліку квоти (необов'язково)
+        limiter: RateLimiter для повторів 429/5xx (за замовчуванням - власний)
+    """
+
+    def __init__(self, api_key, base_url=API_BASE_URL, concurrency=DEFAULT_CONCURRENCY,
+                 cache=None, ledger=None, limiter=None, timeout=30):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.ledger = ledger
+        self.limiter = limiter or RateLimiter()
+        self.timeout = timeout
+        self._semaphore = None
+        self._local = threading.local()
+
+    def _session(self):
+        # requests.Session не потокобезпечна - по одній на потік
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _request(self, url, headers):
+        response = self._session().get(url, headers=headers, timeout=self.timeout)
+        if response.status_code >= 400:
+            # HttpError, як у googleapiclient - RateLimiter.execute класифікує його так само
+            raise HttpError(httplib2.Response({'status': response.status_code}), response.content,
+                            uri=url.split('?')[0])
+        # ETag з заголовка або з тіла відповіді - так само, як у CachingHttp
+        return response.status_code, _extract_etag(response.headers, response.content), response.content
+
+    def _charged_request(self, method_id, url, headers):
+        # Квота списується за кожну спробу (як quota.LedgerHttpRequest) і поза event loop:
+        # запис журналу та очікування бюджету (defer) не блокують інші запити
+        if self.ledger is not None:
+            self.ledger.charge(method_id)
+        return self._request(url, headers)
+
+    async def get(self, resource, **params):
+        """GET /{resource} з параметрами; повертає JSON відповідь"""
+        params = {key: value for key, value in params.items() if value is not None}
+        params['key'] = self.api_key
+        url = f'{self.base_url}/{resource}?{urlencode(sorted(params.items()))}'
+
+        method_id = f'youtube.{resource}.list'
+        headers = {'Accept': 'application/json'}
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            headers['If-None-Match'] = entry[0]
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                # Повтори з backoff виконуються в тому ж потоці, слот semaphore залишається зайнятим
+                status, etag, content = await asyncio.to_thread(
+                    self.limiter.execute, method_id, lambda: self._charged_request(method_id, url, headers)
+                )
+            except HttpError as e:
+                try:
+                    message = json.loads(e.content)['error'].get('message', '')
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    message = e.content[:200].decode('utf-8', 'replace')
+                raise AsyncApiError(e.resp.status, error_reason(e) or 'unknown', message) from e
+
+        if status == 304 and entry is not None:
+            self.cache.record_hit(entry[2])
+            return json.loads(entry[2])
+
+        if self.cache is not None:
+            self.cache.record_miss()
+            if etag:
+                self.cache.put(url, etag, {'status': '200', 'etag': etag}, content)
+        return json.loads(content)
+
+    async def fetch_videos_by_ids(self, video_ids, part='snippet,statistics,contentDetails', fields=None):
+        """Як video_fetch.fetch_videos_by_ids: (videos у порядку video_ids, missing_ids)"""
+        responses = await asyncio.gather(*[
+            self.get('videos', part=part, id=','.join(chunk), maxResults=len(chunk), fields=fields)
+            for chunk in chunked(list(video_ids))
+        ])
+        found = {item['id']: item for response in responses for item in response.get('items', [])}
+        videos = [found[video_id] for video_id in video_ids if video_id in found]
+        missing_ids = [video_id for video_id in video_ids if video_id not in found]
+        return videos, missing_ids
+
+    async def iter_playlist_pages(self, playlist_id):
+        """Асинхронний генератор сторінок плейлиста (списки ID відео)"""
+        next_page_token = None
+        while True:
+            response = await self.get(
+                'playlistItems',
+                part='contentDetails',
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=next_page_token,
+                fields=PLAYLIST_PAGE_FIELDS
+            )
+            yield [item['contentDetails']['videoId'] for item in response['items']]
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                return
+
+    async def get_playlist_videos(self, playlist_id, part='snippet,statistics,contentDetails',
+                                  max_results=None, missing_ids=None, stop_ids=None, fields=None):
+        """
+        Відео плейлиста у форматі videos().list (як get_all_videos).
+
+        Кожна сторінка одразу запускає задачу videos().list, поки гортається наступна.
+        stop_ids: зупинитись на першому відео з цієї множини (інкрементальна синхронізація).
+        """
+        tasks = []
+        requested = 0
+        async for page_ids in self.iter_playlist_pages(playlist_id):
+            stop = False
+            if stop_ids:
+                for index, video_id in enumerate(page_ids):
+                    if video_id in stop_ids:
+                        page_ids, stop = page_ids[:index], True
+                        break
+            if max_results is not None:
+                page_ids = page_ids[:max_results - requested]
+            if page_ids:
+                tasks.append(asyncio.create_task(self.fetch_videos_by_ids(page_ids, part=part, fields=fields)))
+                requested += len(page_ids)
+            if stop or (max_results is not None and requested >= max_results):
+                break
+
+        videos = []
+        for page_videos, missing in await asyncio.gather(*tasks):
+            videos.extend(page_videos)
+            if missing_ids is not None:
+                missing_ids.extend(missing)
+        return videos
+
+    async def get_video_details(self, video_id):
+        """Як analyze_channel.get_video_details"""
+        videos, _ = await self.fetch_videos_by_ids([video_id], **read_params(VIDEO_DETAILS))
+        return format_video_details(videos[0]) if videos else None
+
+    async def get_recent_videos(self, playlist_id, max_results=10):
+        """Як analyze_channel.get_recent_videos"""
+        videos = await self.get_playlist_videos(playlist_id, max_results=max_results,
+                                                **read_params(VIDEO_DETAILS))
+        return [format_video_details(video) for video in videos]
+
+    async def get_channel(self, channel_id, part='snippet,statistics,contentDetails', fields=None):
+        """Канал у форматі channels().list або None"""
+        response = await self.get('channels', part=part, id=channel_id, fields=fields)
+        return response['items'][0] if response.get('items') else None
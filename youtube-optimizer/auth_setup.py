@@ -8,7 +8,7 @@ import os
 import pickle
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from youtube_client import build_youtube
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,13 +16,12 @@ load_dotenv()
 # Scope для редагування відео
 SCOPES = ['https://www.googleapis.com/auth/youtube.force-ssl']
 
-def get_credentials():
+def get_credentials(token_file='token.pickle'):
     """
     Отримує валідні credentials для YouTube API.
     Створює OAuth flow якщо потрібно.
     """
     creds = None
-    token_file = 'token.pickle'
     
     # Перевірка чи є збережений токен
     if os.path.exists(token_file):
@@ -55,12 +54,12 @@ def get_credentials():
     
     return creds
 
-def get_youtube_service():
-    """Повертає авторизований YouTube сервіс"""
-    creds = get_credentials()
+def get_youtube_service(token_file='token.pickle', ledger=None, limiter=None):
+    """Повертає авторизований YouTube сервіс (token_file - окремий токен для кожного каналу)"""
+    creds = get_credentials(token_file)
     if not creds:
         return None
-    return build('youtube', 'v3', credentials=creds)
+    return build_youtube(credentials=creds, ledger=ledger, limiter=limiter)
 
 if __name__ == '__main__':
     print("🔐 Налаштування OAuth автентифікації...")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Оновлення метаданих відео
+До 50 videos().update в одному multipart запиті замість окремого запиту на кожне відео.
+Оновлення будується від уже отриманого snippet: відправляються тільки відео,
+в яких title/description/tags дійсно відрізняються, з If-Match по ETag
+"""
+
+import hashlib
+import json
+import re
+from googleapiclient.errors import HttpError
+from quota import QuotaExceededError
+from rate_limiter import classify_error
+from video_fetch import chunked, fetch_videos_by_ids
+from fields import VIDEO_UPDATE, read_params
+
+# Рекомендований максимум запитів в одному batch
+MAX_BATCH_SIZE = 50
+
+def apply_metadata(snippet, title=None, description=None, tags=None):
+    """Повертає копію snippet з новими title/description/tags (None - без змін)"""
+    snippet = dict(snippet)
+    if title is not None:
+        snippet['title'] = title
+    if description is not None:
+        snippet['description'] = description
+    if tags is not None:
+        snippet['tags'] = tags[:15]  # YouTube обмежує до 15
+    return snippet
+
+# Поля snippet, які змінює оптимізатор
+METADATA_FIELDS = ('title', 'description', 'tags')
+
+def metadata_diff(snippet, new_snippet):
+    """Поля з METADATA_FIELDS, які відрізняються: {field: (було, стане)}"""
+    diff = {}
+    for field in METADATA_FIELDS:
+        default = [] if field == 'tags' else ''
+        old, new = snippet.get(field, default), new_snippet.get(field, default)
+        if old != new:
+            diff[field] = (old, new)
+    return diff
+
+_SPACES = re.compile(r'[ \t\u00a0]+')
+
+def _normalize_text(text):
+    # Пробіли в кінці рядків, \r\n та порожні рядки на початку/в кінці не є зміною
+    lines = [_SPACES.sub(' ', line).strip() for line in text.replace('\r\n', '\n').split('\n')]
+    return '\n'.join(lines).strip('\n')
+
+def metadata_hash(title, description, tags):
+    """
+    Канонічний хеш (title, description, tags): пробіли нормалізовані,
+    теги відсортовані (порядок тегів не є зміною). Теги обрізаються до 15, як при оновленні.
+    """
+    canonical = [
+        ' '.join(title.split()),
+        _normalize_text(description),
+        sorted(' '.join(tag.split()) for tag in (tags or [])[:15])
+    ]
+    return hashlib.sha256(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def snippet_hash(snippet):
+    """metadata_hash для snippet"""
+    return metadata_hash(snippet.get('title', ''), snippet.get('description', ''), snippet.get('tags', []))
+
+def build_update_request(youtube, video_id, snippet, etag=None):
+    """videos().update з If-Match: API поверне 412, якщо відео змінилося після читання"""
+    request = youtube.videos().update(part='snippet', body={'id': video_id, 'snippet': snippet})
+    if etag:
+        request.headers['If-Match'] = etag if etag.startswith('"') else f'"{etag}"'
+    return request
+
+def is_stale_error(error):
+    """412 Precondition Failed - snippet застарів (відео змінили після читання)"""
+    return isinstance(error, HttpError) and error.resp.status == 412
+
+def update_snippet(youtube, video_id, snippet, etag=None, title=None, description=None, tags=None):
+    """
+    Оновлює відео, якщо title/description/tags відрізняються від snippet.
+
+    Args:
+        snippet: snippet, отриманий при читанні (без повторного запиту)
+        etag: ETag відео з того ж читання (для If-Match)
+
+    Returns:
+        'updated', 'unchanged' або 'stale' (відео змінили після читання)
+    """
+    new_snippet = apply_metadata(snippet, title, description, tags)
+    if not metadata_diff(snippet, new_snippet):
+        return 'unchanged'
+    try:
+        build_update_request(youtube, video_id, new_snippet, etag).execute()
+    except HttpError as e:
+        if is_stale_error(e):
+            return 'stale'
+        raise
+    return 'updated'
+
+def fetch_update_snippets(youtube, video_ids):
+    """
+    Поточні snippet та etag відео для оновлення: {video_id: ресурс videos().list}.
+
+    Читається тільки snippet (VIDEO_UPDATE): etag ресурсу рахується від усіх
+    прочитаних part, тому etag з читання разом зі statistics змінюється з кожним
+    переглядом, і If-Match з ним відхиляв би оновлення як застарілі (412)
+    """
+    videos, _ = fetch_videos_by_ids(youtube, video_ids, **read_params(VIDEO_UPDATE))
+    return {video['id']: video for video in videos}
+
+def _charge(request):
+    # Запити в batch не проходять через execute(), тому квоту та токени списуємо вручну
+    ledger = getattr(request, 'ledger', None)
+    if ledger is not None:
+        ledger.charge(request.methodId)
+    limiter = getattr(request, 'limiter', None)
+    if limiter is not None:
+        limiter.acquire()
+
+def _result(success, status, error=None, retried=False):
+    return {'success': success, 'error': error, 'retried': retried, 'status': status}
+
+def batch_update_snippets(youtube, updates, batch_size=MAX_BATCH_SIZE):
+    """
+    Оновлює snippet для списку відео batch запитами.
+
+    Args:
+        youtube: авторизований YouTube API сервіс
+        updates: список словників {'video_id', 'title', 'description', 'tags'}
+            та (бажано) 'snippet' і 'etag' з попереднього читання
+        batch_size: кількість оновлень в одному batch запиті
+
+    Returns:
+        {video_id: {'success': bool, 'error': str або None, 'retried': bool, 'status': str}}
+        status: 'updated', 'unchanged', 'stale', 'failed' або 'quota'
+        (не оновлено через вичерпану квоту - решта batch не відправляється).
+        Елементи, що впали в batch, повторюються окремими запитами.
+    """
+    results = {}
+    updates_by_id = {update['video_id']: update for update in updates}
+
+    # update перезаписує snippet повністю; читаємо тільки ті, яких не передали
+    current = [
+        {'id': update['video_id'], 'snippet': update['snippet'], 'etag': update.get('etag')}
+        for update in updates if update.get('snippet') is not None
+    ]
+    to_fetch = [update['video_id'] for update in updates if update.get('snippet') is None]
+    if to_fetch:
+        try:
+            fetched, missing = fetch_videos_by_ids(youtube, to_fetch, **read_params(VIDEO_UPDATE))
+        except QuotaExceededError as e:
+            for video_id in to_fetch:
+                results[video_id] = _result(False, 'quota', str(e))
+            fetched, missing = [], []
+        current.extend(fetched)
+        for video_id in missing:
+            results[video_id] = _result(False, 'failed', 'Відео не знайдено')
+
+    bodies = {}
+    etags = {}
+    for video in current:
+        update = updates_by_id[video['id']]
+        snippet = apply_metadata(
+            video['snippet'],
+            update.get('title'),
+            update.get('description'),
+            update.get('tags')
+        )
+        if not metadata_diff(video['snippet'], snippet):
+            results[video['id']] = _result(True, 'unchanged')
+            continue
+        bodies[video['id']] = snippet
+        etags[video['id']] = video.get('etag')
+
+    quota_error = None
+    for chunk in chunked(list(bodies), batch_size):
+        if quota_error:
+            break
+
+        failed = []
+
+        def callback(request_id, response, exception):
+            nonlocal quota_error
+            if exception is None:
+                results[request_id] = _result(True, 'updated')
+            elif is_stale_error(exception):
+                # Повтор з тим самим ETag знову поверне 412
+                results[request_id] = _result(False, 'stale', str(exception))
+            elif isinstance(exception, HttpError) and classify_error(exception) == 'quota':
+                quota_error = QuotaExceededError(f'API повідомив про вичерпану денну квоту: {exception}')
+                results[request_id] = _result(False, 'quota', str(exception))
+            else:
+                failed.append((request_id, exception))
+
+        batch = youtube.new_batch_http_request(callback=callback)
+        queued = 0
+        for video_id in chunk:
+            request = build_update_request(youtube, video_id, bodies[video_id], etags[video_id])
+            try:
+                _charge(request)
+            except QuotaExceededError as e:
+                quota_error = e
+                break
+            batch.add(request, request_id=video_id)
+            queued += 1
+
+        if queued:
+            try:
+                batch.execute()
+            except HttpError as e:
+                # Впав весь batch - всі елементи підуть на повтор
+                failed = [(video_id, e) for video_id in chunk[:queued] if video_id not in results]
+
+        # Невдалі елементи повторюємо окремими запитами
+        for video_id, exception in failed:
+            if quota_error:
+                results[video_id] = _result(False, 'quota', str(quota_error))
+                continue
+            try:
+                build_update_request(youtube, video_id, bodies[video_id], etags[video_id]).execute()
+                results[video_id] = _result(True, 'updated', retried=True)
+            except HttpError as e:
+                status = 'stale' if is_stale_error(e) else 'failed'
+                results[video_id] = _result(False, status, str(e), retried=True)
+            except QuotaExceededError as e:
+                quota_error = e
+                results[video_id] = _result(False, 'quota', str(e))
+
+    if quota_error:
+        for video_id in bodies:
+            results.setdefault(video_id, _result(False, 'quota', str(quota_error)))
+
+    return results
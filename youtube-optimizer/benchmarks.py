@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Вимірювання швидкості та пам'яті частин оптимізатора на синтетичних даних (без мережі)
+Функції benchmark() лежать поруч з кодом, який вони вимірюють,
+а запускаються тільки звідси: python benchmarks.py seo
+"""
+
+import argparse
+import importlib
+
+# Назва -> (модуль з функцією benchmark(), що саме вимірюється)
+BENCHMARKS = {
+    'seo': ('seo_scoring', 'SEO оцінка по колонках проти оцінки по одному відео'),
+    'titles': ('title_rules', 'правила назв з попередньою перевіркою та без неї'),
+    'records': ('video_record', "пам'ять VideoRecord проти ресурсів API"),
+    'client': ('youtube_client', 'час до першого запиту API клієнта'),
+    'keywords': ('keyword_matcher', 'підрахунок ключових слів за один прохід'),
+    'descriptions': ('generate_description', 'генерація описів'),
+    'analysis': ('optimize_videos', 'аналіз відео послідовно та процесами'),
+    'cache': ('analysis_cache', 'аналіз відео проти читання з кешу аналізу'),
+}
+
+def run_benchmark(name):
+    """Імпортує модуль тільки вибраного benchmark та запускає його"""
+    module_name, _ = BENCHMARKS[name]
+    importlib.import_module(module_name).benchmark()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark частин оптимізатора',
+        epilog='\n'.join(f"{name:14} {description}" for name, (_, description) in BENCHMARKS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('names', nargs='+', choices=[*BENCHMARKS, 'all'], metavar='NAME',
+                        help='Які benchmark запустити (all - всі)')
+    args = parser.parse_args()
+
+    names = list(BENCHMARKS) if 'all' in args.names else args.names
+    for name in names:
+        print(f"\n▶️  {name}: {BENCHMARKS[name][1]}")
+        run_benchmark(name)
+
+if __name__ == '__main__':
+    main()
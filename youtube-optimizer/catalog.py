@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Локальний каталог каналу (SQLite)
+Зберігає канал та відео (snippet, statistics, contentDetails) між запусками,
+щоб скрипти не завантажували весь uploads плейлист з нуля
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+from datetime import datetime
+from youtube_client import (
+    build_youtube, get_default_cache, get_default_ledger, get_default_limiter, print_api_usage
+)
+from googleapiclient.errors import HttpError
+from dotenv import load_dotenv
+from async_client import AsyncYouTubeClient, DEFAULT_CONCURRENCY
+from channel_resolver import get_channel_id
+from fields import CATALOG_CHANNEL, CATALOG_VIDEO, PLAYLIST_PAGE_FIELDS, read_params
+from video_fetch import chunked, fetch_videos_by_ids
+from video_record import VideoRecord
+
+load_dotenv()
+
+CATALOG_DB = os.getenv('CATALOG_DB', 'catalog.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    etag TEXT,
+    snippet TEXT,
+    statistics TEXT,
+    content_details TEXT,
+    synced_at TEXT,
+    full_sync_at TEXT
+);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    published_at TEXT,
+    etag TEXT,
+    snippet TEXT,
+    statistics TEXT,
+    content_details TEXT,
+    synced_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_videos_channel
+    ON videos (channel_id, published_at DESC);
+CREATE TABLE IF NOT EXISTS applied_metadata (
+    video_id TEXT PRIMARY KEY,
+    metadata_hash TEXT NOT NULL,
+    applied_at TEXT
+);
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    fingerprint TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    result TEXT NOT NULL,
+    seconds REAL,
+    created_at TEXT
+);
+"""
+
+def open_catalog(db_path=CATALOG_DB):
+    """Відкриває (або створює) базу каталогу"""
+    db = sqlite3.connect(db_path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+def _now():
+    return datetime.now().isoformat()
+
+def _dumps(value):
+    return json.dumps(value or {}, ensure_ascii=False)
+
+def save_channel(db, channel, full_sync=False):
+    """Записує канал, якщо його etag змінився. Повертає True якщо рядок оновлено"""
+    row = db.execute(
+        'SELECT etag FROM channels WHERE channel_id = ?', (channel['id'],)
+    ).fetchone()
+    now = _now()
+    if row and row['etag'] == channel.get('etag'):
+        db.execute('UPDATE channels SET synced_at = ? WHERE channel_id = ?', (now, channel['id']))
+        changed = False
+    else:
+        db.execute(
+            '''INSERT INTO channels (channel_id, etag, snippet, statistics, content_details, synced_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (channel_id) DO UPDATE SET
+                   etag = excluded.etag,
+                   snippet = excluded.snippet,
+                   statistics = excluded.statistics,
+                   content_details = excluded.content_details,
+                   synced_at = excluded.synced_at''',
+            (channel['id'], channel.get('etag'), _dumps(channel.get('snippet')),
+             _dumps(channel.get('statistics')), _dumps(channel.get('contentDetails')), now)
+        )
+        changed = True
+    if full_sync:
+        db.execute('UPDATE channels SET full_sync_at = ? WHERE channel_id = ?', (now, channel['id']))
+    return changed
+
+def save_video(db, channel_id, video):
+    """Записує (або замінює) рядок відео"""
+    db.execute(
+        '''INSERT OR REPLACE INTO videos
+           (video_id, channel_id, published_at, etag, snippet, statistics, content_details, synced_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        (video['id'], channel_id, video.get('snippet', {}).get('publishedAt'), video.get('etag'),
+         _dumps(video.get('snippet')), _dumps(video.get('statistics')),
+         _dumps(video.get('contentDetails')), _now())
+    )
+
+def load_applied_hashes(db_path=CATALOG_DB):
+    """Хеші метаданих, застосованих оптимізатором: {video_id: metadata_hash}"""
+    db = open_catalog(db_path)
+    try:
+        rows = db.execute('SELECT video_id, metadata_hash FROM applied_metadata')
+        return {row['video_id']: row['metadata_hash'] for row in rows}
+    finally:
+        db.close()
+
+def save_applied_hash(video_id, metadata_hash, db_path=CATALOG_DB):
+    """Запам'ятовує хеш метаданих після успішного оновлення відео"""
+    db = open_catalog(db_path)
+    try:
+        db.execute(
+            'INSERT OR REPLACE INTO applied_metadata (video_id, metadata_hash, applied_at) VALUES (?, ?, ?)',
+            (video_id, metadata_hash, _now())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def _known_etags(db, channel_id):
+    rows = db.execute('SELECT video_id, etag FROM videos WHERE channel_id = ?', (channel_id,))
+    return {row['video_id']: row['etag'] for row in rows}
+
+def _fetch_new_video_ids(youtube, playlist_id, known_ids, stop_at_known):
+    """
+    Гортає playlistItems (нові відео йдуть першими) і збирає невідомі ID.
+    Якщо stop_at_known - зупиняється на першому вже відомому відео.
+    """
+    new_ids = []
+    next_page_token = None
+    while True:
+        response = youtube.playlistItems().list(
+            part='contentDetails',
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=next_page_token,
+            fields=PLAYLIST_PAGE_FIELDS
+        ).execute()
+
+        for item in response['items']:
+            video_id = item['contentDetails']['videoId']
+            if video_id in known_ids:
+                if stop_at_known:
+                    return new_ids
+                continue
+            new_ids.append(video_id)
+
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            return new_ids
+
+def sync_catalog(youtube, channel_id, db_path=CATALOG_DB, full=False, refresh_existing=True):
+    """
+    Синхронізує локальний каталог з YouTube.
+
+    Args:
+        full: гортати весь uploads плейлист (інакше - до першого відомого відео)
+        refresh_existing: перевірити відомі відео пачками по 50 та
+            перезаписати тільки ті, в яких змінився etag
+
+    Returns:
+        словник зі статистикою синхронізації
+    """
+    stats = {'new': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'channel_updated': False}
+    db = open_catalog(db_path)
+    try:
+        response = youtube.channels().list(id=channel_id, **read_params(CATALOG_CHANNEL)).execute()
+        if not response['items']:
+            print(f'❌ Канал {channel_id} не знайдено')
+            return stats
+        channel = response['items'][0]
+        playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+
+        # Інкрементальний режим можливий тільки після хоча б однієї повної синхронізації
+        row = db.execute(
+            'SELECT full_sync_at FROM channels WHERE channel_id = ?', (channel_id,)
+        ).fetchone()
+        full = full or not (row and row['full_sync_at'])
+
+        known = _known_etags(db, channel_id)
+        new_ids = _fetch_new_video_ids(youtube, playlist_id, known, stop_at_known=not full)
+
+        new_videos, _ = fetch_videos_by_ids(youtube, new_ids, **read_params(CATALOG_VIDEO))
+        for video in new_videos:
+            save_video(db, channel_id, video)
+        stats['new'] = len(new_videos)
+
+        if refresh_existing and known:
+            for chunk in chunked(list(known)):
+                videos, missing = fetch_videos_by_ids(youtube, chunk, **read_params(CATALOG_VIDEO))
+                _apply_refreshed(db, channel_id, known, videos, missing, stats)
+
+        stats['channel_updated'] = save_channel(db, channel, full_sync=full)
+        db.commit()
+        return stats
+    finally:
+        db.close()
+
+def _apply_refreshed(db, channel_id, known, videos, missing, stats):
+    """Перезаписує відомі відео зі зміненим etag та видаляє зниклі"""
+    for video in videos:
+        if video.get('etag') != known[video['id']]:
+            save_video(db, channel_id, video)
+            stats['updated'] += 1
+        else:
+            stats['unchanged'] += 1
+    # Видалені або приватні відео прибираємо з каталогу
+    for video_id in missing:
+        db.execute('DELETE FROM videos WHERE video_id = ?', (video_id,))
+        stats['removed'] += 1
+
+async def _sync_catalog_async(client, db, channel_id, full, refresh_existing, stats):
+    channel = await client.get_channel(channel_id, **read_params(CATALOG_CHANNEL))
+    if channel is None:
+        print(f'❌ Канал {channel_id} не знайдено')
+        return
+    playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+
+    row = db.execute(
+        'SELECT full_sync_at FROM channels WHERE channel_id = ?', (channel_id,)
+    ).fetchone()
+    full = full or not (row and row['full_sync_at'])
+    known = _known_etags(db, channel_id)
+
+    # Нові відео та перевірка відомих виконуються одночасно
+    listing = client.get_playlist_videos(
+        playlist_id, stop_ids=None if full else set(known), **read_params(CATALOG_VIDEO)
+    )
+    if refresh_existing and known and not full:
+        listed, (refreshed, missing) = await asyncio.gather(
+            listing, client.fetch_videos_by_ids(list(known), **read_params(CATALOG_VIDEO))
+        )
+    else:
+        listed, refreshed, missing = await listing, [], []
+
+    listed_known = [video for video in listed if video['id'] in known]
+    for video in listed:
+        if video['id'] not in known:
+            save_video(db, channel_id, video)
+            stats['new'] += 1
+
+    if full and refresh_existing:
+        # При повній синхронізації відомі відео вже прийшли з плейлиста
+        seen = {video['id'] for video in listed}
+        refreshed, missing = await client.fetch_videos_by_ids(
+            [video_id for video_id in known if video_id not in seen], **read_params(CATALOG_VIDEO)
+        )
+        refreshed = listed_known + refreshed
+    _apply_refreshed(db, channel_id, known, refreshed, missing, stats)
+
+    stats['channel_updated'] = save_channel(db, channel, full_sync=full)
+
+def sync_catalog_async(api_key, channel_id, db_path=CATALOG_DB, full=False, refresh_existing=True,
+                       concurrency=DEFAULT_CONCURRENCY, ledger=None):
+    """
+    Те саме що sync_catalog, але через AsyncYouTubeClient: сторінки плейлиста
+    та пачки videos().list завантажуються конвеєром з обмеженням concurrency.
+    """
+    stats = {'new': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'channel_updated': False}
+    client = AsyncYouTubeClient(api_key, concurrency=concurrency,
+                                cache=get_default_cache(), ledger=ledger or get_default_ledger(),
+                                limiter=get_default_limiter())
+    db = open_catalog(db_path)
+    try:
+        asyncio.run(_sync_catalog_async(client, db, channel_id, full, refresh_existing, stats))
+        db.commit()
+        return stats
+    finally:
+        db.close()
+
+def _row_to_resource(row, id_column):
+    return {
+        'id': row[id_column],
+        'etag': row['etag'],
+        'snippet': json.loads(row['snippet']),
+        'statistics': json.loads(row['statistics']),
+        'contentDetails': json.loads(row['content_details'])
+    }
+
+def load_channel(channel_id, db_path=CATALOG_DB):
+    """Повертає канал з каталогу у форматі відповіді channels().list"""
+    db = open_catalog(db_path)
+    try:
+        row = db.execute('SELECT * FROM channels WHERE channel_id = ?', (channel_id,)).fetchone()
+        return _row_to_resource(row, 'channel_id') if row else None
+    finally:
+        db.close()
+
+def iter_videos(channel_id, max_results=None, db_path=CATALOG_DB):
+    """Генератор відео з каталогу (нові першими): рядки читаються з бази по одному"""
+    db = open_catalog(db_path)
+    try:
+        query = 'SELECT * FROM videos WHERE channel_id = ? ORDER BY published_at DESC'
+        params = [channel_id]
+        if max_results is not None:
+            query += ' LIMIT ?'
+            params.append(max_results)
+        for row in db.execute(query, params):
+            yield _row_to_resource(row, 'video_id')
+    finally:
+        db.close()
+
+def load_videos(channel_id, max_results=None, db_path=CATALOG_DB):
+    """Повертає відео з каталогу (нові першими) у форматі відповіді videos().list"""
+    return list(iter_videos(channel_id, max_results=max_results, db_path=db_path))
+
+# Поля VideoRecord читаються з JSON колонок самою SQLite, без розбору всього snippet
+RECORD_COLUMNS = """
+    video_id, etag, published_at,
+    json_extract(snippet, '$.title') AS title,
+    json_extract(snippet, '$.tags') AS tags,
+    json_extract(snippet, '$.categoryId') AS category_id,
+    json_extract(snippet, '$.defaultLanguage') AS default_language,
+    json_extract(snippet, '$.defaultAudioLanguage') AS default_audio_language,
+    json_extract(snippet, '$.thumbnails.high') IS NOT NULL AS has_custom_thumbnail,
+    json_extract(statistics, '$.viewCount') AS views,
+    json_extract(statistics, '$.likeCount') AS likes,
+    json_extract(statistics, '$.commentCount') AS comments,
+    json_extract(content_details, '$.duration') AS duration
+"""
+
+class CatalogDescriptions:
+    """Читає опис відео з каталогу при першому зверненні (description_loader для VideoRecord)"""
+
+    def __init__(self, db_path=CATALOG_DB):
+        self.db_path = db_path
+        self._db = None
+
+    def __call__(self, video_id):
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        row = self._db.execute(
+            "SELECT json_extract(snippet, '$.description') FROM videos WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        return row[0] if row and row[0] is not None else ''
+
+    def __getstate__(self):
+        # З'єднання не передається в інші процеси - відкривається заново
+        return {'db_path': self.db_path}
+
+    def __setstate__(self, state):
+        self.db_path = state['db_path']
+        self._db = None
+
+def _row_to_record(row, description_loader=None):
+    return VideoRecord(
+        id=row['video_id'],
+        etag=row['etag'],
+        title=row['title'],
+        description=None if description_loader else row['description'] or '',
+        tags=json.loads(row['tags']) if row['tags'] else (),
+        category_id=row['category_id'],
+        default_language=row['default_language'],
+        default_audio_language=row['default_audio_language'],
+        published_at=row['published_at'],
+        views=int(row['views'] or 0),
+        likes=int(row['likes'] or 0),
+        comments=int(row['comments'] or 0),
+        duration=row['duration'],
+        has_custom_thumbnail=bool(row['has_custom_thumbnail']),
+        description_loader=description_loader
+    )
+
+def iter_video_records(channel_id, max_results=None, db_path=CATALOG_DB, lazy_description=False):
+    """
+    Генератор VideoRecord з каталогу (нові першими).
+    lazy_description=True - опис читається з бази тільки при зверненні до record.description
+    """
+    description_loader = CatalogDescriptions(db_path) if lazy_description else None
+    db = open_catalog(db_path)
+    try:
+        columns = RECORD_COLUMNS
+        if not lazy_description:
+            columns += ", json_extract(snippet, '$.description') AS description"
+        query = f'SELECT {columns} FROM videos WHERE channel_id = ? ORDER BY published_at DESC'
+        params = [channel_id]
+        if max_results is not None:
+            query += ' LIMIT ?'
+            params.append(max_results)
+        for row in db.execute(query, params):
+            yield _row_to_record(row, description_loader)
+    finally:
+        db.close()
+
+def get_catalog_videos(youtube, channel_id, max_results=None, db_path=CATALOG_DB, stream=False,
+                       records=False, lazy_description=False):
+    """
+    Синхронізує каталог і повертає відео з локальної бази
+    (stream=True - генератор замість списку, records=True - VideoRecord замість ресурсів API)
+    """
+    try:
+        stats = sync_catalog(youtube, channel_id, db_path=db_path)
+        print_sync_stats(stats)
+    except HttpError as e:
+        print(f'⚠️  Не вдалося синхронізувати каталог, використовую локальні дані: {e}')
+    if records:
+        videos = iter_video_records(channel_id, max_results=max_results, db_path=db_path,
+                                    lazy_description=lazy_description)
+        return videos if stream else list(videos)
+    if stream:
+        return iter_videos(channel_id, max_results=max_results, db_path=db_path)
+    return load_videos(channel_id, max_results=max_results, db_path=db_path)
+
+def print_sync_stats(stats):
+    """Виводить результат синхронізації"""
+    print(f"🗄️  Каталог: нових {stats['new']}, оновлено {stats['updated']}, "
+          f"без змін {stats['unchanged']}, видалено {stats['removed']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальний каталог відео каналу')
+    parser.add_argument('command', choices=['sync', 'stats'], help='Команда')
+    parser.add_argument('--full', action='store_true', help='Повна синхронізація всього плейлиста')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help='Не перевіряти вже відомі відео (тільки нові)')
+    parser.add_argument('--db', default=CATALOG_DB, help='Шлях до бази каталогу')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Асинхронне завантаження (для великих каналів)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Максимум одночасних запитів в асинхронному режимі')
+
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        db = open_catalog(args.db)
+        for row in db.execute(
+            'SELECT channel_id, COUNT(*) AS total, MAX(synced_at) AS synced_at '
+            'FROM videos GROUP BY channel_id'
+        ):
+            print(f"{row['channel_id']}: {row['total']} відео (синхронізовано {row['synced_at']})")
+        db.close()
+        return
+
+    api_key = os.getenv('YOUTUBE_API_KEY')
+    if not api_key:
+        print("❌ YOUTUBE_API_KEY не знайдено в .env")
+        return
+
+    youtube = build_youtube(api_key=api_key)
+    channel_handle = os.getenv('CHANNEL_ID', '@SmartBabies')
+
+    channel_id = get_channel_id(youtube, channel_handle)
+    if not channel_id:
+        print(f"❌ Канал {channel_handle} не знайдено")
+        return
+
+    print(f"🔄 Синхронізую каталог каналу {channel_handle}...")
+    if args.use_async:
+        stats = sync_catalog_async(api_key, channel_id, db_path=args.db, full=args.full,
+                                   refresh_existing=not args.no_refresh, concurrency=args.concurrency)
+    else:
+        stats = sync_catalog(youtube, channel_id, db_path=args.db,
+                             full=args.full, refresh_existing=not args.no_refresh)
+    print_sync_stats(stats)
+    print_api_usage()
+
+if __name__ == '__main__':
+    main()
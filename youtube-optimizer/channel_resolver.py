@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Визначення Channel ID та uploads плейлиста за handle (@SmartBabies)
+Використовує channels().list(forHandle=...) (1 одиниця квоти замість 100 у search)
+та зберігає результат у локальному кеші
+"""
+
+import json
+import os
+import threading
+from googleapiclient.errors import HttpError
+from dotenv import load_dotenv
+from fields import CHANNEL_UPLOADS, read_params
+
+load_dotenv()
+
+CHANNEL_CACHE_FILE = os.getenv('YOUTUBE_CHANNEL_CACHE', 'channel_cache.json')
+
+_lock = threading.Lock()
+
+def _normalize(handle):
+    """Handle нечутливий до регістру; Channel ID повертаємо як є"""
+    handle = handle.strip()
+    if is_channel_id(handle):
+        return handle
+    return '@' + handle.lstrip('@').lower()
+
+def is_channel_id(value):
+    """Channel ID має вигляд UC + 22 символи"""
+    return value.startswith('UC') and len(value) == 24
+
+def _load_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(path, cache):
+    if not path:
+        return
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def resolve_channel(youtube, handle, cache_path=CHANNEL_CACHE_FILE):
+    """
+    Повертає {'channel_id': ..., 'uploads_playlist_id': ...} для handle або Channel ID.
+    None якщо канал не знайдено.
+    """
+    key = _normalize(handle)
+    with _lock:
+        cached = _load_cache(cache_path).get(key)
+    if cached:
+        return cached
+
+    try:
+        if is_channel_id(key):
+            response = youtube.channels().list(id=key, **read_params(CHANNEL_UPLOADS)).execute()
+        else:
+            response = youtube.channels().list(forHandle=key, **read_params(CHANNEL_UPLOADS)).execute()
+    except HttpError as e:
+        print(f'Помилка пошуку каналу: {e}')
+        return None
+
+    if not response.get('items'):
+        return None
+
+    channel = response['items'][0]
+    resolved = {
+        'channel_id': channel['id'],
+        'uploads_playlist_id': channel['contentDetails']['relatedPlaylists']['uploads']
+    }
+
+    with _lock:
+        cache = _load_cache(cache_path)
+        cache[key] = resolved
+        cache[channel['id']] = resolved
+        _save_cache(cache_path, cache)
+    return resolved
+
+def get_channel_id(youtube, handle):
+    """Отримує Channel ID з handle (@SmartBabies)"""
+    channel = resolve_channel(youtube, handle)
+    return channel['channel_id'] if channel else None
+
+def get_uploads_playlist_id(youtube, channel_id):
+    """Отримує ID плейлиста uploads для каналу"""
+    channel = resolve_channel(youtube, channel_id)
+    return channel['uploads_playlist_id'] if channel else None
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Архів оптимізованих описів (один файл замість optimized_<id>.txt на кожне відео)
+Кожне відео стискається окремо (zlib) і дописується в кінець файлу по мірі
+надходження; індекс {video_id: (зсув, довжина)} записується в кінці файлу,
+тому будь-яке відео читається без розпакування решти
+"""
+
+import argparse
+import json
+import os
+import struct
+import zlib
+
+BUNDLE_FILE = 'optimized_descriptions.bundle'
+
+MAGIC = b'SBDB1\n'
+# Кінець файлу: зсув та довжина стиснутого індексу + MAGIC
+TRAILER = struct.Struct('<QQ6s')
+
+class DescriptionBundleWriter:
+    """Запис архіву: add() для кожного відео, close() дописує індекс"""
+
+    def __init__(self, path=BUNDLE_FILE, level=6):
+        self.path = path
+        self.level = level
+        self.index = {}
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+    def add(self, video_id, title, description, tags):
+        """Додає оптимізовані опис і теги відео (повторний video_id замінює попередній в індексі)"""
+        data = zlib.compress(json.dumps({
+            'video_id': video_id,
+            'title': title,
+            'description': description,
+            'tags': tags
+        }, ensure_ascii=False).encode('utf-8'), self.level)
+        offset = self._file.tell()
+        self._file.write(data)
+        self.index[video_id] = (offset, len(data))
+
+    def add_report(self, video_report):
+        """Додає відео зі звіту optimize_videos.build_video_report"""
+        self.add(video_report['video_id'], video_report['current']['title'],
+                 video_report['optimized']['description'], video_report['optimized']['tags'])
+
+    def close(self):
+        if self._file.closed:
+            return
+        index = zlib.compress(json.dumps(self.index).encode('utf-8'), self.level)
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(TRAILER.pack(offset, len(index), MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DescriptionBundle:
+    """Читання архіву: в пам'ять завантажується тільки індекс"""
+
+    def __init__(self, path=BUNDLE_FILE):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} не є архівом описів")
+        self._file.seek(-TRAILER.size, os.SEEK_END)
+        offset, length, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"Архів {path} не завершений (немає індексу)")
+        self._file.seek(offset)
+        self.index = json.loads(zlib.decompress(self._file.read(length)))
+
+    def get(self, video_id):
+        """{'video_id', 'title', 'description', 'tags'} або None, якщо відео немає в архіві"""
+        entry = self.index.get(video_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        self._file.seek(offset)
+        return json.loads(zlib.decompress(self._file.read(length)))
+
+    def __contains__(self, video_id):
+        return video_id in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def format_entry(entry):
+    """Текст у форматі колишніх файлів optimized_<id>.txt"""
+    return (
+        f"ВІДЕО: {entry['title']}\n"
+        f"ID: {entry['video_id']}\n"
+        + "="*70 + "\n\n"
+        "ОПТИМІЗОВАНИЙ ОПИС:\n"
+        + "="*70 + "\n\n"
+        + entry['description']
+        + "\n\n" + "="*70 + "\n"
+        "ОПТИМІЗОВАНІ ТЕГИ:\n"
+        + "="*70 + "\n"
+        + ", ".join(entry['tags'])
+        + "\n"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Перегляд архіву оптимізованих описів')
+    parser.add_argument('video_ids', nargs='*', help='ID відео (без ID - список відео в архіві)')
+    parser.add_argument('--bundle', default=BUNDLE_FILE, help='Файл архіву')
+    parser.add_argument('--export', metavar='DIR',
+                        help='Зберегти вказані відео як optimized_<id>.txt у папку DIR')
+    args = parser.parse_args()
+
+    try:
+        bundle = DescriptionBundle(args.bundle)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    with bundle:
+        if not args.video_ids:
+            print(f"📦 {args.bundle}: {len(bundle)} відео")
+            for video_id in bundle:
+                print(f"   {video_id}")
+            return
+
+        if args.export:
+            os.makedirs(args.export, exist_ok=True)
+        for video_id in args.video_ids:
+            entry = bundle.get(video_id)
+            if entry is None:
+                print(f"❌ Відео {video_id} немає в архіві")
+                continue
+            if args.export:
+                path = os.path.join(args.export, f"optimized_{video_id}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(format_entry(entry))
+                print(f"✅ {path}")
+            else:
+                print(format_entry(entry))
+
+if __name__ == '__main__':
+    main()
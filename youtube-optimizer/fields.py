@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Часткові відповіді YouTube Data API (параметр fields=)
+Кожне місце читання оголошує, які поля ресурсу воно використовує,
+а part та fields для запиту будуються з цього оголошення
+"""
+
+# Поля snippet, які приймає videos().update. update перезаписує snippet повністю,
+# тому там, де прочитаний snippet відправляється назад, потрібні всі ці поля
+VIDEO_UPDATE_SNIPPET = ('title', 'description', 'tags', 'categoryId', 'defaultLanguage', 'defaultAudioLanguage')
+
+# analyze_channel: video_fetch.format_video_details
+VIDEO_DETAILS = {
+    'snippet': ('title', 'description', 'tags', 'publishedAt', 'categoryId', 'thumbnails'),
+    'statistics': ('viewCount', 'likeCount', 'commentCount'),
+    'contentDetails': ('duration',),
+}
+
+# Оновлення метаданих (batch_update, update_video_metadata, fix_video_title)
+VIDEO_UPDATE = {
+    'snippet': VIDEO_UPDATE_SNIPPET,
+}
+
+# optimize_videos.generate_optimization_report -> update_videos.
+# etag звідси не годиться для If-Match (змінюється разом зі statistics), тому перед
+# оновленням snippet та etag перечитуються з VIDEO_UPDATE (batch_update.fetch_update_snippets)
+VIDEO_REPORT = {
+    'snippet': VIDEO_UPDATE_SNIPPET,
+    'statistics': ('viewCount', 'likeCount'),
+}
+
+# fix_truncated_titles: відбір за title/description, snippet потім йде в update
+TRUNCATED_TITLES = VIDEO_UPDATE
+
+# analyze_channel.format_channel_data
+CHANNEL_DETAILS = {
+    'snippet': ('title', 'description', 'customUrl', 'publishedAt', 'country'),
+    'statistics': ('subscriberCount', 'viewCount', 'videoCount'),
+    'contentDetails': ('relatedPlaylists/uploads',),
+}
+
+# channel_resolver: тільки ID каналу та uploads плейлиста
+CHANNEL_UPLOADS = {
+    'contentDetails': ('relatedPlaylists/uploads',),
+}
+
+# get_playlists.get_channel_playlists
+PLAYLIST_TITLES = {
+    'snippet': ('title',),
+}
+
+# Сторінка playlistItems: тільки ID відео
+PLAYLIST_PAGE_FIELDS = 'nextPageToken,items/contentDetails/videoId'
+
+def merge(*specs):
+    """Об'єднання оголошень (порядок полів зберігається)"""
+    merged = {}
+    for spec in specs:
+        for part, keys in spec.items():
+            existing = merged.setdefault(part, ())
+            merged[part] = existing + tuple(key for key in keys if key not in existing)
+    return merged
+
+# Каталог обслуговує всі скрипти, тому зберігає об'єднання їхніх полів
+CATALOG_VIDEO = merge(VIDEO_DETAILS, VIDEO_REPORT)
+CATALOG_CHANNEL = CHANNEL_DETAILS
+
+def parts(spec):
+    """Значення part= для оголошення"""
+    return ','.join(spec)
+
+def fields_mask(spec, paged=False):
+    """
+    Значення fields= для оголошення.
+
+    id та etag ресурсу запитуються завжди (кеш, каталог, If-Match),
+    etag відповіді - для умовних запитів.
+    """
+    item_fields = ['id', 'etag'] + [f"{part}({','.join(keys)})" for part, keys in spec.items()]
+    mask = f"etag,items({','.join(item_fields)})"
+    if paged:
+        mask += ',nextPageToken'
+    return mask
+
+def read_params(spec, paged=False):
+    """part та fields для list() запиту: youtube.videos().list(id=..., **read_params(SPEC))"""
+    return {'part': parts(spec), 'fields': fields_mask(spec, paged)}
@@ -6,15 +6,25 @@
 
 import json
 import os
-import time
 from datetime import datetime
-from googleapiclient.discovery import build
+from youtube_client import build_youtube, print_api_usage
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from auth_setup import get_youtube_service
+from catalog import get_catalog_videos
+from quota import QuotaExceededError
+from batch_update import batch_update_snippets, fetch_update_snippets, update_snippet
+from channel_resolver import get_channel_id, get_uploads_playlist_id
+from fields import TRUNCATED_TITLES, VIDEO_UPDATE, read_params
+from journal import DONE_STATUSES, UpdateJournal
+from title_rules import TRUNCATED_TITLE_RULES
+from video_fetch import fetch_videos_by_ids, iter_playlist_videos, report_missing
+from video_record import VideoRecord
 
 load_dotenv()
 
+FIX_TITLES_JOURNAL_FILE = 'fix_titles_journal.jsonl'
+
 def fix_truncated_title(title):
     """Відновлює обрізану назву до повної"""
     # Видаляємо "..." в кінці
@@ -26,25 +36,8 @@ def fix_truncated_title(title):
         # Знаходимо останнє повне слово перед "..."
         parts = title.split('...')
         if len(parts) > 1:
-            # Беремо першу частину і додаємо логічне завершення
-            first_part = parts[0].strip()
-            if first_part.endswith('Alpa'):
-                return first_part.replace('Alpa', 'Alphabet')
-            elif first_part.endswith('Miss Polly Had A Doll'):
-                return first_part + 'y'
-            elif first_part.endswith('Five Little Ghosts'):
-                return first_part + ' 👻'
-            elif first_part.endswith('Captain Scoopy Cap presents'):
-                return first_part + ' Adventure'
-            # Українські слова
-            elif first_part.endswith('Хе'):
-                return first_part.replace('Хе', 'Хеловін')
-            elif 'Хе...' in first_part:
-                return first_part.replace('Хе...', 'Хеловін')
-            elif first_part.endswith('привидів?'):
-                return first_part + ' Хеловін'
-            else:
-                return first_part
+            # Беремо першу частину і додаємо логічне завершення (правила - в title_rules.tsv)
+            return TRUNCATED_TITLE_RULES.apply(parts[0].strip())
     
     return title
 
@@ -59,148 +52,148 @@ def get_original_title_from_description(description):
                 return line
     return None
 
-def fix_video_title(youtube, video_id, current_title, description):
-    """Виправляє назву конкретного відео"""
-    try:
-        # Отримуємо поточні дані відео
-        video_response = youtube.videos().list(
-            part='snippet',
-            id=video_id
-        ).execute()
-        
-        if not video_response['items']:
-            print(f"  ⚠️  Відео {video_id} не знайдено")
-            return False
-        
-        video = video_response['items'][0]
-        snippet = video['snippet']
-        
-        # Відновлюємо назву
-        fixed_title = fix_truncated_title(current_title)
-        
-        # Якщо назва все ще виглядає обрізаною, намагаємося відновити з опису
-        if '...' in fixed_title or len(fixed_title) < 20:
-            original_from_desc = get_original_title_from_description(description)
-            if original_from_desc and len(original_from_desc) > len(fixed_title):
-                fixed_title = original_from_desc
+def build_fixed_title(current_title, description):
+    """Повна назва з емодзі та брендом для обрізаної назви"""
+    # Відновлюємо назву
+    fixed_title = fix_truncated_title(current_title)
+    
+    # Якщо назва все ще виглядає обрізаною, намагаємося відновити з опису
+    if '...' in fixed_title or len(fixed_title) < 20:
+        original_from_desc = get_original_title_from_description(description)
+        if original_from_desc and len(original_from_desc) > len(fixed_title):
+            fixed_title = original_from_desc
+    
+    # Додаємо емодзі та бренд якщо потрібно
+    if not any(ord(c) > 127 for c in fixed_title[:2]):
+        # Визначаємо тип контенту для емодзі
+        if 'alphabet' in fixed_title.lower() or 'abc' in fixed_title.lower():
+            emoji = '🔤'
+        elif 'number' in fixed_title.lower() or 'count' in fixed_title.lower():
+            emoji = '🔢'
+        elif 'color' in fixed_title.lower():
+            emoji = '🎨'
+        elif 'song' in fixed_title.lower() or 'music' in fixed_title.lower():
+            emoji = '🎵'
+        elif 'scoopycap' in fixed_title.lower() or 'adventure' in fixed_title.lower():
+            emoji = '🛸'
+        else:
+            emoji = '🎯'
         
-        # Додаємо емодзі та бренд якщо потрібно
-        if not any(ord(c) > 127 for c in fixed_title[:2]):
-            # Визначаємо тип контенту для емодзі
-            if 'alphabet' in fixed_title.lower() or 'abc' in fixed_title.lower():
-                emoji = '🔤'
-            elif 'number' in fixed_title.lower() or 'count' in fixed_title.lower():
-                emoji = '🔢'
-            elif 'color' in fixed_title.lower():
-                emoji = '🎨'
-            elif 'song' in fixed_title.lower() or 'music' in fixed_title.lower():
-                emoji = '🎵'
-            elif 'scoopycap' in fixed_title.lower() or 'adventure' in fixed_title.lower():
-                emoji = '🛸'
-            else:
-                emoji = '🎯'
-            
-            fixed_title = f"{emoji} {fixed_title}"
+        fixed_title = f"{emoji} {fixed_title}"
+    
+    # Додаємо бренд якщо немає
+    if 'SmartBabies' not in fixed_title and 'ScoopyCap' not in fixed_title:
+        if ' | ' in fixed_title:
+            parts = fixed_title.split(' | ', 1)
+            fixed_title = f"{parts[0]} | SmartBabies {parts[1]}"
+        else:
+            fixed_title = f"{fixed_title} | SmartBabies"
+    
+    return fixed_title
+
+def fix_video_title(youtube, video_id, current_title, description, snippet=None, etag=None):
+    """
+    Виправляє назву конкретного відео
+
+    snippet та etag - з попереднього читання тільки snippet (без повторного запиту);
+    якщо відео змінили після читання, API відхилить оновлення (412).
+
+    Returns:
+        (status, назва): status - 'updated', 'unchanged', 'stale' або 'failed'
+    """
+    try:
+        if snippet is None:
+            # Немає даних з попереднього читання - отримуємо поточні
+            videos, _ = fetch_videos_by_ids(youtube, [video_id], **read_params(VIDEO_UPDATE))
+            if not videos:
+                print(f"  ⚠️  Відео {video_id} не знайдено")
+                return 'failed', current_title
+            snippet, etag = videos[0]['snippet'], videos[0].get('etag')
         
-        # Додаємо бренд якщо немає
-        if 'SmartBabies' not in fixed_title and 'ScoopyCap' not in fixed_title:
-            if ' | ' in fixed_title:
-                parts = fixed_title.split(' | ', 1)
-                fixed_title = f"{parts[0]} | SmartBabies {parts[1]}"
-            else:
-                fixed_title = f"{fixed_title} | SmartBabies"
+        fixed_title = build_fixed_title(current_title, description)
         
         # Оновлюємо назву
-        snippet['title'] = fixed_title
+        status = update_snippet(youtube, video_id, snippet, etag, title=fixed_title)
+        if status == 'stale':
+            print(f"  ⚠️  Відео {video_id} змінилося після читання, пропускаю")
+            return status, current_title
         
-        update_response = youtube.videos().update(
-            part='snippet',
-            body={
-                'id': video_id,
-                'snippet': snippet
-            }
-        ).execute()
-        
-        return True, fixed_title
+        return status, fixed_title
         
     except HttpError as e:
         print(f"  ❌ Помилка оновлення відео {video_id}: {e}")
-        return False, current_title
+        return 'failed', current_title
+
+def is_truncated_title(title):
+    """Перевіряє чи назва виглядає обрізаною"""
+    return '...' in title or (len(title) < 30 and 'SmartBabies' not in title)
+
+def select_truncated_videos(videos, max_results=200):
+    """Відбирає відео з обрізаними назвами (ресурси videos().list або VideoRecord)"""
+    truncated = []
+    for video in videos:
+        # У VideoRecord назва читається без побудови snippet (і без завантаження опису)
+        title = video.title if isinstance(video, VideoRecord) else video['snippet']['title']
+        if is_truncated_title(title):
+            snippet = video['snippet']
+            truncated.append({
+                'video_id': video['id'],
+                'title': title,
+                'description': snippet['description'],
+                'snippet': snippet,
+                'etag': video.get('etag')
+            })
+            if len(truncated) >= max_results:
+                break
+    return truncated
 
 def find_truncated_videos(youtube, channel_id, max_results=200):
     """Знаходить відео з обрізаними назвами"""
     try:
         # Отримуємо playlist ID з uploads
-        request = youtube.channels().list(
-            part='contentDetails',
-            id=channel_id
-        )
-        response = request.execute()
+        playlist_id = get_uploads_playlist_id(youtube, channel_id)
         
-        if not response['items']:
+        if not playlist_id:
             return []
         
-        playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        
-        videos = []
-        next_page_token = None
+        missing_ids = []
+        videos = select_truncated_videos(
+            iter_playlist_videos(youtube, playlist_id, missing_ids=missing_ids, **read_params(TRUNCATED_TITLES)),
+            max_results
+        )
         
-        while len(videos) < max_results:
-            request = youtube.playlistItems().list(
-                part='snippet,contentDetails',
-                playlistId=playlist_id,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
-            )
-            response = request.execute()
-            
-            for item in response['items']:
-                video_id = item['contentDetails']['videoId']
-                video_request = youtube.videos().list(
-                    part='snippet',
-                    id=video_id
-                )
-                video_response = video_request.execute()
-                if video_response['items']:
-                    video = video_response['items'][0]
-                    title = video['snippet']['title']
-                    description = video['snippet']['description']
-                    
-                    # Перевіряємо чи назва обрізана
-                    if '...' in title or (len(title) < 30 and 'SmartBabies' not in title):
-                        videos.append({
-                            'video_id': video_id,
-                            'title': title,
-                            'description': description
-                        })
-            
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token or len(videos) >= max_results:
-                break
-                
+        report_missing(missing_ids)
         return videos
     except HttpError as e:
         print(f'Помилка: {e}')
         return []
 
-def get_channel_id(youtube, handle):
-    """Отримує Channel ID з handle"""
-    try:
-        request = youtube.search().list(
-            part='snippet',
-            q=handle,
-            type='channel',
-            maxResults=1
-        )
-        response = request.execute()
-        if response['items']:
-            return response['items'][0]['snippet']['channelId']
-        return None
-    except HttpError as e:
-        print(f'Помилка: {e}')
-        return None
-
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Виправлення обрізаних назв відео')
+    parser.add_argument(
+        '--catalog',
+        action='store_true',
+        help='Читати відео з локального каталогу (з інкрементальною синхронізацією)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Відправляти оновлення HTTP batch запитами (до 50 відео в одному запиті)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продовжити перерваний запуск: пропустити відео, вже виправлені за журналом'
+    )
+    parser.add_argument(
+        '--journal',
+        default=FIX_TITLES_JOURNAL_FILE,
+        help='Файл журналу оновлень (JSON Lines)'
+    )
+    args = parser.parse_args()
+    
     print("🔍 Пошук відео з обрізаними назвами...")
     
     # Отримуємо API ключ для читання
@@ -210,7 +203,7 @@ def main():
         return
     
     # Створюємо сервіс для читання
-    youtube_read = build('youtube', 'v3', developerKey=api_key)
+    youtube_read = build_youtube(api_key=api_key)
     channel_handle = os.getenv('CHANNEL_ID', '@SmartBabies')
     
     channel_id = get_channel_id(youtube_read, channel_handle)
@@ -219,10 +212,21 @@ def main():
         return
     
     # Знаходимо обрізані відео
-    truncated_videos = find_truncated_videos(youtube_read, channel_id)
+    if args.catalog:
+        truncated_videos = select_truncated_videos(
+            get_catalog_videos(youtube_read, channel_id, stream=True, records=True, lazy_description=True)
+        )
+    else:
+        truncated_videos = find_truncated_videos(youtube_read, channel_id)
+    
+    journal = UpdateJournal(args.journal, resume=args.resume)
+    if journal.done:
+        truncated_videos = [v for v in truncated_videos if not journal.is_done(v['video_id'])]
+        print(f"⏭  За журналом вже виправлено {len(journal.done)} відео - їх буде пропущено")
     
     if not truncated_videos:
         print("✅ Відео з обрізаними назвами не знайдено!")
+        journal.close()
         return
     
     print(f"⚠️  Знайдено {len(truncated_videos)} відео з обрізаними назвами:")
@@ -236,6 +240,7 @@ def main():
     response = input(f"\n❓ Виправити ці {len(truncated_videos)} відео? (y/n): ")
     if response.lower() != 'y':
         print("❌ Скасовано")
+        journal.close(finished=False)
         return
     
     # Отримуємо OAuth сервіс для редагування
@@ -244,42 +249,107 @@ def main():
     if not youtube_write:
         print("❌ Не вдалося авторизуватися")
         print("📝 Запустіть спочатку: python3 auth_setup.py")
+        journal.close(finished=False)
         return
     
+    if args.catalog:
+        # etag каталогу включає statistics і не годиться для If-Match - перечитуємо тільки snippet
+        try:
+            latest = fetch_update_snippets(youtube_write, [video['video_id'] for video in truncated_videos])
+        except QuotaExceededError as e:
+            print(f"⛔ {e}")
+            journal.stop(str(e))
+            journal.close()
+            return
+        for video in truncated_videos:
+            current = latest.get(video['video_id'])
+            video['snippet'], video['etag'] = (current['snippet'], current.get('etag')) if current else (None, None)
+    
     # Виправляємо відео
     print(f"\n🔧 Виправляю назви...")
     fixed_count = 0
     failed_count = 0
     changes_log = []
     
-    for i, video in enumerate(truncated_videos, 1):
-        video_id = video['video_id']
-        current_title = video['title']
-        description = video['description']
-        
-        print(f"\n[{i}/{len(truncated_videos)}] Виправляю: {current_title[:50]}...")
-        
-        success, new_title = fix_video_title(
-            youtube_write, 
-            video_id, 
-            current_title, 
-            description
+    if args.batch:
+        fixed_titles = {
+            video['video_id']: build_fixed_title(video['title'], video['description'])
+            for video in truncated_videos
+        }
+        for video_id, title in fixed_titles.items():
+            journal.planned(video_id, title=title)
+        results = batch_update_snippets(
+            youtube_write,
+            [
+                {
+                    'video_id': video['video_id'],
+                    'title': fixed_titles[video['video_id']],
+                    'snippet': video['snippet'],
+                    'etag': video['etag']
+                }
+                for video in truncated_videos
+            ]
         )
+        quota_errors = [result['error'] for result in results.values() if result['status'] == 'quota']
+        if quota_errors:
+            print(f"  ⛔ Квоту вичерпано, не виправлено {len(quota_errors)} відео")
+            journal.stop(quota_errors[0])
+        for video in truncated_videos:
+            video_id = video['video_id']
+            result = results[video_id]
+            journal.result(video_id, result['status'], result['error'])
+            if result['success']:
+                fixed_count += 1
+                print(f"  ✅ Виправлено: {fixed_titles[video_id]}")
+                changes_log.append({
+                    'video_id': video_id,
+                    'old_title': video['title'],
+                    'new_title': fixed_titles[video_id],
+                    'url': f"https://www.youtube.com/watch?v={video_id}"
+                })
+            else:
+                failed_count += 1
+                print(f"  ❌ Помилка виправлення {video_id}: {result['error']}")
+    else:
+        for i, video in enumerate(truncated_videos, 1):
+            video_id = video['video_id']
+            current_title = video['title']
+            description = video['description']
         
-        if success:
-            fixed_count += 1
-            print(f"  ✅ Виправлено: {new_title}")
-            changes_log.append({
-                'video_id': video_id,
-                'old_title': current_title,
-                'new_title': new_title,
-                'url': f"https://www.youtube.com/watch?v={video_id}"
-            })
-        else:
-            failed_count += 1
-            print(f"  ❌ Помилка виправлення")
+            print(f"\n[{i}/{len(truncated_videos)}] Виправляю: {current_title[:50]}...")
+            journal.planned(video_id, title=build_fixed_title(current_title, description))
+        
+            try:
+                status, new_title = fix_video_title(
+                    youtube_write, 
+                    video_id, 
+                    current_title, 
+                    description,
+                    snippet=video['snippet'],
+                    etag=video['etag']
+                )
+            except QuotaExceededError as e:
+                print(f"  ⛔ {e}")
+                journal.result(video_id, 'quota', str(e))
+                journal.stop(str(e))
+                break
+            journal.result(video_id, status)
         
-        time.sleep(1)  # Затримка щоб не перевищити rate limits
+            if status in DONE_STATUSES:
+                fixed_count += 1
+                print(f"  ✅ Виправлено: {new_title}")
+                changes_log.append({
+                    'video_id': video_id,
+                    'old_title': current_title,
+                    'new_title': new_title,
+                    'url': f"https://www.youtube.com/watch?v={video_id}"
+                })
+            else:
+                failed_count += 1
+                if status == 'failed':
+                    print(f"  ❌ Помилка виправлення")
+    
+    journal.close()
     
     # Збереження логу
     log_file = f"fix_titles_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -298,6 +368,7 @@ def main():
     print(f"   Помилок: {failed_count}")
     print(f"   Лог збережено в {log_file}")
     print(f"{'='*70}")
+    print_api_usage()
 
 if __name__ == '__main__':
     main()
@@ -4,6 +4,7 @@
 """
 
 import argparse
+import time
 from datetime import datetime
 
 # Шаблони для різних типів контенту
@@ -70,88 +71,121 @@ def generate_optimized_tags(content_type, additional_tags=None):
     
     return unique_tags
 
-def generate_optimized_description(title, content_type, video_length_minutes=None, timestamps=None, 
-                                   social_links=None, language='en'):
-    """Генерація оптимізованого опису з фокусом на CTR та retention"""
-    template = CONTENT_TEMPLATES.get(content_type, CONTENT_TEMPLATES['learning'])
-    prefix = template['title_prefix']
-    
-    # Початок з ключового тексту (перші 2 рядки - найважливіші для SEO)
-    # Додаємо CTA для підвищення engagement
-    description = f"""{prefix} {title}
+# Що дитина вивчить (детально) - для кожного типу контенту
+LEARNING_POINTS_DETAILED = {
+    'learning': '• Letter recognition and phonics\n• Building vocabulary\n• Early reading skills\n• Pronunciation practice\n',
+    'numbers': '• Number recognition 1-10\n• Counting skills\n• Basic math concepts\n• Pattern recognition\n',
+    'colors': '• Color names and identification\n• Color matching\n• Creative expression\n• Visual learning\n',
+    'songs': '• Rhythm and melody\n• Language development\n• Memory enhancement\n• Motor skills through dance\n',
+    'adventure': '• Critical thinking\n• Problem-solving\n• Social-emotional skills\n• Exploration and curiosity\n'
+}
+DEFAULT_LEARNING_POINTS_DETAILED = '• Fun educational content\n• Safe viewing experience\n• Age-appropriate learning\n'
 
-🎯 Learn with SmartBabies! Educational content designed for preschoolers and toddlers.
-👍 LIKE this video if your child loves learning with ScoopyCap!
+# Що діти вивчать (коротко)
+LEARNING_POINTS = {
+    'learning': '• Letter recognition and sounds\n• Basic vocabulary\n• Pronunciation skills\n',
+    'numbers': '• Number recognition\n• Counting skills\n• Basic math concepts\n',
+    'colors': '• Color names and recognition\n• Matching colors\n• Creative expression\n',
+    'songs': '• Rhythm and melody\n• Language development\n• Memory skills\n',
+    'adventure': '• Problem-solving\n• Curiosity and exploration\n• Social-emotional skills\n'
+}
+DEFAULT_LEARNING_POINTS = '• Fun and educational content\n• Safe viewing experience\n'
 
-"""
-    
-    # Основна інформація з фокусом на користь
-    description += "📚 WHAT YOUR CHILD WILL LEARN:\n"
-    learning_points_detailed = {
-        'learning': '• Letter recognition and phonics\n• Building vocabulary\n• Early reading skills\n• Pronunciation practice\n',
-        'numbers': '• Number recognition 1-10\n• Counting skills\n• Basic math concepts\n• Pattern recognition\n',
-        'colors': '• Color names and identification\n• Color matching\n• Creative expression\n• Visual learning\n',
-        'songs': '• Rhythm and melody\n• Language development\n• Memory enhancement\n• Motor skills through dance\n',
-        'adventure': '• Critical thinking\n• Problem-solving\n• Social-emotional skills\n• Exploration and curiosity\n'
-    }
-    description += learning_points_detailed.get(content_type, '• Fun educational content\n• Safe viewing experience\n• Age-appropriate learning\n')
-    description += "\n🎓 Perfect for ages 2-5 years old!\n\n"
-    
-    # Таймкоди (якщо є)
-    if timestamps:
-        description += "⏱️ CHAPTERS:\n"
-        for time, label in timestamps:
-            description += f"{time} - {label}\n"
-        description += "\n"
-    elif video_length_minutes and video_length_minutes > 2:
-        description += "💡 TIP: Use the chapters in this video to jump to your favorite parts!\n\n"
-    
-    # Що діти вивчать
-    description += "✨ WHAT CHILDREN WILL LEARN:\n"
-    learning_points = {
-        'learning': '• Letter recognition and sounds\n• Basic vocabulary\n• Pronunciation skills\n',
-        'numbers': '• Number recognition\n• Counting skills\n• Basic math concepts\n',
-        'colors': '• Color names and recognition\n• Matching colors\n• Creative expression\n',
-        'songs': '• Rhythm and melody\n• Language development\n• Memory skills\n',
-        'adventure': '• Problem-solving\n• Curiosity and exploration\n• Social-emotional skills\n'
-    }
-    description += learning_points.get(content_type, '• Fun and educational content\n• Safe viewing experience\n')
-    
-    description += "\n"
-    
-    # Про SmartBabies
-    description += "🛸 ABOUT SMARTBABIES:\n"
-    description += """SmartBabies® creates safe, engaging educational content for preschoolers. 
+ABOUT_SMARTBABIES = """🛸 ABOUT SMARTBABIES:
+SmartBabies® creates safe, engaging educational content for preschoolers. 
 Our hero ScoopyCap guides children through fun learning adventures!
 
 👉 SUBSCRIBE NOW: https://www.youtube.com/@SmartBabies?sub_confirmation=1
 🔔 Click the bell for notifications!
 
 """
+
+# Додаткові хештеги для покращення
+ADDITIONAL_HASHTAGS = [
+    '#ToddlerEducation',
+    '#KidsLearning',
+    '#EducationalVideos',
+    '#PreschoolContent',
+    '#SafeKidsContent'
+]
+
+# Рядки опису до місця вставки CTA (create_enhanced_description вставляє його після третього рядка)
+CTA_LINE = 3
+
+_compiled_templates = {}
+_social_blocks = {}
+
+def _compile_description_template(content_type):
+    """
+    Незмінні частини опису для типу контенту (будуються один раз).
+    Між ними підставляються назва, таймкоди та соцмережі.
+    """
+    template = CONTENT_TEMPLATES.get(content_type, CONTENT_TEMPLATES['learning'])
+    return {
+        'prefix': f"{template['title_prefix']} ",
+        # Початок з ключового тексту (перші 2 рядки - найважливіші для SEO)
+        'intro': "\n\n🎯 Learn with SmartBabies! Educational content designed for preschoolers and toddlers.\n",
+        # Додаємо CTA для підвищення engagement
+        'like': "👍 LIKE this video if your child loves learning with ScoopyCap!\n\n",
+        # Основна інформація з фокусом на користь
+        'learn': ("📚 WHAT YOUR CHILD WILL LEARN:\n"
+                  + LEARNING_POINTS_DETAILED.get(content_type, DEFAULT_LEARNING_POINTS_DETAILED)
+                  + "\n🎓 Perfect for ages 2-5 years old!\n\n"),
+        'about': ("✨ WHAT CHILDREN WILL LEARN:\n"
+                  + LEARNING_POINTS.get(content_type, DEFAULT_LEARNING_POINTS)
+                  + "\n" + ABOUT_SMARTBABIES),
+        # Хештеги (в кінці опису)
+        'hashtags': " ".join(template['hashtags']) + " " + " ".join(ADDITIONAL_HASHTAGS[:3]),
+    }
+
+def _social_block(social_links):
+    """Блок соцмереж (однакові посилання - той самий рядок з кешу)"""
+    if not social_links:
+        return ''
+    key = (social_links.get('youtube'), social_links.get('facebook'))
+    block = _social_blocks.get(key)
+    if block is None:
+        block = "🔗 FOLLOW US:\n"
+        if key[0]:
+            block += f"YouTube: {key[0]}\n"
+        if key[1]:
+            block += f"Facebook: {key[1]}\n"
+        block = _social_blocks[key] = block + "\n"
+    return block
+
+def insert_after_line(description, text, line=CTA_LINE):
+    """Вставляє text після перших line рядків опису"""
+    lines = description.split('\n')
+    if len(lines) > line:
+        return '\n'.join(lines[:line]) + '\n' + text + '\n'.join(lines[line:])
+    return description
+
+def generate_optimized_description(title, content_type, video_length_minutes=None, timestamps=None, 
+                                   social_links=None, language='en', cta=None):
+    """
+    Генерація оптимізованого опису з фокусом на CTR та retention.
+    cta - текст, який вставляється після третього рядка (insert_after_line)
+    """
+    compiled = _compiled_templates.get(content_type)
+    if compiled is None:
+        compiled = _compiled_templates[content_type] = _compile_description_template(content_type)
     
-    # Соціальні мережі
-    if social_links:
-        description += "🔗 FOLLOW US:\n"
-        if social_links.get('youtube'):
-            description += f"YouTube: {social_links['youtube']}\n"
-        if social_links.get('facebook'):
-            description += f"Facebook: {social_links.get('facebook')}\n"
-        description += "\n"
-    
-    # Хештеги (в кінці опису)
-    hashtags = template['hashtags']
-    description += " ".join(hashtags)
-    
-    # Додаткові хештеги для покращення
-    additional_hashtags = [
-        '#ToddlerEducation',
-        '#KidsLearning',
-        '#EducationalVideos',
-        '#PreschoolContent',
-        '#SafeKidsContent'
-    ]
-    description += " " + " ".join(additional_hashtags[:3])
+    # Таймкоди (якщо є)
+    if timestamps:
+        chapters = "⏱️ CHAPTERS:\n" + "".join(f"{time} - {label}\n" for time, label in timestamps) + "\n"
+    elif video_length_minutes and video_length_minutes > 2:
+        chapters = "💡 TIP: Use the chapters in this video to jump to your favorite parts!\n\n"
+    else:
+        chapters = ''
     
+    # Назва з переносами рядків зсуває третій рядок - тоді CTA вставляється в готовий опис
+    inline_cta = cta if cta is not None and '\n' not in title else ''
+    description = ''.join((
+        compiled['prefix'], title, compiled['intro'], inline_cta, compiled['like'], compiled['learn'],
+        chapters, compiled['about'], _social_block(social_links), compiled['hashtags']
+    ))
+    if cta is not None and not inline_cta:
+        description = insert_after_line(description, cta)
     return description
 
 def generate_title_suggestions(content_topic, content_type):
@@ -169,6 +203,20 @@ def generate_title_suggestions(content_topic, content_type):
     
     return suggestions
 
+def benchmark(count=100000):
+    """Скільки описів генерується за секунду (всі типи контенту, з соцмережами та CTA)"""
+    content_types = list(CONTENT_TEMPLATES)
+    social_links = {
+        'youtube': 'https://www.youtube.com/@SmartBabies',
+        'facebook': 'https://www.facebook.com/Smart-Babies-108947580525633/'
+    }
+    started = time.perf_counter()
+    for i in range(count):
+        generate_optimized_description(f"Video {i}", content_types[i % len(content_types)],
+                                       social_links=social_links, cta="CTA\n\n")
+    elapsed = time.perf_counter() - started
+    print(f"⏱  {count} описів за {elapsed:.2f} с ({count / elapsed:,.0f} описів/с)")
+
 def main():
     parser = argparse.ArgumentParser(description='Генератор оптимізованих описів для YouTube')
     parser.add_argument('--topic', required=True, help='Тема відео (наприклад: "ABC Learning")')
@@ -4,8 +4,11 @@
 """
 
 import os
-from googleapiclient.discovery import build
+from youtube_client import build_youtube, print_api_usage
 from dotenv import load_dotenv
+from channel_resolver import get_channel_id
+from fields import PLAYLIST_TITLES, read_params
+from keyword_matcher import KeywordMatcher
 
 load_dotenv()
 
@@ -17,10 +20,10 @@ def get_channel_playlists(youtube, channel_id):
         
         while True:
             request = youtube.playlists().list(
-                part='snippet',
                 channelId=channel_id,
                 maxResults=50,
-                pageToken=next_page_token
+                pageToken=next_page_token,
+                **read_params(PLAYLIST_TITLES, paged=True)
             )
             response = request.execute()
             
@@ -40,61 +43,69 @@ def get_channel_playlists(youtube, channel_id):
         print(f'Помилка отримання плейлистів: {e}')
         return []
 
-def find_best_playlist(playlists, content_type):
-    """Знаходить найкращий плейлист для типу контенту"""
-    # Ключові слова для пошуку
-    keywords_map = {
-        'songs': ['song', 'music', 'nursery rhyme', 'rhyme', 'sing'],
-        'learning': ['abc', 'learn', 'alphabet', 'education', 'learn'],
-        'numbers': ['number', 'count', 'math'],
-        'colors': ['color', 'shape', 'colour'],
-        'adventure': ['scoopy', 'adventure', 'story']
-    }
-    
-    keywords = keywords_map.get(content_type, ['song', 'kids'])
-    
-    best_match = None
-    best_score = 0
-    
+# Ключові слова для пошуку плейлиста за типом контенту
+PLAYLIST_KEYWORDS = {
+    'songs': ['song', 'music', 'nursery rhyme', 'rhyme', 'sing'],
+    'learning': ['abc', 'learn', 'alphabet', 'education', 'learn'],
+    'numbers': ['number', 'count', 'math'],
+    'colors': ['color', 'shape', 'colour'],
+    'adventure': ['scoopy', 'adventure', 'story']
+}
+# Для невідомого типу контенту
+DEFAULT_PLAYLIST_KEYWORDS = ['song', 'kids']
+# Додатковий бонус для "top", "best", "popular"
+BONUS_PLAYLIST_KEYWORDS = ['top', 'best', 'popular', 'favorite']
+
+PLAYLIST_MATCHER = KeywordMatcher({
+    **PLAYLIST_KEYWORDS,
+    'default': DEFAULT_PLAYLIST_KEYWORDS,
+    'bonus': BONUS_PLAYLIST_KEYWORDS,
+})
+
+def find_best_playlists(playlists, content_types):
+    """
+    Знаходить найкращий плейлист для кожного типу контенту.
+    Назва кожного плейлиста переглядається один раз для всіх типів.
+    """
+    scored = []
     for playlist in playlists:
-        title_lower = playlist['title'].lower()
-        score = sum(1 for keyword in keywords if keyword in title_lower)
-        
-        # Додатковий бонус для "top", "best", "popular"
-        if any(word in title_lower for word in ['top', 'best', 'popular', 'favorite']):
-            score += 1
-            
-        if score > best_score:
-            best_score = score
-            best_match = playlist
+        counts = PLAYLIST_MATCHER.counts(playlist['title'].lower())
+        scored.append((playlist, counts, 1 if counts['bonus'] else 0))
     
-    return best_match
+    best_playlists = {}
+    for content_type in content_types:
+        category = content_type if content_type in PLAYLIST_KEYWORDS else 'default'
+        best_match = None
+        best_score = 0
+        for playlist, counts, bonus in scored:
+            score = counts[category] + bonus
+            if score > best_score:
+                best_score = score
+                best_match = playlist
+        best_playlists[content_type] = best_match
+    return best_playlists
+
+def find_best_playlist(playlists, content_type):
+    """Знаходить найкращий плейлист для типу контенту"""
+    return find_best_playlists(playlists, [content_type])[content_type]
 
 def get_playlists_for_channel(youtube, channel_handle='@SmartBabies'):
     """Отримує плейлисти для каналу та повертає найкращі для кожного типу контенту"""
     # Отримуємо channel ID
-    request = youtube.search().list(
-        part='snippet',
-        q=channel_handle,
-        type='channel',
-        maxResults=1
-    )
-    response = request.execute()
+    channel_id = get_channel_id(youtube, channel_handle)
     
-    if not response['items']:
+    if not channel_id:
         return {}
     
-    channel_id = response['items'][0]['snippet']['channelId']
-    
     # Отримуємо всі плейлисти
     playlists = get_channel_playlists(youtube, channel_id)
     
     # Знаходимо найкращі для кожного типу
-    best_playlists = {}
-    for content_type in ['songs', 'learning', 'numbers', 'colors', 'adventure']:
-        best = find_best_playlist(playlists, content_type)
-        if best:
-            best_playlists[content_type] = best
+    best_playlists = {
+        content_type: best
+        for content_type, best in find_best_playlists(playlists, list(PLAYLIST_KEYWORDS)).items()
+        if best
+    }
     
     # Якщо не знайшли для конкретного типу, використовуємо загальний
     if 'songs' in best_playlists:
@@ -110,7 +121,7 @@ if __name__ == '__main__':
         print("❌ YOUTUBE_API_KEY не знайдено")
         exit(1)
     
-    youtube = build('youtube', 'v3', developerKey=api_key)
+    youtube = build_youtube(api_key=api_key)
     
     print("🔍 Отримую плейлисти каналу...")
     playlists = get_playlists_for_channel(youtube)
@@ -119,5 +130,4 @@ if __name__ == '__main__':
     print("="*70)
     for content_type, playlist in playlists.items():
         print(f"{content_type:10}: {playlist['title'][:50]:50} | {playlist['url']}")
-
-
+    print_api_usage()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+HTTP кеш з ETag для YouTube Data API
+Зберігає GET відповіді разом з ETag, відправляє If-None-Match
+і віддає відповідь з кешу, якщо API повернув 304 Not Modified.
+На диск кеш пишеться як JSON; API ключ (параметр key) в ключі кешу не зберігається
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httplib2
+
+# Ліміт розміру кешу за замовчуванням (50 MB)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Версія формату файлу кешу (інша версія - файл ігнорується)
+CACHE_FORMAT_VERSION = 1
+
+def cache_key(uri):
+    """URI запиту без API ключа: відповідь не залежить від ключа, а ключ не потрапляє у файл"""
+    parts = urlsplit(uri)
+    if 'key=' not in parts.query:
+        return uri
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name != 'key']
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+class ETagCache:
+    """
+    LRU кеш відповідей з обмеженням за сумарним розміром.
+    Ключ - URI запиту (включно з part/fields/pageToken) без параметра key (cache_key).
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def get(self, key):
+        """Повертає (etag, headers, content) або None"""
+        key = cache_key(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, etag, headers, content):
+        """Додає відповідь у кеш та витісняє найстаріші записи понад ліміт"""
+        if len(content) > self.max_bytes:
+            return
+        key = cache_key(key)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[2])
+            self._entries[key] = (etag, headers, content)
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def record_hit(self, content):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(content)
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        """Лічильники кешу"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'size_bytes': self.size,
+            'bytes_saved': self.bytes_saved
+        }
+
+    def load(self):
+        """Завантажує кеш з диску (пошкоджений файл або інший формат ігнорується)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_FORMAT_VERSION:
+                return
+            for key, etag, headers, content in data['entries']:
+                self.put(key, etag, headers, content.encode('utf-8'))
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return
+
+    def save(self):
+        """Зберігає кеш на диск (JSON; відповіді API - текст UTF-8)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+        rows = []
+        for key, (etag, headers, content) in entries:
+            try:
+                rows.append([key, etag, headers, content.decode('utf-8')])
+            except UnicodeDecodeError:
+                continue
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_FORMAT_VERSION, 'entries': rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def _extract_etag(resp, content):
+    """ETag з заголовка, або з поля etag у тілі відповіді"""
+    etag = resp.get('etag')
+    if etag:
+        return etag
+    try:
+        body_etag = json.loads(content).get('etag')
+    except (ValueError, AttributeError):
+        return None
+    return f'"{body_etag}"' if body_etag else None
+
+class CachingHttp:
+    """
+    Обгортка над httplib2.Http для умовних GET запитів.
+    Передається в build(..., http=...) або під AuthorizedHttp.
+    """
+
+    def __init__(self, http, cache):
+        self.http = http
+        self.cache = cache
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if method != 'GET':
+            return self.http.request(uri, method, body=body, headers=headers, **kwargs)
+
+        headers = dict(headers or {})
+        entry = self.cache.get(uri)
+        if entry is not None:
+            headers['if-none-match'] = entry[0]
+
+        resp, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+
+        if resp.status == 304 and entry is not None:
+            _, cached_headers, cached_content = entry
+            self.cache.record_hit(cached_content)
+            return httplib2.Response(cached_headers), cached_content
+
+        self.cache.record_miss()
+        if resp.status == 200:
+            etag = _extract_etag(resp, content)
+            if etag:
+                self.cache.put(uri, etag, dict(resp), content)
+        return resp, content
+
+    def __getattr__(self, name):
+        # timeout, close(), credentials та інше - від оригінального http
+        return getattr(self.http, name)
+
+def print_cache_stats(cache):
+    """Виводить статистику кешу"""
+    stats = cache.stats()
+    if not stats['hits'] and not stats['misses']:
+        return
+    print(f"🗃️  HTTP кеш: {stats['hits']} з кешу / {stats['misses']} завантажено "
+          f"({stats['hit_rate']:.0%}), заощаджено {stats['bytes_saved'] / 1024:.1f} KB")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Журнал оновлень (write-ahead, JSON Lines)
+Перед кожним videos().update записується запланована зміна, після - результат.
+Запуск, що дійшов до кінця, закінчується подією finish. Якщо запуск перервався
+(збій, вичерпана квота), --resume пропускає відео, вже оновлені в перерваному запуску
+(та в попередніх --resume запусках, якщо вони теж перервались)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+# Результати, після яких відео повторно не оновлюється
+DONE_STATUSES = {'updated', 'unchanged'}
+
+class UpdateJournal:
+    """
+    Журнал оновлень одного скрипта.
+
+    Args:
+        path: файл журналу (дописується, ніколи не перезаписується)
+        resume: врахувати результати перерваного попереднього запуску з цього файлу
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.done = {}
+        self.stopped = False
+        self._lock = threading.Lock()
+        if resume:
+            self.done = self._load_done()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._write({'event': 'start', 'resume': resume})
+
+    def _load_done(self):
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Останній рядок міг обірватися під час збою
+                    continue
+                event = entry.get('event')
+                if event == 'finish' or (event == 'start' and not entry.get('resume')):
+                    # Завершений запуск або новий запуск без --resume: попередні результати
+                    # більше не означають, що відео треба пропустити
+                    done = {}
+                    continue
+                if event != 'result':
+                    continue
+                if entry['status'] in DONE_STATUSES:
+                    done[entry['video_id']] = entry
+                else:
+                    done.pop(entry['video_id'], None)
+        return done
+
+    def _write(self, entry):
+        entry['time'] = datetime.now().isoformat()
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def is_done(self, video_id):
+        """Відео вже оновлено в попередньому запуску (тільки з resume)"""
+        return video_id in self.done
+
+    def planned(self, video_id, **changes):
+        """Записує зміну перед відправкою в API"""
+        self._write({'event': 'planned', 'video_id': video_id, **changes})
+
+    def result(self, video_id, status, error=None):
+        """Записує результат: updated, unchanged, stale, failed або quota"""
+        entry = {'event': 'result', 'video_id': video_id, 'status': status}
+        if error:
+            entry['error'] = error
+        self._write(entry)
+        if status in DONE_STATUSES:
+            self.done[video_id] = entry
+
+    def stop(self, reason):
+        """Запуск зупинено до кінця (наприклад, вичерпана квота) - close() не запише finish"""
+        self.stopped = True
+        self._write({'event': 'stop', 'reason': reason})
+
+    def close(self, finished=True):
+        """
+        Закриває журнал. finished=True і запуск не зупинено через stop() -
+        записується finish, і наступний --resume не пропускатиме відео цього запуску
+        """
+        if self._file.closed:
+            return
+        if finished and not self.stopped:
+            self._write({'event': 'finish'})
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(finished=exc_type is None)
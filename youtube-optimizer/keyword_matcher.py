@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Пошук ключових слів за категоріями за один прохід по тексту
+Таблиця ключових слів компілюється один раз в один регулярний вираз
+(префіксне дерево слів), а збіги переводяться в кількість слів по категоріях
+"""
+
+import random
+import re
+import time
+from collections import Counter
+
+def trie_pattern(keywords):
+    """
+    Регулярний вираз з префіксного дерева слів: (?:c(?:o(?:lo(?:ur|r)|unt))|...).
+    На кожній позиції перевіряється тільки одна гілка на символ, тому час
+    пошуку майже не залежить від кількості слів; з кількох слів, що
+    починаються на одній позиції, знаходиться найдовше.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def pattern(node):
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Слово закінчується тут, але довше продовження має перевагу
+            return ('(?:' + body + ')' if len(branches) == 1 else body) + '?'
+        return body
+
+    return pattern(trie)
+
+class KeywordMatcher:
+    """
+    Скомпільована таблиця {категорія: [ключові слова]}.
+
+    Результат той самий, що й у перевірок `keyword in text` по кожному слову:
+    кількість слів категорії, які зустрічаються в тексті (слово, повторене
+    в списку категорії, рахується стільки разів, скільки воно повторене).
+    Текст має бути вже в нижньому регістрі, як і ключові слова.
+    """
+
+    def __init__(self, table):
+        self.categories = tuple(table)
+        keywords = sorted({keyword for words in table.values() for keyword in words}, key=lambda k: (-len(k), k))
+
+        # Вага кожного слова: в які категорії і скільки разів воно входить
+        self._weights = {keyword: Counter() for keyword in keywords}
+        for category, words in table.items():
+            for keyword in words:
+                self._weights[keyword][category] += 1
+
+        # Знайдене слово означає, що в тексті є і всі слова, які воно містить
+        self._implied = {keyword: frozenset(other for other in keywords if other in keyword)
+                         for keyword in keywords}
+        # Слова, які починаються в кінці знайденого і тому могли бути пропущені пошуком
+        # (збіги регулярного виразу не перекриваються) - їх перевіряємо окремо
+        self._overlapping = {
+            keyword: tuple(other for other in keywords if other not in keyword and any(
+                keyword.endswith(other[:size]) for size in range(1, min(len(keyword), len(other)))
+            ))
+            for keyword in keywords
+        }
+        self._pattern = re.compile(trie_pattern(keywords))
+
+        # Найвищий пріоритет (позиція категорії в таблиці) серед слів, які означає знайдене слово
+        rank = {category: index for index, category in enumerate(self.categories)}
+        self._rank = {keyword: min(rank[category] for other in self._implied[keyword]
+                                   for category in self._weights[other])
+                      for keyword in keywords}
+
+    def found(self, text):
+        """Множина ключових слів, що зустрічаються в тексті"""
+        matches = set(self._pattern.findall(text))
+        found = set()
+        for keyword in matches:
+            found |= self._implied[keyword]
+        for keyword in matches:
+            for other in self._overlapping[keyword]:
+                if other not in found and other in text:
+                    found |= self._implied[other]
+        return found
+
+    def counts(self, text):
+        """Кількість знайдених ключових слів по кожній категорії (0 для категорій без збігів)"""
+        result = dict.fromkeys(self.categories, 0)
+        for keyword in self.found(text):
+            for category, weight in self._weights[keyword].items():
+                result[category] += weight
+        return result
+
+    def first_category(self, text):
+        """
+        Перша за порядком таблиці категорія, слово якої є в тексті (None - немає збігів).
+        Те саме, що перевірка категорій по черзі з виходом на першому збігу.
+        """
+        matches = set()
+        best = len(self.categories)
+        for match in self._pattern.finditer(text):
+            keyword = match.group()
+            matches.add(keyword)
+            if self._rank[keyword] < best:
+                best = self._rank[keyword]
+                if best == 0:
+                    # Вищого пріоритету немає - решту тексту можна не переглядати
+                    return self.categories[0]
+        if not matches:
+            return None
+        for keyword in matches:
+            for other in self._overlapping[keyword]:
+                if self._rank[other] < best and other in text:
+                    best = self._rank[other]
+        return self.categories[best]
+
+def count_sequential(table, text):
+    """Те саме, що KeywordMatcher.counts, окремими `in` для кожного слова (для порівняння)"""
+    return {category: sum(1 for keyword in words if keyword in text) for category, words in table.items()}
+
+def benchmark(texts=5000, runs=3):
+    """Час на текст: окремі `in` проти одного проходу, для таблиць різного розміру"""
+    from optimize_videos import CONTENT_TYPE_KEYWORDS, _synthetic_videos
+
+    videos = _synthetic_videos(texts)
+    samples = [(video['snippet']['title'] + ' ' + video['snippet']['description']).lower() for video in videos]
+    generator = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+
+    print(f"⏱  Підрахунок ключових слів ({texts} текстів, мкс на текст):")
+    print(f"   {'слів':>6} {'окремі in':>12} {'один прохід':>12}")
+    for extra in (0, 50, 200, 1000):
+        table = {category: list(words) for category, words in CONTENT_TYPE_KEYWORDS.items()}
+        table['extra'] = [''.join(generator.choice(alphabet) for _ in range(8)) for _ in range(extra)]
+        matcher = KeywordMatcher(table)
+        assert all(matcher.counts(text) == count_sequential(table, text) for text in samples)
+
+        timings = []
+        for count in (lambda text: count_sequential(table, text), matcher.counts):
+            started = time.perf_counter()
+            for _ in range(runs):
+                for text in samples:
+                    count(text)
+            timings.append((time.perf_counter() - started) / (runs * texts) * 1e6)
+        keywords = sum(len(words) for words in table.values())
+        print(f"   {keywords:>6} {timings[0]:>12.1f} {timings[1]:>12.1f}")
@@ -5,14 +5,15 @@
 """
 
 import os
-from googleapiclient.discovery import build
+from youtube_client import build_youtube, print_api_usage
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from auth_setup import get_youtube_service
+from channel_resolver import get_channel_id
 
 load_dotenv()
 
-# Channel ID для SmartBabies
+# Channel ID для SmartBabies (якщо CHANNEL_ID в .env не задано)
 CHANNEL_ID = 'UCPBKtZdTxxqxU3c8iR44uhw'
 
 def get_optimized_channel_description():
@@ -136,13 +137,13 @@ def get_channel_branding_recommendations():
     }
     return recommendations
 
-def update_channel_metadata(youtube, preview_mode=True):
+def update_channel_metadata(youtube, preview_mode=True, channel_id=CHANNEL_ID):
     """Оновлює метадані каналу"""
     try:
         # Отримуємо поточні дані каналу
         request = youtube.channels().list(
             part='snippet',
-            id=CHANNEL_ID
+            id=channel_id
         )
         response = request.execute()
         
@@ -208,7 +209,7 @@ def update_channel_metadata(youtube, preview_mode=True):
             update_request = youtube.channels().update(
                 part='snippet',
                 body={
-                    'id': CHANNEL_ID,
+                    'id': channel_id,
                     'snippet': snippet
                 }
             )
@@ -346,10 +347,14 @@ def main():
         print("❌ YOUTUBE_API_KEY не знайдено")
         return
     
-    youtube_read = build('youtube', 'v3', developerKey=api_key)
+    youtube_read = build_youtube(api_key=api_key)
+    channel_id = get_channel_id(youtube_read, os.getenv('CHANNEL_ID', CHANNEL_ID))
+    if not channel_id:
+        print("❌ Канал не знайдено")
+        return
     
     # Аналіз та оновлення
-    update_channel_metadata(youtube or youtube_read, preview_mode=not args.apply)
+    update_channel_metadata(youtube or youtube_read, preview_mode=not args.apply, channel_id=channel_id)
     
     # Рекомендації
     print_branding_recommendations()
@@ -359,6 +364,7 @@ def main():
     print("\n" + "="*70)
     print("✅ АНАЛІЗ ЗАВЕРШЕНО")
     print("="*70)
+    print_api_usage()
 
 if __name__ == '__main__':
     main()
@@ -6,187 +6,290 @@
 
 import json
 import os
-from googleapiclient.discovery import build
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from youtube_client import build_youtube, print_api_usage
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from generate_description import generate_optimized_description, generate_optimized_tags
+from catalog import get_catalog_videos
+from analysis_cache import AnalysisCache, REPORT_RULES_VERSION
+from description_bundle import BUNDLE_FILE, DescriptionBundleWriter
+from channel_resolver import get_channel_id, get_uploads_playlist_id
+from fields import VIDEO_REPORT, read_params
+from keyword_matcher import KeywordMatcher
+from parallel_fetch import fetch_playlist_videos
+from video_fetch import iter_playlist_videos, report_missing
 
 load_dotenv()
 
 API_KEY = os.getenv('YOUTUBE_API_KEY')
 CHANNEL_HANDLE = os.getenv('CHANNEL_ID', '@SmartBabies')
+# Кількість процесів для аналізу (1 - послідовно) та розмір пачки відео для одного процесу
+ANALYSIS_PROCESSES = int(os.getenv('YOUTUBE_ANALYSIS_PROCESSES', 1))
+ANALYSIS_CHUNK_SIZE = 500
 
-def get_channel_id(youtube, handle):
-    """Отримує Channel ID з handle"""
-    try:
-        request = youtube.search().list(
-            part='snippet',
-            q=handle,
-            type='channel',
-            maxResults=1
-        )
-        response = request.execute()
-        if response['items']:
-            return response['items'][0]['snippet']['channelId']
-        return None
-    except HttpError as e:
-        print(f'Помилка: {e}')
-        return None
+def iter_all_videos(youtube, channel_id, max_results=None):
+    """
+    Генератор відео каналу: відео віддаються посторінково по мірі завантаження,
+    у пам'яті тримається тільки поточна сторінка
+    """
+    playlist_id = get_uploads_playlist_id(youtube, channel_id)
+    if not playlist_id:
+        return
+    
+    missing_ids = []
+    yield from iter_playlist_videos(
+        youtube,
+        playlist_id,
+        max_results=max_results,
+        missing_ids=missing_ids,
+        **read_params(VIDEO_REPORT)
+    )
+    report_missing(missing_ids)
 
-def get_all_videos(youtube, channel_id, max_results=50):
-    """Отримує всі відео каналу"""
+def get_all_videos(youtube, channel_id, max_results=50, fetcher=None):
+    """Отримує всі відео каналу (паралельно, якщо передано ParallelFetcher)"""
     try:
         # Отримуємо playlist ID з uploads
-        request = youtube.channels().list(
-            part='contentDetails',
-            id=channel_id
-        )
-        response = request.execute()
+        playlist_id = get_uploads_playlist_id(youtube, channel_id)
         
-        if not response['items']:
+        if not playlist_id:
             return []
         
-        playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        
-        videos = []
-        next_page_token = None
-        
-        while len(videos) < max_results:
-            request = youtube.playlistItems().list(
-                part='snippet,contentDetails',
-                playlistId=playlist_id,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
+        missing_ids = []
+        if fetcher:
+            videos = fetch_playlist_videos(
+                fetcher,
+                playlist_id,
+                max_results=max_results,
+                missing_ids=missing_ids,
+                **read_params(VIDEO_REPORT)
             )
-            response = request.execute()
-            
-            for item in response['items']:
-                video_id = item['contentDetails']['videoId']
-                video_request = youtube.videos().list(
-                    part='snippet,statistics',
-                    id=video_id
-                )
-                video_response = video_request.execute()
-                if video_response['items']:
-                    videos.append(video_response['items'][0])
-            
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token or len(videos) >= max_results:
-                break
-                
-        return videos[:max_results]
+        else:
+            videos = list(iter_playlist_videos(
+                youtube,
+                playlist_id,
+                max_results=max_results,
+                missing_ids=missing_ids,
+                **read_params(VIDEO_REPORT)
+            ))
+        report_missing(missing_ids)
+        
+        return videos
     except HttpError as e:
         print(f'Помилка: {e}')
         return []
 
+# Ключові слова типів контенту в порядку пріоритету (перший збіг визначає тип)
+CONTENT_TYPE_KEYWORDS = {
+    'numbers': ['number', 'count', 'math', 'цифр'],
+    'colors': ['color', 'colour', 'кольор'],
+    'songs': ['song', 'music', 'пісня', 'музик'],
+    'adventure': ['adventure', 'scoopycap', 'space', 'пригода'],
+}
+CONTENT_TYPE_MATCHER = KeywordMatcher(CONTENT_TYPE_KEYWORDS)
+
+def _content_text(title, description, tags):
+    return (title + " " + description + " " + " ".join(tags)).lower()
+
+def content_type_counts(title, description, tags):
+    """Кількість ключових слів кожного типу контенту в назві, описі та тегах (один прохід по тексту)"""
+    return CONTENT_TYPE_MATCHER.counts(_content_text(title, description, tags))
+
 def detect_content_type(title, description, tags):
     """Визначає тип контенту на основі назви та опису"""
-    text = (title + " " + description + " " + " ".join(tags)).lower()
-    
-    if any(word in text for word in ['number', 'count', 'math', 'цифр']):
-        return 'numbers'
-    elif any(word in text for word in ['color', 'colour', 'кольор']):
-        return 'colors'
-    elif any(word in text for word in ['song', 'music', 'пісня', 'музик']):
-        return 'songs'
-    elif any(word in text for word in ['adventure', 'scoopycap', 'space', 'пригода']):
-        return 'adventure'
-    else:
-        return 'learning'
+    content_type = CONTENT_TYPE_MATCHER.first_category(_content_text(title, description, tags))
+    return content_type or 'learning'
+
+def analyze_video_content(title, description, tags):
+    """
+    Частина звіту, яка залежить тільки від назви, опису та тегів:
+    {'content_type', 'issues', 'optimized'} (її можна кешувати, див. analysis_cache)
+    """
+    # Визначаємо тип контенту
+    content_type = detect_content_type(title, description, tags)
+    
+    # Аналізуємо поточний стан
+    issues = []
+    
+    # Перевірка заголовку
+    if len(title) < 30:
+        issues.append({'type': 'title_short', 'message': f'Заголовок занадто короткий ({len(title)} символів)'})
+    if 'SmartBabies' not in title and 'ScoopyCap' not in title:
+        issues.append({'type': 'brand_missing', 'message': 'Відсутня назва бренду в заголовку'})
+    
+    # Перевірка опису
+    desc_length = len(description)
+    if desc_length < 200:
+        issues.append({'type': 'description_short', 'message': f'Опис занадто короткий ({desc_length} символів)'})
+    if 'http' not in description:
+        issues.append({'type': 'links_missing', 'message': 'Відсутні посилання в описі'})
+    
+    # Перевірка тегів
+    if len(tags) < 10:
+        issues.append({'type': 'tags_few', 'message': f'Занадто мало тегів ({len(tags)})'})
+    elif len(tags) > 15:
+        issues.append({'type': 'tags_many', 'message': f'Занадто багато тегів ({len(tags)})'})
+    
+    # Генеруємо оптимізовані версії
+    optimized_description = generate_optimized_description(
+        title,
+        content_type,
+        social_links={
+            'youtube': 'https://www.youtube.com/@SmartBabies',
+            'facebook': 'https://www.facebook.com/Smart-Babies-108947580525633/'
+        }
+    )
+    
+    optimized_tags = generate_optimized_tags(content_type, tags[:5])
+    
+    # Генеруємо покращені заголовки
+    improved_titles = []
+    if 'SmartBabies' not in title:
+        improved_titles.append(f"🔤 {title} | SmartBabies - Learn with ScoopyCap")
+    if len(title) < 40:
+        improved_titles.append(f"{title} - Educational Video for Preschoolers | SmartBabies")
+    
+    return {
+        'content_type': content_type,
+        'issues': issues,
+        'optimized': {
+            'description': optimized_description,
+            'description_length': len(optimized_description),
+            'tags': optimized_tags,
+            'tags_count': len(optimized_tags),
+            'improved_titles': improved_titles
+        }
+    }
+
+def _video_content(video):
+    """(title, description, tags) відео - вхідні дані analyze_video_content"""
+    snippet = video['snippet']
+    return snippet['title'], snippet['description'], snippet.get('tags', [])
+
+def build_video_report(video, content=None):
+    """
+    Аналіз та оптимізовані версії для одного відео (ресурс videos().list або VideoRecord).
+    content - готовий результат analyze_video_content (наприклад, з кешу)
+    """
+    snippet = video['snippet']
+    stats = video.get('statistics', {})
+    
+    title = snippet['title']
+    description = snippet['description']
+    tags = snippet.get('tags', [])
+    
+    if content is None:
+        content = analyze_video_content(title, description, tags)
+    
+    video_report = {
+        'video_id': video['id'],
+        'current': {
+            'title': title,
+            'description_length': len(description),
+            'tags_count': len(tags),
+            'tags': tags,
+            'views': int(stats.get('viewCount', 0)),
+            'likes': int(stats.get('likeCount', 0))
+        },
+        'current_description': description,  # Додаємо для update_videos.py
+        'snippet': snippet,  # Для оновлення без повторного читання
+        'etag': video.get('etag'),
+        'content_type': content['content_type'],
+        'issues': content['issues'],
+        'optimized': content['optimized'],
+        'priority': len(content['issues'])  # Більше проблем = вищий пріоритет
+    }
+    
+    return video_report
+
+def iter_video_reports(videos, cache=None, chunk_size=ANALYSIS_CHUNK_SIZE):
+    """
+    Генератор звітів по відео: кожне відео аналізується одразу після отримання.
+    cache - AnalysisCache: відео обробляються пачками по chunk_size, а відео
+    з незміненими назвою, описом і тегами беруться з кешу
+    """
+    if cache is None:
+        for video in videos:
+            yield build_video_report(video)
+        return
+    videos = iter(videos)
+    while True:
+        chunk = list(islice(videos, chunk_size))
+        if not chunk:
+            return
+        yield from _cached_reports(chunk, cache)
 
-def generate_optimization_report(videos):
-    """Генерує звіт з рекомендаціями по оптимізації"""
+def _analyze_contents(items):
+    return [analyze_video_content(*item) for item in items]
+
+def _analyze_contents_parallel(items, processes):
+    """analyze_video_content для списку (title, description, tags), пачками в пулі процесів"""
+    if processes <= 1 or len(items) <= ANALYSIS_CHUNK_SIZE:
+        return _analyze_contents(items)
+    chunks = [items[i:i + ANALYSIS_CHUNK_SIZE] for i in range(0, len(items), ANALYSIS_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return [content for contents in executor.map(_analyze_contents, chunks) for content in contents]
+
+def _cached_reports(videos, cache, processes=1):
+    """Звіти для списку відео; рахуються тільки відсутні в кеші"""
+    contents = cache.map(
+        'video_report',
+        REPORT_RULES_VERSION,
+        [_video_content(video) for video in videos],
+        lambda items: _analyze_contents_parallel(items, processes)
+    )
+    return [build_video_report(video, content) for video, content in zip(videos, contents)]
+
+def generate_optimization_report(videos, processes=ANALYSIS_PROCESSES, cache=None):
+    """
+    Генерує звіт з рекомендаціями по оптимізації.
+    processes > 1 - аналіз у пулі процесів (для великих каталогів), результат той самий.
+    cache - AnalysisCache: заново аналізуються тільки нові та змінені відео.
+    """
+    if cache is not None:
+        video_reports = _cached_reports(videos, cache, processes)
+    elif processes > 1 and len(videos) > ANALYSIS_CHUNK_SIZE:
+        # В процеси передаються тільки назва, опис і теги, звіти збираються тут
+        contents = _analyze_contents_parallel([_video_content(video) for video in videos], processes)
+        video_reports = [build_video_report(video, content) for video, content in zip(videos, contents)]
+    else:
+        video_reports = list(iter_video_reports(videos))
     report = {
         'total_videos': len(videos),
-        'videos': []
+        'videos': video_reports
     }
     
-    for video in videos:
-        snippet = video['snippet']
-        stats = video.get('statistics', {})
-        
-        title = snippet['title']
-        description = snippet['description']
-        tags = snippet.get('tags', [])
-        video_id = video['id']
-        
-        # Визначаємо тип контенту
-        content_type = detect_content_type(title, description, tags)
-        
-        # Зберігаємо поточний опис для подальшого використання
-        current_description = description
-        
-        # Аналізуємо поточний стан
-        issues = []
-        
-        # Перевірка заголовку
-        if len(title) < 30:
-            issues.append({'type': 'title_short', 'message': f'Заголовок занадто короткий ({len(title)} символів)'})
-        if 'SmartBabies' not in title and 'ScoopyCap' not in title:
-            issues.append({'type': 'brand_missing', 'message': 'Відсутня назва бренду в заголовку'})
-        
-        # Перевірка опису
-        desc_length = len(description)
-        if desc_length < 200:
-            issues.append({'type': 'description_short', 'message': f'Опис занадто короткий ({desc_length} символів)'})
-        if 'http' not in description:
-            issues.append({'type': 'links_missing', 'message': 'Відсутні посилання в описі'})
-        
-        # Перевірка тегів
-        if len(tags) < 10:
-            issues.append({'type': 'tags_few', 'message': f'Занадто мало тегів ({len(tags)})'})
-        elif len(tags) > 15:
-            issues.append({'type': 'tags_many', 'message': f'Занадто багато тегів ({len(tags)})'})
-        
-        # Генеруємо оптимізовані версії
-        optimized_description = generate_optimized_description(
-            title,
-            content_type,
-            social_links={
-                'youtube': 'https://www.youtube.com/@SmartBabies',
-                'facebook': 'https://www.facebook.com/Smart-Babies-108947580525633/'
-            }
-        )
-        
-        optimized_tags = generate_optimized_tags(content_type, tags[:5])
-        
-        # Генеруємо покращені заголовки
-        improved_titles = []
-        if 'SmartBabies' not in title:
-            improved_titles.append(f"🔤 {title} | SmartBabies - Learn with ScoopyCap")
-        if len(title) < 40:
-            improved_titles.append(f"{title} - Educational Video for Preschoolers | SmartBabies")
-        
-        video_report = {
-            'video_id': video_id,
-            'current': {
-                'title': title,
-                'description_length': desc_length,
-                'tags_count': len(tags),
-                'tags': tags,
-                'views': int(stats.get('viewCount', 0)),
-                'likes': int(stats.get('likeCount', 0))
-            },
-            'current_description': current_description,  # Додаємо для update_videos.py
-            'content_type': content_type,
-            'issues': issues,
-            'optimized': {
-                'description': optimized_description,
-                'description_length': len(optimized_description),
-                'tags': optimized_tags,
-                'tags_count': len(optimized_tags),
-                'improved_titles': improved_titles
-            },
-            'priority': len(issues)  # Більше проблем = вищий пріоритет
-        }
-        
-        report['videos'].append(video_report)
-    
     # Сортуємо за пріоритетом
     report['videos'].sort(key=lambda x: (-x['priority'], -x['current']['views']), reverse=True)
     
     return report
 
+def write_report_jsonl(video_reports, path, bundle=None):
+    """
+    Записує звіти по відео у JSON Lines (один рядок на відео) по мірі надходження.
+    snippet у файл не пишеться: поточний опис вже є в current_description,
+    а update_videos перед оновленням все одно читає свіжий snippet.
+    bundle - DescriptionBundleWriter, куди одночасно дописуються оптимізовані описи.
+    Повертає (кількість відео, кількість з високим пріоритетом).
+    """
+    total = 0
+    high_priority = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for video_report in video_reports:
+            row = {key: value for key, value in video_report.items() if key != 'snippet'}
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n')
+            f.flush()
+            if bundle is not None:
+                bundle.add_report(video_report)
+            total += 1
+            if video_report['priority'] >= 3:
+                high_priority += 1
+    return total, high_priority
+
 def print_optimization_report(report):
     """Виводить звіт з рекомендаціями"""
     print("\n" + "="*70)
@@ -227,12 +330,94 @@ def print_optimization_report(report):
         print(f"\n🏷️  ОПТИМІЗОВАНІ ТЕГИ:")
         print(f"  {', '.join(video['optimized']['tags'][:10])}")
 
+def _synthetic_videos(count):
+    """Відео для benchmark у форматі videos().list"""
+    titles = ['ABC Song for Kids', 'Count to 10 with ScoopyCap', 'Learn Colors | SmartBabies',
+              'Space Adventure', 'Пісенька про кольори для малюків']
+    return [{
+        'id': f'v{i:06d}',
+        'etag': f'e{i}',
+        'snippet': {
+            'title': f'{titles[i % len(titles)]} {i}',
+            'description': 'Educational video for toddlers http://example.com ' * (i % 6),
+            'tags': [f'tag{j}' for j in range(i % 18)],
+            'categoryId': '27',
+        },
+        'statistics': {'viewCount': str(i * 7 % 10000), 'likeCount': str(i % 300)},
+    } for i in range(count)]
+
+def benchmark(count=20000, processes=None):
+    """Порівняння послідовного аналізу з пулом процесів на синтетичних відео"""
+    processes = processes or os.cpu_count() or 1
+    videos = _synthetic_videos(count)
+    
+    started = time.perf_counter()
+    serial = generate_optimization_report(videos, processes=1)
+    serial_time = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    parallel = generate_optimization_report(videos, processes=processes)
+    parallel_time = time.perf_counter() - started
+    
+    print(f"⏱  Аналіз {count} відео:")
+    print(f"   послідовно      {serial_time:8.2f} с")
+    print(f"   процесів: {processes:<5} {parallel_time:8.2f} с (x{serial_time / parallel_time:.1f})")
+    print(f"   результат однаковий: {'так' if serial == parallel else 'НІ'}")
+
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Рекомендації з оптимізації відео')
+    parser.add_argument(
+        '--catalog',
+        action='store_true',
+        help='Читати відео з локального каталогу (з інкрементальною синхронізацією)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Потокова обробка всього каналу (без обмеження в 50 відео та без виводу топ-10)'
+    )
+    parser.add_argument(
+        '--output',
+        default='optimization_report.jsonl',
+        help='Файл звіту (JSON Lines, один рядок на відео)'
+    )
+    parser.add_argument(
+        '--bundle',
+        default=BUNDLE_FILE,
+        help='Архів оптимізованих описів (перегляд: python description_bundle.py ID)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Кеш результатів аналізу (analysis_cache): заново аналізуються тільки нові та змінені відео'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=ANALYSIS_PROCESSES,
+        help='Кількість процесів для аналізу відео (1 - послідовно)'
+    )
+    parser.add_argument(
+        '--benchmark',
+        type=int,
+        nargs='?',
+        const=20000,
+        metavar='COUNT',
+        help='Порівняти послідовний та паралельний аналіз на синтетичних відео'
+    )
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark(args.benchmark, args.processes if args.processes > 1 else None)
+        return
+    
     if not API_KEY:
         print("❌ Помилка: YOUTUBE_API_KEY не знайдено")
         return
     
-    youtube = build('youtube', 'v3', developerKey=API_KEY)
+    youtube = build_youtube(api_key=API_KEY)
     
     print("🔍 Отримую дані каналу...")
     channel_id = get_channel_id(youtube, CHANNEL_HANDLE)
@@ -243,8 +428,29 @@ def main():
     
     print(f"✅ Канал знайдено!")
     print("🎥 Аналізую відео...")
+    cache = AnalysisCache() if args.cache else None
     
-    videos = get_all_videos(youtube, channel_id, max_results=50)
+    if args.stream:
+        if args.catalog:
+            videos = get_catalog_videos(youtube, channel_id, stream=True, records=True)
+        else:
+            videos = iter_all_videos(youtube, channel_id)
+        with DescriptionBundleWriter(args.bundle) as bundle:
+            total, high_priority = write_report_jsonl(iter_video_reports(videos, cache=cache), args.output, bundle=bundle)
+        print(f"✅ Проаналізовано відео: {total}")
+        if high_priority:
+            print(f"⚠️  Відео з високим пріоритетом оптимізації: {high_priority}")
+        print(f"✅ Звіт збережено в {args.output}")
+        print(f"✅ Оптимізовані описи збережено в {args.bundle}")
+        if cache is not None:
+            cache.print_summary()
+        print_api_usage()
+        return
+    
+    if args.catalog:
+        videos = get_catalog_videos(youtube, channel_id, max_results=50, records=True)
+    else:
+        videos = get_all_videos(youtube, channel_id, max_results=50)
     
     if not videos:
         print("❌ Відео не знайдено")
@@ -253,34 +459,21 @@ def main():
     print(f"✅ Знайдено {len(videos)} відео")
     print("🔧 Генерую рекомендації...")
     
-    report = generate_optimization_report(videos)
+    report = generate_optimization_report(videos, processes=args.processes, cache=cache)
     
     print_optimization_report(report)
     
-    # Збереження
-    with open('optimization_report.json', 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
-    
-    # Генерація файлів з оптимізованими описами
+    # Збереження: звіт у JSON Lines, всі оптимізовані описи - в один архів
     print("\n💾 Зберігаю результати...")
+    with DescriptionBundleWriter(args.bundle) as bundle:
+        write_report_jsonl(report['videos'], args.output, bundle=bundle)
     
-    for video in report['videos'][:20]:  # Перші 20 відео
-        filename = f"optimized_{video['video_id']}.txt"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"ВІДЕО: {video['current']['title']}\n")
-            f.write(f"ID: {video['video_id']}\n")
-            f.write("="*70 + "\n\n")
-            f.write("ОПТИМІЗОВАНИЙ ОПИС:\n")
-            f.write("="*70 + "\n\n")
-            f.write(video['optimized']['description'])
-            f.write("\n\n" + "="*70 + "\n")
-            f.write("ОПТИМІЗОВАНІ ТЕГИ:\n")
-            f.write("="*70 + "\n")
-            f.write(", ".join(video['optimized']['tags']))
-            f.write("\n")
-    
-    print(f"✅ Створено {min(20, len(report['videos']))} файлів з оптимізованими описами")
-    print("✅ Повний звіт збережено в optimization_report.json")
+    print(f"✅ Оптимізовані описи {len(report['videos'])} відео збережено в {args.bundle}")
+    print(f"   (перегляд: python description_bundle.py <ID відео> --bundle {args.bundle})")
+    print(f"✅ Повний звіт збережено в {args.output}")
+    if cache is not None:
+        cache.print_summary()
+    print_api_usage()
 
 if __name__ == '__main__':
     main()
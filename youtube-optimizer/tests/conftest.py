@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Скрипти лежать плоско в папці youtube-optimizer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
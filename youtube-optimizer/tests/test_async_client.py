@@ -0,0 +1,188 @@
+import asyncio
+import functools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import catalog
+from async_client import AsyncApiError, AsyncYouTubeClient
+from http_cache import ETagCache
+from quota import QuotaExceededError, QuotaLedger
+from rate_limiter import RateLimiter
+
+CHANNEL_ID = 'UC_test'
+PLAYLIST_ID = 'UU_test'
+VIDEO_IDS = [f'video{i:03d}' for i in range(120)]
+
+
+def video_resource(video_id):
+    return {
+        'id': video_id,
+        'etag': f'etag-{video_id}',
+        'snippet': {'title': f'Title {video_id}', 'description': '', 'tags': [], 'publishedAt': '2024-01-01T00:00:00Z'},
+        'statistics': {'viewCount': '1', 'likeCount': '0', 'commentCount': '0'},
+        'contentDetails': {'duration': 'PT1M'},
+    }
+
+
+class FakeApi(BaseHTTPRequestHandler):
+    """Мінімальний YouTube Data API: channels, playlistItems та videos"""
+
+    requests = []
+    failures = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        resource = url.path.rsplit('/', 1)[-1]
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        FakeApi.requests.append((resource, params))
+
+        failure = FakeApi.failures.get(resource)
+        if failure:
+            status, reason = failure.pop(0)
+            if not failure:
+                del FakeApi.failures[resource]
+            return self._send(status, {'error': {'message': reason, 'errors': [{'reason': reason}]}})
+
+        if resource == 'channels':
+            # ETag тільки в тілі відповіді (без заголовка ETag)
+            if self.headers.get('If-None-Match') == '"channels-etag"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            return self._send(200, {'etag': 'channels-etag', 'items': [{
+                'id': CHANNEL_ID,
+                'etag': 'channel-etag',
+                'snippet': {'title': 'Test channel'},
+                'statistics': {'videoCount': str(len(VIDEO_IDS))},
+                'contentDetails': {'relatedPlaylists': {'uploads': PLAYLIST_ID}},
+            }]})
+        if resource == 'playlistItems':
+            start = int(params.get('pageToken', 0))
+            page = VIDEO_IDS[start:start + 50]
+            body = {'items': [{'contentDetails': {'videoId': video_id}} for video_id in page]}
+            if start + 50 < len(VIDEO_IDS):
+                body['nextPageToken'] = str(start + 50)
+            return self._send(200, body)
+        if resource == 'videos':
+            return self._send(200, {'items': [video_resource(video_id) for video_id in params['id'].split(',')]})
+        return self._send(404, {'error': {'message': 'not found', 'errors': [{'reason': 'notFound'}]}})
+
+
+@pytest.fixture
+def api():
+    FakeApi.requests = []
+    FakeApi.failures = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeApi)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(base_url, **kwargs):
+    kwargs.setdefault('limiter', RateLimiter(base_delay=0.01, max_delay=0.05))
+    return AsyncYouTubeClient('test-key', base_url=base_url, concurrency=4, **kwargs)
+
+
+def resources(name):
+    return [params for resource, params in FakeApi.requests if resource == name]
+
+
+def test_get_playlist_videos_returns_videos_in_playlist_order(api):
+    videos = asyncio.run(make_client(api).get_playlist_videos(PLAYLIST_ID))
+
+    assert [video['id'] for video in videos] == VIDEO_IDS
+    assert len(resources('playlistItems')) == 3
+    assert len(resources('videos')) == 3
+
+
+def test_get_playlist_videos_stops_at_known_video(api):
+    videos = asyncio.run(make_client(api).get_playlist_videos(PLAYLIST_ID, stop_ids={'video060'}))
+
+    assert [video['id'] for video in videos] == VIDEO_IDS[:60]
+    # Третя сторінка вже не потрібна
+    assert len(resources('playlistItems')) == 2
+
+
+def test_server_errors_are_retried_through_limiter(api):
+    FakeApi.failures['videos'] = [(503, 'backendError'), (429, 'rateLimitExceeded')]
+    limiter = RateLimiter(base_delay=0.01, max_delay=0.05)
+
+    videos, missing = asyncio.run(make_client(api, limiter=limiter).fetch_videos_by_ids(VIDEO_IDS[:5]))
+
+    assert [video['id'] for video in videos] == VIDEO_IDS[:5]
+    assert not missing
+    assert sum(limiter.retries.values()) == 2
+
+
+def test_every_attempt_is_charged(api):
+    FakeApi.failures['videos'] = [(503, 'backendError')]
+    ledger = QuotaLedger(path=None, script='test')
+
+    asyncio.run(make_client(api, ledger=ledger).fetch_videos_by_ids(VIDEO_IDS[:5]))
+
+    assert ledger.run_endpoints['youtube.videos.list'] == 2
+
+
+def test_body_etag_is_cached_and_revalidated(api):
+    cache = ETagCache()
+    client = make_client(api, cache=cache)
+
+    first = asyncio.run(client.get_channel(CHANNEL_ID))
+    second = asyncio.run(client.get_channel(CHANNEL_ID))
+
+    assert first == second
+    assert cache.hits == 1
+
+
+def test_quota_error_stops_without_retries(api):
+    FakeApi.failures['videos'] = [(403, 'quotaExceeded')]
+
+    with pytest.raises(QuotaExceededError):
+        asyncio.run(make_client(api).fetch_videos_by_ids(VIDEO_IDS[:5]))
+    assert len(resources('videos')) == 1
+
+
+def test_client_errors_raise_async_api_error(api):
+    with pytest.raises(AsyncApiError) as error:
+        asyncio.run(make_client(api).get('search', q='abc'))
+    assert error.value.status == 404
+    assert error.value.reason == 'notFound'
+
+
+def test_sync_catalog_async_full_then_incremental(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, 'AsyncYouTubeClient', functools.partial(AsyncYouTubeClient, base_url=api))
+    monkeypatch.setattr(catalog, 'get_default_cache', lambda: ETagCache())
+    ledger = QuotaLedger(path=str(tmp_path / 'quota.sqlite3'), script='test')
+    db_path = str(tmp_path / 'catalog.sqlite3')
+
+    stats = catalog.sync_catalog_async('test-key', CHANNEL_ID, db_path=db_path, ledger=ledger)
+    assert stats['new'] == len(VIDEO_IDS)
+    db = catalog.open_catalog(db_path)
+    try:
+        assert db.execute('SELECT COUNT(*) FROM videos').fetchone()[0] == len(VIDEO_IDS)
+    finally:
+        db.close()
+
+    # Інкрементальна синхронізація: перша сторінка містить відомі відео, нових немає
+    FakeApi.requests = []
+    stats = catalog.sync_catalog_async('test-key', CHANNEL_ID, db_path=db_path, ledger=ledger)
+    assert stats['new'] == 0
+    assert stats['unchanged'] == len(VIDEO_IDS)
+    assert len(resources('playlistItems')) == 1
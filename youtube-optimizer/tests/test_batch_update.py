@@ -0,0 +1,46 @@
+import httplib2
+from googleapiclient.errors import HttpError
+
+from batch_update import batch_update_snippets
+from quota import QuotaExceededError
+
+SNIPPET = {'title': 'Old', 'description': 'Old description', 'tags': [], 'categoryId': '27'}
+
+
+class QuotaRequest:
+    headers = {}
+
+    def execute(self):
+        raise QuotaExceededError('денний бюджет вичерпано')
+
+
+class FailingBatch:
+    def add(self, request, request_id=None):
+        pass
+
+    def execute(self):
+        raise HttpError(httplib2.Response({'status': 500}), b'{}')
+
+
+class FakeVideos:
+    def update(self, part, body):
+        return QuotaRequest()
+
+
+class FakeYoutube:
+    def videos(self):
+        return FakeVideos()
+
+    def new_batch_http_request(self, callback):
+        return FailingBatch()
+
+
+def test_quota_during_retry_reports_quota_error():
+    updates = [
+        {'video_id': video_id, 'title': 'New', 'snippet': SNIPPET, 'etag': 'e'}
+        for video_id in ('a', 'b')
+    ]
+    results = batch_update_snippets(FakeYoutube(), updates)
+
+    assert {result['status'] for result in results.values()} == {'quota'}
+    assert all('денний бюджет вичерпано' in result['error'] for result in results.values())
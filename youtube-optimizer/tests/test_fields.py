@@ -0,0 +1,188 @@
+"""Кожен споживач читає з ресурсу тільки поля, оголошені в його масці fields"""
+
+import pytest
+
+import fields
+from analyze_channel import format_channel_data
+from channel_resolver import resolve_channel
+from fix_truncated_titles import build_fixed_title, select_truncated_videos
+from get_playlists import get_channel_playlists
+from optimize_videos import build_video_report
+from video_fetch import format_video_details
+from video_record import VideoRecord
+
+
+class Tracked(dict):
+    """dict, який записує шляхи всіх прочитаних ключів у спільну множину"""
+
+    def __init__(self, data, accessed, path=()):
+        super().__init__()
+        self.accessed = accessed
+        self.path = path
+        for key, value in data.items():
+            dict.__setitem__(self, key, self._wrap(key, value))
+
+    def _wrap(self, key, value):
+        if isinstance(value, dict):
+            return Tracked(value, self.accessed, self.path + (key,))
+        return value
+
+    def __getitem__(self, key):
+        self.accessed.add(self.path + (key,))
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed.add(self.path + (key,))
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.accessed.add(self.path + (key,))
+        return super().__contains__(key)
+
+
+# Повні ресурси API (з полями, яких немає в масках)
+VIDEO = {
+    'kind': 'youtube#video',
+    'id': 'video00001',
+    'etag': 'etag-1',
+    'snippet': {
+        'publishedAt': '2024-01-01T00:00:00Z',
+        'channelId': 'UC1',
+        'title': 'ABC Song...',
+        'description': 'Learn the alphabet with SmartBabies',
+        'thumbnails': {'high': {'url': 'https://example.com/high.jpg'}},
+        'channelTitle': 'SmartBabies',
+        'tags': ['abc', 'alphabet'],
+        'categoryId': '27',
+        'liveBroadcastContent': 'none',
+        'defaultLanguage': 'en',
+        'localized': {'title': 'ABC Song', 'description': ''},
+        'defaultAudioLanguage': 'en',
+    },
+    'statistics': {'viewCount': '100', 'likeCount': '5', 'favoriteCount': '0', 'commentCount': '2'},
+    'contentDetails': {'duration': 'PT3M', 'dimension': '2d', 'definition': 'hd', 'caption': 'false'},
+    'status': {'privacyStatus': 'public', 'madeForKids': True},
+}
+
+CHANNEL = {
+    'kind': 'youtube#channel',
+    'id': 'UC1',
+    'etag': 'etag-channel',
+    'snippet': {
+        'title': 'SmartBabies',
+        'description': 'Kids learning',
+        'customUrl': '@smartbabies',
+        'publishedAt': '2020-01-01T00:00:00Z',
+        'thumbnails': {},
+        'country': 'UA',
+    },
+    'statistics': {'viewCount': '1000', 'subscriberCount': '10', 'hiddenSubscriberCount': False, 'videoCount': '50'},
+    'contentDetails': {'relatedPlaylists': {'likes': '', 'uploads': 'UU1'}},
+    'brandingSettings': {'channel': {'keywords': 'kids abc'}},
+}
+
+PLAYLIST = {
+    'kind': 'youtube#playlist',
+    'id': 'PL1',
+    'etag': 'etag-playlist',
+    'snippet': {'title': 'ABC Songs', 'description': '', 'channelId': 'UC1', 'thumbnails': {}},
+    'contentDetails': {'itemCount': 10},
+}
+
+# snippet каналу не має поля keywords (воно є тільки в brandingSettings), тому
+# format_channel_data завжди отримує '' - поле не потрібно запитувати
+NOT_IN_API = {('snippet', 'keywords')}
+
+
+def mask_paths(spec):
+    return {(part,) + tuple(key.split('/')) for part, keys in spec.items() for key in keys}
+
+
+def assert_within_mask(accessed, spec):
+    allowed = mask_paths(spec)
+    outside = set()
+    for path in accessed - NOT_IN_API:
+        if path[0] in ('id', 'etag'):
+            continue
+        # Шлях дозволено, якщо він всередині поля маски або веде до нього
+        if not any(path[:len(mask)] == mask or mask[:len(path)] == path for mask in allowed):
+            outside.add('.'.join(path))
+    assert not outside, f"поля поза маскою: {sorted(outside)}"
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class FakeYoutube:
+    """Повертає одну сторінку з item для channels().list та playlists().list"""
+
+    def __init__(self, item, accessed):
+        self.item = item
+        self.accessed = accessed
+
+    def _list(self, **kwargs):
+        return FakeRequest({'items': [Tracked(self.item, self.accessed)]})
+
+    def channels(self):
+        return self
+
+    def playlists(self):
+        return self
+
+    def list(self, **kwargs):
+        return self._list(**kwargs)
+
+
+def test_format_video_details_uses_video_details_mask():
+    accessed = set()
+    format_video_details(Tracked(VIDEO, accessed))
+    assert_within_mask(accessed, fields.VIDEO_DETAILS)
+
+
+def test_video_report_uses_video_report_mask():
+    accessed = set()
+    build_video_report(Tracked(VIDEO, accessed))
+    assert_within_mask(accessed, fields.VIDEO_REPORT)
+
+
+def test_truncated_titles_use_truncated_titles_mask():
+    accessed = set()
+    for video in select_truncated_videos([Tracked(VIDEO, accessed)]):
+        build_fixed_title(video['title'], video['description'])
+    assert_within_mask(accessed, fields.TRUNCATED_TITLES)
+
+
+def test_video_record_uses_catalog_mask():
+    accessed = set()
+    VideoRecord.from_resource(Tracked(VIDEO, accessed))
+    assert_within_mask(accessed, fields.CATALOG_VIDEO)
+
+
+def test_format_channel_data_uses_channel_details_mask():
+    accessed = set()
+    format_channel_data(Tracked(CHANNEL, accessed))
+    assert_within_mask(accessed, fields.CHANNEL_DETAILS)
+
+
+def test_resolve_channel_uses_channel_uploads_mask(tmp_path):
+    accessed = set()
+    resolve_channel(FakeYoutube(CHANNEL, accessed), 'UC' + 'x' * 22, cache_path=str(tmp_path / 'channels.json'))
+    assert_within_mask(accessed, fields.CHANNEL_UPLOADS)
+
+
+def test_get_channel_playlists_uses_playlist_titles_mask():
+    accessed = set()
+    get_channel_playlists(FakeYoutube(PLAYLIST, accessed), 'UC1')
+    assert_within_mask(accessed, fields.PLAYLIST_TITLES)
+
+
+@pytest.mark.parametrize('spec', [fields.VIDEO_UPDATE, fields.VIDEO_REPORT, fields.TRUNCATED_TITLES,
+                                  fields.CATALOG_VIDEO])
+def test_snippets_sent_to_update_are_complete(spec):
+    # videos().update перезаписує snippet повністю
+    assert set(fields.VIDEO_UPDATE_SNIPPET) <= set(spec['snippet'])
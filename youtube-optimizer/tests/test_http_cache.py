@@ -0,0 +1,38 @@
+import json
+
+from http_cache import ETagCache, cache_key
+
+URI = 'https://www.googleapis.com/youtube/v3/videos?part=snippet&id=abc&key=SECRET&alt=json'
+
+
+def test_cache_key_strips_api_key():
+    assert cache_key(URI) == 'https://www.googleapis.com/youtube/v3/videos?part=snippet&id=abc&alt=json'
+    assert cache_key('https://example.com/a?part=id') == 'https://example.com/a?part=id'
+
+
+def test_entries_shared_between_api_keys():
+    cache = ETagCache()
+    cache.put(URI, '"e1"', {'status': '200'}, b'{}')
+    assert cache.get(URI.replace('SECRET', 'OTHER'))[0] == '"e1"'
+
+
+def test_saved_file_is_json_without_api_key(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = ETagCache(path=path)
+    cache.put(URI, '"e1"', {'status': '200', 'etag': '"e1"'}, '{"items": ["й"]}'.encode('utf-8'))
+    cache.save()
+
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    assert 'SECRET' not in text
+    json.loads(text)
+
+    loaded = ETagCache(path=path)
+    assert loaded.get(URI) == ('"e1"', {'status': '200', 'etag': '"e1"'}, '{"items": ["й"]}'.encode('utf-8'))
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_bytes(b'\x80\x04not json')
+    cache = ETagCache(path=str(path))
+    assert cache.get(URI) is None
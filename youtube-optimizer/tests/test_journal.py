@@ -0,0 +1,57 @@
+from journal import UpdateJournal
+
+
+def test_resume_skips_videos_of_interrupted_run(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = UpdateJournal(path)
+    journal.result('a', 'updated')
+    journal.result('b', 'failed')
+    journal.close(finished=False)
+
+    resumed = UpdateJournal(path, resume=True)
+    assert resumed.is_done('a')
+    assert not resumed.is_done('b')
+    resumed.close()
+
+
+def test_resume_after_finished_run_skips_nothing(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    with UpdateJournal(path) as journal:
+        journal.result('a', 'updated')
+
+    resumed = UpdateJournal(path, resume=True)
+    assert not resumed.done
+    resumed.close()
+
+
+def test_stopped_run_is_resumable(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = UpdateJournal(path)
+    journal.result('a', 'updated')
+    journal.stop('quota')
+    journal.close()
+
+    resumed = UpdateJournal(path, resume=True)
+    assert resumed.is_done('a')
+    resumed.result('b', 'unchanged')
+    resumed.close(finished=False)
+
+    # Кілька перерваних --resume запусків поспіль накопичують результати
+    again = UpdateJournal(path, resume=True)
+    assert set(again.done) == {'a', 'b'}
+    again.close()
+
+
+def test_new_run_without_resume_resets_skip_list(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    first = UpdateJournal(path)
+    first.result('a', 'updated')
+    first.close(finished=False)
+
+    second = UpdateJournal(path)
+    second.result('b', 'updated')
+    second.close(finished=False)
+
+    resumed = UpdateJournal(path, resume=True)
+    assert set(resumed.done) == {'b'}
+    resumed.close()
@@ -0,0 +1,21 @@
+import json
+
+from description_bundle import DescriptionBundle, DescriptionBundleWriter
+from optimize_videos import _synthetic_videos, iter_video_reports, write_report_jsonl
+
+
+def test_report_rows_have_no_snippet(tmp_path):
+    videos = _synthetic_videos(3)
+    path = str(tmp_path / 'report.jsonl')
+    bundle_path = str(tmp_path / 'descriptions.bundle')
+
+    with DescriptionBundleWriter(bundle_path) as bundle:
+        total, _ = write_report_jsonl(iter_video_reports(videos), path, bundle=bundle)
+
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert total == len(rows) == 3
+    assert all('snippet' not in row for row in rows)
+    assert [row['current_description'] for row in rows] == [video['snippet']['description'] for video in videos]
+    with DescriptionBundle(bundle_path) as descriptions:
+        assert len(descriptions) == 3
@@ -0,0 +1,62 @@
+import multiprocessing
+
+import pytest
+
+from quota import QuotaExceededError, QuotaLedger, quota_day
+
+
+def charge_many(path, script, count):
+    ledger = QuotaLedger(path=path, daily_budget=10 ** 6, script=script)
+    for _ in range(count):
+        ledger.charge('youtube.videos.list')
+    ledger.flush()
+
+
+def test_concurrent_processes_add_up(tmp_path):
+    path = str(tmp_path / 'quota.sqlite3')
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=charge_many, args=(path, f'script{i}', 500)) for i in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    day = QuotaLedger(path=path, script='check').days()[quota_day()]
+    assert day['total'] == 1500
+    assert day['scripts'] == {'script0': 500, 'script1': 500, 'script2': 500}
+
+
+def test_budget_includes_other_processes(tmp_path):
+    path = str(tmp_path / 'quota.sqlite3')
+    first = QuotaLedger(path=path, daily_budget=100, script='first')
+    second = QuotaLedger(path=path, daily_budget=100, script='second')
+    first.charge('youtube.videos.update')
+    first.charge('youtube.videos.update')
+
+    with pytest.raises(QuotaExceededError):
+        second.charge('youtube.videos.list')
+
+
+def test_charges_are_batched(tmp_path, monkeypatch):
+    path = str(tmp_path / 'quota.sqlite3')
+    ledger = QuotaLedger(path=path, daily_budget=10 ** 6, script='test')
+    flushes = []
+    flush = ledger._flush
+    monkeypatch.setattr(ledger, '_flush', lambda: (flushes.append(1), flush()))
+
+    for _ in range(100):
+        ledger.charge('youtube.videos.list')
+    assert len(flushes) < 5
+
+    ledger.flush()
+    assert QuotaLedger(path=path, script='check').used_today() == 100
+
+
+def test_in_memory_ledger():
+    ledger = QuotaLedger(path=None, daily_budget=60, script='test')
+    ledger.charge('youtube.videos.update')
+    with pytest.raises(QuotaExceededError):
+        ledger.charge('youtube.videos.update')
+    assert ledger.remaining() == 10
+    assert ledger.days()[quota_day()]['endpoints'] == {'youtube.videos.update': 50}
@@ -0,0 +1,114 @@
+import json
+import threading
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+import pytest
+
+from http_cache import ETagCache
+from optimize_videos import generate_optimization_report, get_all_videos
+from parallel_fetch import ParallelFetcher
+from quota import QuotaLedger
+from rate_limiter import RateLimiter
+from update_videos import batch_update_videos
+from video_fetch import iter_playlist_videos
+from youtube_client import build_youtube
+
+CHANNEL_ID = 'UC' + 'x' * 22
+PLAYLIST_ID = 'UU' + 'x' * 22
+VIDEO_IDS = [f'video{i:06d}' for i in range(120)]
+
+
+class StubTransport:
+    """Транспорт без мережі: відповідає як YouTube Data API і рахує запити"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        url = urlparse(uri)
+        resource = url.path.rsplit('/', 1)[-1]
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with self._lock:
+            self.calls[f'{resource}.{"list" if method == "GET" else method}'] += 1
+
+        if resource == 'channels':
+            body = {'items': [{'id': CHANNEL_ID,
+                               'contentDetails': {'relatedPlaylists': {'uploads': PLAYLIST_ID}}}]}
+        elif resource == 'playlistItems':
+            start = int(params.get('pageToken', 0))
+            size = int(params.get('maxResults', 50))
+            body = {'items': [{'contentDetails': {'videoId': video_id}}
+                              for video_id in VIDEO_IDS[start:start + size]]}
+            if start + size < len(VIDEO_IDS):
+                body['nextPageToken'] = str(start + size)
+        elif resource == 'videos':
+            body = {'items': [{
+                'id': video_id,
+                'etag': f'etag-{video_id}',
+                'snippet': {'title': f'ABC song {video_id}', 'description': 'Learn the alphabet',
+                            'tags': ['abc'], 'categoryId': '27'},
+                'statistics': {'viewCount': '10', 'likeCount': '1'},
+            } for video_id in params['id'].split(',')]}
+        else:
+            body = {'items': []}
+        return httplib2.Response({'status': '200'}), json.dumps(body).encode('utf-8')
+
+
+@pytest.fixture
+def transport(tmp_path, monkeypatch):
+    # channel_resolver зберігає знайдені канали в поточній папці
+    monkeypatch.chdir(tmp_path)
+    return StubTransport()
+
+
+def make_client(transport):
+    return build_youtube(api_key='test-key', cache=ETagCache(), ledger=QuotaLedger(path=None, script='test'),
+                         limiter=RateLimiter(), http=transport)
+
+
+def test_report_and_preview_read_each_page_once(transport, tmp_path):
+    youtube = make_client(transport)
+    with ParallelFetcher(lambda: youtube, 2) as fetcher:
+        videos = get_all_videos(youtube, CHANNEL_ID, max_results=200, fetcher=fetcher)
+    report = generate_optimization_report(videos)
+    assert len(report['videos']) == len(VIDEO_IDS)
+
+    batch_update_videos(youtube, report['videos'], preview_mode=True, playlists_cache={},
+                        applied_hashes={}, output_dir=str(tmp_path))
+
+    # 120 відео: 3 сторінки playlistItems + 3 videos.list; snippet для оновлення вже є у звіті
+    assert transport.calls['playlistItems.list'] == 3
+    assert transport.calls['videos.list'] == 3
+    assert set(transport.calls) == {'channels.list', 'playlistItems.list', 'videos.list'}
+
+
+def test_serial_report_reads_each_page_once(transport):
+    youtube = make_client(transport)
+    videos = get_all_videos(youtube, CHANNEL_ID, max_results=200)
+    generate_optimization_report(videos)
+
+    assert transport.calls['playlistItems.list'] == 3
+    assert transport.calls['videos.list'] == 3
+
+
+def test_preview_does_not_create_catalog(transport, tmp_path):
+    youtube = make_client(transport)
+    report = generate_optimization_report(get_all_videos(youtube, CHANNEL_ID, max_results=10))
+
+    batch_update_videos(youtube, report['videos'], preview_mode=True, playlists_cache={},
+                        output_dir=str(tmp_path))
+
+    assert not (tmp_path / 'catalog.sqlite3').exists()
+
+
+def test_playlist_videos_stop_at_max_results(transport):
+    youtube = make_client(transport)
+    videos = list(iter_playlist_videos(youtube, PLAYLIST_ID, max_results=60))
+
+    assert [video['id'] for video in videos] == VIDEO_IDS[:60]
+    # Друга сторінка резолвиться тільки на 10 відео, третя не читається
+    assert transport.calls['playlistItems.list'] == 2
+    assert transport.calls['videos.list'] == 2
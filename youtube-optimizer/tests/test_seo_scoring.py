@@ -0,0 +1,76 @@
+import pytest
+
+from analyze_channel import analyze_video_seo
+from seo_scoring import NUMPY_MIN_VIDEOS, analyze_videos_seo, load_columns
+
+# Результати analyze_video_seo до того, як правила залишились тільки в seo_scoring
+CASES = [
+    (
+        {'title': 'ABC', 'description': 'Short description', 'tags': []},
+        {
+            'issues': ['Заголовок занадто короткий (мінімум 30 символів)',
+                       'Опис занадто короткий (17 символів, мінімум 200)',
+                       'Занадто мало тегів (0, рекомендується 10-15)'],
+            'recommendations': ['Додайте назву бренду до заголовку',
+                                'Розширте опис до мінімум 200 символів',
+                                'Додайте посилання на ваш сайт/соцмережі в опис',
+                                'Додайте таймкоди до опису для кращої навігації',
+                                'Додайте хештеги (3-5 штук) в опис відео'],
+            'seo_score': 30,
+        },
+    ),
+    (
+        {'title': 'Learn Colors with ScoopyCap | SmartBabies',
+         'description': 'Learn ABC with ScoopyCap! ' * 12 + 'http://example.com',
+         'tags': [f't{i}' for i in range(12)]},
+        {
+            'issues': [],
+            'recommendations': ['Ідеальний опис для SEO має 1000+ символів',
+                                'Додайте таймкоди до опису для кращої навігації',
+                                'Додайте хештеги (3-5 штук) в опис відео'],
+            'seo_score': 85,
+        },
+    ),
+    (
+        {'title': 'Very long title about a space adventure with rockets, planets and stars for toddlers',
+         'description': 'Educational video for toddlers. ' * 40 + '\n0:00 Intro\n#kids #learning #abc',
+         'tags': [f't{i}' for i in range(18)]},
+        {
+            'issues': ['Заголовок занадто довгий (макс 60 символів для повного відображення)',
+                       'Занадто багато тегів (18, максимум 15)'],
+            'recommendations': ['Додайте назву бренду до заголовку',
+                                'Додайте посилання на ваш сайт/соцмережі в опис'],
+            'seo_score': 60,
+        },
+    ),
+    (
+        {'title': 'Numbers for kids - count to ten with us', 'description': '#діти#пісні #a', 'tags': ['a']},
+        {
+            'issues': ['Опис занадто короткий (14 символів, мінімум 200)',
+                       'Занадто мало тегів (1, рекомендується 10-15)'],
+            'recommendations': ['Додайте назву бренду до заголовку',
+                                'Розширте опис до мінімум 200 символів',
+                                'Додайте посилання на ваш сайт/соцмережі в опис',
+                                'Додайте таймкоди до опису для кращої навігації',
+                                'Додайте хештеги (3-5 штук) в опис відео'],
+            'seo_score': 45,
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize('video, expected', CASES)
+def test_analyze_video_seo(video, expected):
+    assert analyze_video_seo(video) == expected
+
+
+def test_analyze_videos_seo_keeps_order():
+    assert analyze_videos_seo([video for video, _ in CASES]) == [expected for _, expected in CASES]
+
+
+def test_small_and_large_catalogs_score_the_same():
+    videos = [video for video, _ in CASES] * NUMPY_MIN_VIDEOS
+    expected = [expected for _, expected in CASES] * NUMPY_MIN_VIDEOS
+    # Одне відео - колонки-списки, весь каталог - масиви NumPy (якщо він встановлений)
+    assert isinstance(load_columns(videos[:1])['title_length'], list)
+    assert analyze_videos_seo(videos) == expected
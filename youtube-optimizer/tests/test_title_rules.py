@@ -0,0 +1,66 @@
+"""
+Назви, отримані оригінальними optimize_title та fix_truncated_title до перенесення
+правил у title_rules.tsv - таблиця правил має давати ті самі результати
+"""
+
+import pytest
+
+from fix_truncated_titles import fix_truncated_title
+from update_videos import optimize_title
+
+OPTIMIZE_TITLE_GOLDEN = [
+    ('Captain Scoopy Cap presents: ...', 'adventure', '🛸 Captain Scoopy Cap presents: Adventure | SmartBabies'),
+    ('Веселі пісні на Хе...', 'songs', 'Веселі пісні на Хеловін | SmartBabies'),
+    ('Пісня про Хе...', 'songs', 'Пісня про Хеловін | SmartBabies'),
+    ('Хе... та привиди', 'songs', 'Хеловін та привиди | SmartBabies'),
+    ('Learn the Alpa', 'learning', '🔤 Learn the Alphabet | SmartBabies'),
+    ('Five Little Ghos', 'songs', '🎵 Five Little Ghosts | SmartBabies'),
+    ('Kids Songs to Watch', 'songs', '🎵 Kids Songs to Watch Now | SmartBabies'),
+    ('Captain Scoopy Cap presents:', 'adventure', '🛸 Captain Scoopy Cap presents: Adventure | SmartBabies'),
+    ('Пісня про Хе', 'songs', 'Пісня про Хеловін | SmartBabies'),
+    ('Хто боїться привидів?', 'songs', 'Хто боїться привидів? Хеловін | SmartBabies'),
+    ('Танці на Хе', 'songs', 'Танці на Хеловін | SmartBabies'),
+    ('Свято на', 'songs', 'Свято на Хеловін | SmartBabies'),
+    ('Numbers 1 to 10...', 'numbers', '🔢 Numbers 1 to 10 | SmartBabies'),
+    ('Colors for Kids | Learn Colors', 'colors', '🎨 Colors for Kids | SmartBabies Learn Colors'),
+    ('🎵 Wheels on the Bus', 'songs', '🎵 Wheels on the Bus | SmartBabies'),
+    ('ABC Song SmartBabies', 'learning', '🔤 ABC Song SmartBabies'),
+    ('Random video', 'other', '🎯 Random video | SmartBabies'),
+    ('Learn Colors with Balloons and Trucks for Toddlers and Preschool Kids - '
+     'Educational Video for Children of All Ages Best', 'colors',
+     '🎨 Learn Colors with Balloons and Trucks for Toddlers and Preschool Kids - Educational SmartBabies'),
+    ('Хеловін пісня на Хе...', 'songs', 'Хеловін пісня на Хеловін | SmartBabies'),
+    ('Watch ScoopyCap...', 'adventure', '🛸 Watch ScoopyCap'),
+    ('Хе пісня на Хе', 'songs', 'Хеловін пісня на Хеловін | SmartBabies'),
+    ('Alpa and Alpa', 'learning', '🔤 Alphabet and Alphabet | SmartBabies'),
+    ('Хеллоу Хе...', 'songs', 'Хеллоу Хеловін | SmartBabies'),
+    ('Ghos', 'songs', '🎵 Ghosts | SmartBabies'),
+    ('Watch', 'songs', '🎵 Watch Now | SmartBabies'),
+]
+
+TRUNCATED_TITLE_GOLDEN = [
+    ('ABC Song for Kids...', 'ABC Song for Kids'),
+    ('Learn the Alpa... Song', 'Learn the Alphabet'),
+    ('Miss Polly Had A Doll... Song', 'Miss Polly Had A Dolly'),
+    ('Five Little Ghosts... Halloween', 'Five Little Ghosts 👻'),
+    ('Captain Scoopy Cap presents... Episode 1', 'Captain Scoopy Cap presents Adventure'),
+    ('Пісня про Хе... для дітей', 'Пісня про Хеловін'),
+    ('Хто боїться привидів?... Мультик', 'Хто боїться привидів? Хеловін'),
+    ('Numbers... counting', 'Numbers'),
+    ('Complete title', 'Complete title'),
+    ('Colors... and ...shapes...', 'Colors'),
+    ('...', ''),
+    ('Хе... Хе...', 'Хеловін'),
+    ('Хеловін Хе... x', 'Хеловінловін Хеловін'),
+    ('Alpa Alpa... x', 'Alphabet Alphabet'),
+]
+
+
+@pytest.mark.parametrize('title, content_type, expected', OPTIMIZE_TITLE_GOLDEN)
+def test_optimize_title_matches_original(title, content_type, expected):
+    assert optimize_title(title, content_type) == expected
+
+
+@pytest.mark.parametrize('title, expected', TRUNCATED_TITLE_GOLDEN)
+def test_fix_truncated_title_matches_original(title, expected):
+    assert fix_truncated_title(title) == expected
@@ -0,0 +1,64 @@
+import httplib2
+from googleapiclient.errors import HttpError
+
+from fix_truncated_titles import fix_video_title
+from update_videos import update_video_metadata
+
+SNIPPET = {'title': 'Old title', 'description': 'Old description', 'tags': ['old'], 'categoryId': '27'}
+
+
+class FakeRequest:
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    def execute(self):
+        if self.status != 200:
+            raise HttpError(httplib2.Response({'status': self.status}), b'{}')
+        return {}
+
+
+class FakeVideos:
+    def __init__(self, status):
+        self.status = status
+        self.requests = []
+
+    def update(self, part, body):
+        request = FakeRequest(self.status)
+        self.requests.append(request)
+        return request
+
+
+class FakeYoutube:
+    def __init__(self, status=200):
+        self._videos = FakeVideos(status)
+
+    def videos(self):
+        return self._videos
+
+
+def test_update_video_metadata_returns_update_status():
+    assert update_video_metadata(FakeYoutube(200), 'v1', 'New', 'New description', ['new'],
+                                 snippet=SNIPPET, etag='e1') == 'updated'
+    assert update_video_metadata(FakeYoutube(412), 'v1', 'New', 'New description', ['new'],
+                                 snippet=SNIPPET, etag='e1') == 'stale'
+    assert update_video_metadata(FakeYoutube(500), 'v1', 'New', 'New description', ['new'],
+                                 snippet=SNIPPET, etag='e1') == 'failed'
+    youtube = FakeYoutube(200)
+    assert update_video_metadata(youtube, 'v1', 'Old title', 'Old description', ['old'],
+                                 snippet=SNIPPET, etag='e1') == 'unchanged'
+    assert not youtube.videos().requests
+
+
+def test_update_sends_if_match_etag():
+    youtube = FakeYoutube(200)
+    update_video_metadata(youtube, 'v1', 'New', 'New description', ['new'], snippet=SNIPPET, etag='e1')
+    assert youtube.videos().requests[0].headers['If-Match'] == '"e1"'
+
+
+def test_fix_video_title_returns_update_status():
+    status, _ = fix_video_title(FakeYoutube(412), 'v1', 'Old title...', '', snippet=SNIPPET, etag='e1')
+    assert status == 'stale'
+    status, title = fix_video_title(FakeYoutube(200), 'v1', 'Old title...', '', snippet=SNIPPET, etag='e1')
+    assert status == 'updated'
+    assert 'SmartBabies' in title
@@ -0,0 +1,37 @@
+import threading
+
+from google.oauth2.credentials import Credentials
+
+from http_cache import ETagCache
+from quota import QuotaLedger
+from rate_limiter import RateLimiter
+from youtube_client import _StubHttp, build_youtube
+
+
+def make_credentials():
+    return Credentials(token='access', refresh_token='refresh', client_id='client')
+
+
+def test_same_credentials_reuse_client():
+    cache, ledger, limiter = ETagCache(), QuotaLedger(path=None), RateLimiter()
+    first = build_youtube(credentials=make_credentials(), cache=cache, ledger=ledger, limiter=limiter)
+    # Повторне завантаження токена дає новий об'єкт credentials з тим самим обліковим записом
+    second = build_youtube(credentials=make_credentials(), cache=cache, ledger=ledger, limiter=limiter)
+    assert first is second
+
+
+def test_clients_differ_by_key_ledger_and_thread():
+    cache, ledger, limiter, http = ETagCache(), QuotaLedger(path=None), RateLimiter(), _StubHttp()
+    service = build_youtube(api_key='key1', cache=cache, ledger=ledger, limiter=limiter, http=http)
+    assert build_youtube(api_key='key1', cache=cache, ledger=ledger, limiter=limiter, http=http) is service
+    assert build_youtube(api_key='key2', cache=cache, ledger=ledger, limiter=limiter, http=http) is not service
+    assert build_youtube(api_key='key1', cache=cache, ledger=QuotaLedger(path=None),
+                         limiter=limiter, http=http) is not service
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(
+        build_youtube(api_key='key1', cache=cache, ledger=ledger, limiter=limiter, http=http)
+    ))
+    thread.start()
+    thread.join()
+    assert other[0] is not service
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Правила відновлення обрізаних назв (спільні для update_videos.optimize_title
+та fix_truncated_titles.fix_truncated_title)
+Правила читаються з title_rules.tsv; умови всіх правил набору перевіряються
+разом (закінчення - одним str.endswith, входження - одним регулярним виразом),
+тому назви без жодного збігу не проходять по правилах по черзі
+"""
+
+import csv
+import os
+import re
+import time
+from collections import namedtuple
+from keyword_matcher import trie_pattern
+
+TITLE_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'title_rules.tsv')
+
+TitleRule = namedtuple('TitleRule', ['match', 'pattern', 'action', 'value'])
+
+def load_title_rules(path=TITLE_RULES_FILE):
+    """Набори правил з файлу: {set: [TitleRule, ...]} у порядку рядків"""
+    rule_sets = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rows = csv.DictReader((line for line in f if not line.startswith('#')), delimiter='\t')
+        for row in rows:
+            rule = TitleRule(row['match'], row['pattern'], row['action'], row['value'])
+            if rule.match not in ('endswith', 'contains') or rule.action not in ('replace', 'append'):
+                raise ValueError(f"Невідоме правило в {path}: {row}")
+            rule_sets.setdefault(row['set'], []).append(rule)
+    return rule_sets
+
+class TitleRuleSet:
+    """
+    Набір правил з порядком застосування.
+
+    first_match=False - всі правила по черзі, кожне перевіряється на результаті попередніх;
+    first_match=True - застосовується тільки перше правило, умова якого виконується.
+    """
+
+    def __init__(self, rules, first_match=False):
+        self.rules = tuple(rules)
+        self.first_match = first_match
+        # Поки жодне правило не спрацювало, назва не змінюється, тож якщо жодна умова
+        # не виконується для початкової назви, не спрацює і жодне наступне правило.
+        # Закінчення перевіряються одним str.endswith(tuple), входження - одним регулярним виразом
+        self._suffixes = tuple(rule.pattern for rule in self.rules if rule.match == 'endswith')
+        contains = [rule.pattern for rule in self.rules if rule.match == 'contains']
+        self._contains = re.compile(trie_pattern(contains)) if contains else None
+
+    def apply_linear(self, title):
+        """Застосування правил без попередньої перевірки (еталон для benchmark)"""
+        for match, pattern, action, value in self.rules:
+            if title.endswith(pattern) if match == 'endswith' else pattern in title:
+                title = title.replace(pattern, value) if action == 'replace' else title + value
+                if self.first_match:
+                    break
+        return title
+
+    def apply(self, title):
+        """Повертає назву після застосування правил"""
+        if title.endswith(self._suffixes) or (self._contains is not None and self._contains.search(title)):
+            return self.apply_linear(title)
+        return title
+
+_rule_sets = load_title_rules()
+
+# update_videos.optimize_title: всі правила по черзі
+OPTIMIZE_TITLE_RULES = TitleRuleSet(_rule_sets.get('optimize_title', ()))
+# fix_truncated_titles.fix_truncated_title: перше правило для частини назви до "..."
+TRUNCATED_TITLE_RULES = TitleRuleSet(_rule_sets.get('truncated_title', ()), first_match=True)
+
+def _sample_titles(count):
+    """Назви для benchmark: переважно звичайні, частина - обрізані"""
+    titles = [
+        'ABC Song for Kids | Learn the Alphabet with ScoopyCap',
+        'Count to 10 with ScoopyCap | SmartBabies',
+        'Learn Colors for Toddlers - Educational Video for Preschoolers',
+        'Пісенька про кольори для малюків | SmartBabies',
+        'Five Little Ghosts | Halloween Song for Kids',
+    ]
+    truncated = ['Captain Scoopy Cap presents: ...', 'Learn the Alpa', 'Five Little Ghos',
+                 'Хто боїться привидів?', 'Готуємося на Хе...']
+    # Кожна десята назва - обрізана
+    return [truncated[i // 10 % len(truncated)] if i % 10 == 0 else f'{titles[i % len(titles)]} {i}'
+            for i in range(count)]
+
+def benchmark(count=200000):
+    """Швидкість правил з попередньою перевіркою та без неї"""
+    titles = _sample_titles(count)
+    print(f"⏱  Правила назв, {count} назв:")
+    for name, rule_set in (('optimize_title', OPTIMIZE_TITLE_RULES), ('truncated_title', TRUNCATED_TITLE_RULES)):
+        results = []
+        for apply in (rule_set.apply_linear, rule_set.apply):
+            started = time.perf_counter()
+            output = [apply(title) for title in titles]
+            results.append((time.perf_counter() - started, output))
+        (linear_time, expected), (compiled_time, actual) = results
+        print(f"   {name:16} по черзі {count / linear_time:>12,.0f} назв/с   "
+              f"з попередньою перевіркою {count / compiled_time:>12,.0f} назв/с   "
+              f"однаково: {'так' if expected == actual else 'НІ'}")
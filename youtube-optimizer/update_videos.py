@@ -7,49 +7,43 @@
 import json
 import os
 import sys
-import time
 from datetime import datetime
-from googleapiclient.discovery import build
+from youtube_client import build_youtube, print_api_usage
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from auth_setup import get_youtube_service
-from optimize_videos import get_channel_id, get_all_videos, detect_content_type, generate_optimization_report
+from optimize_videos import get_all_videos, detect_content_type, generate_optimization_report
 from generate_description import generate_optimized_description, generate_optimized_tags
 from get_playlists import get_playlists_for_channel
+from catalog import get_catalog_videos, load_applied_hashes, save_applied_hash
+from channel_resolver import get_channel_id
+from parallel_fetch import DEFAULT_WORKERS, ParallelFetcher
+from quota import QuotaExceededError
+from batch_update import (
+    apply_metadata, batch_update_snippets, fetch_update_snippets, metadata_diff, metadata_hash,
+    snippet_hash, update_snippet
+)
+from video_fetch import fetch_videos_by_ids
+from fields import VIDEO_UPDATE, read_params
+from journal import DONE_STATUSES, UpdateJournal
+from title_rules import OPTIMIZE_TITLE_RULES
 
 load_dotenv()
 
+UPDATE_JOURNAL_FILE = 'update_journal.jsonl'
+
+CTA_TEXT = """🎯 Press LIKE if your child enjoyed this video! 
+💬 Comment below what your little one learned today!
+
+"""
+
 def optimize_title(title, content_type):
     """Оптимізує заголовок для максимального CTR БЕЗ обрізання слів"""
     # Спочатку виправляємо обрізані назви
     optimized = title.strip()
     
-    # Відновлюємо відомі обрізані слова ПЕРЕД видаленням "..."
-    if 'presents: ...' in optimized:
-        optimized = optimized.replace('presents: ...', 'presents: Adventure')
-    if 'на Хе...' in optimized:
-        optimized = optimized.replace('на Хе...', 'на Хеловін')
-    if optimized.endswith('Хе...'):
-        optimized = optimized.replace('Хе...', 'Хеловін')
-    if 'Хе...' in optimized:
-        optimized = optimized.replace('Хе...', 'Хеловін')
-    if optimized.endswith('Alpa'):
-        optimized = optimized.replace('Alpa', 'Alphabet')
-    if optimized.endswith('Ghos'):
-        optimized = optimized + 'ts'
-    if optimized.endswith('Watch'):
-        optimized = optimized + ' Now'
-    if optimized.endswith('presents:'):
-        optimized = optimized + ' Adventure'
-    # Українські слова
-    if optimized.endswith('Хе'):
-        optimized = optimized.replace('Хе', 'Хеловін')
-    if optimized.endswith('привидів?'):
-        optimized = optimized + ' Хеловін'
-    if optimized.endswith('на Хе'):
-        optimized = optimized.replace('на Хе', 'на Хеловін')
-    if optimized.endswith('на'):
-        optimized = optimized + ' Хеловін'
+    # Відновлюємо відомі обрізані слова ПЕРЕД видаленням "..." (правила - в title_rules.tsv)
+    optimized = OPTIMIZE_TITLE_RULES.apply(optimized)
     
     # Видаляємо "..." в кінці тільки якщо залишилися
     if optimized.endswith('...'):
@@ -110,23 +104,14 @@ def create_enhanced_description(title, content_type, current_desc, video_id, pla
         # 'website' прибрано - тимчасово недоступний
     }
     
+    # Call-to-action на початку (підвищує retention) - вставляється після першого абзацу
     description = generate_optimized_description(
         title,
         content_type,
-        social_links=social_links
+        social_links=social_links,
+        cta=CTA_TEXT
     )
     
-    # Додаємо call-to-action на початку (підвищує retention)
-    cta_text = f"""🎯 Press LIKE if your child enjoyed this video! 
-💬 Comment below what your little one learned today!
-
-"""
-    
-    # Вставляємо CTA після першого абзацу
-    lines = description.split('\n')
-    if len(lines) > 3:
-        description = '\n'.join(lines[:3]) + '\n' + cta_text + '\n'.join(lines[3:])
-    
     # Отримуємо реальні плейлисти
     if playlists_cache is None and youtube_api:
         try:
@@ -198,45 +183,49 @@ def create_enhanced_description(title, content_type, current_desc, video_id, pla
     
     return description
 
-def update_video_metadata(youtube, video_id, optimized_title, optimized_description, optimized_tags):
-    """Оновлює метадані відео через YouTube API"""
+def update_video_metadata(youtube, video_id, optimized_title, optimized_description, optimized_tags,
+                          snippet=None, etag=None):
+    """
+    Оновлює метадані відео через YouTube API
+
+    snippet та etag - з попереднього читання тільки snippet (fetch_update_snippets);
+    тоді відео не перечитується, а застарілі дані відхиляються через If-Match (412).
+
+    Returns:
+        'updated', 'unchanged', 'stale' (відео змінили після читання) або 'failed'
+    """
     try:
-        # Отримуємо поточні дані відео
-        video_response = youtube.videos().list(
-            part='snippet',
-            id=video_id
-        ).execute()
-        
-        if not video_response['items']:
-            print(f"  ⚠️  Відео {video_id} не знайдено")
-            return False
-        
-        video = video_response['items'][0]
-        snippet = video['snippet']
-        
-        # Оновлюємо метадані
-        snippet['title'] = optimized_title
-        snippet['description'] = optimized_description
-        snippet['tags'] = optimized_tags[:15]  # YouTube обмежує до 15
+        if snippet is None:
+            # Немає даних з попереднього читання - отримуємо поточні
+            videos, _ = fetch_videos_by_ids(youtube, [video_id], **read_params(VIDEO_UPDATE))
+            if not videos:
+                print(f"  ⚠️  Відео {video_id} не знайдено")
+                return 'failed'
+            snippet, etag = videos[0]['snippet'], videos[0].get('etag')
         
-        # Оновлюємо відео
-        update_response = youtube.videos().update(
-            part='snippet',
-            body={
-                'id': video_id,
-                'snippet': snippet
-            }
-        ).execute()
-        
-        return True
+        status = update_snippet(
+            youtube,
+            video_id,
+            snippet,
+            etag,
+            title=optimized_title,
+            description=optimized_description,
+            tags=optimized_tags
+        )
+        if status == 'stale':
+            print(f"  ⚠️  Відео {video_id} змінилося після читання, пропускаю (запустіть ще раз)")
+        elif status == 'unchanged':
+            print(f"  ✓ Метадані вже збігаються")
+        return status
         
     except HttpError as e:
         print(f"  ❌ Помилка оновлення відео {video_id}: {e}")
         if e.resp.status == 403:
             print("  ⚠️  Перевірте права доступу OAuth токену")
-        return False
+        return 'failed'
 
-def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
+def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None, playlists_cache=None,
+                        batch=False, journal=None, applied_hashes=None, output_dir='.'):
     """
     Масове оновлення відео
     
@@ -245,7 +234,18 @@ def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
         videos_data: список словників з даними відео
         preview_mode: якщо True, тільки показує що буде змінено
         limit: максимальна кількість відео для оновлення
+        playlists_cache: вже отримані плейлисти (інакше завантажуються тут)
+        batch: відправляти оновлення HTTP batch запитами (до 50 в одному)
+        journal: UpdateJournal - запис кожного оновлення до та після відправки;
+            відео, вже оновлені в попередньому запуску (--resume), пропускаються
+        applied_hashes: {video_id: metadata_hash} вже застосованих метаданих
+            (за замовчуванням - з каталогу, тільки при оновленні); відео з тими самими
+            метаданими пропускаються
+        output_dir: папка для update_log_*.json
     """
+    if journal is not None and journal.done:
+        videos_data = [v for v in videos_data if not journal.is_done(v['video_id'])]
+    
     if limit:
         videos_data = videos_data[:limit]
     
@@ -263,22 +263,40 @@ def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
         print("Для реального оновлення запустіть з --apply\n")
     
     # Отримуємо реальні плейлисти один раз (для використання API ключа)
-    print("📚 Отримую реальні плейлисти каналу...")
-    playlists_cache = {}
-    try:
-        from dotenv import load_dotenv
-        import os
-        load_dotenv()
-        api_key = os.getenv('YOUTUBE_API_KEY')
-        if api_key:
-            youtube_read = build('youtube', 'v3', developerKey=api_key)
-            playlists_cache = get_playlists_for_channel(youtube_read)
-            print(f"✅ Знайдено {len(playlists_cache)} плейлистів для використання")
-    except Exception as e:
-        print(f"⚠️  Не вдалося отримати плейлисти: {e}")
-        print("   Будуть використовуватись загальні посилання\n")
+    if playlists_cache is None:
+        print("📚 Отримую реальні плейлисти каналу...")
+        playlists_cache = {}
+        try:
+            api_key = os.getenv('YOUTUBE_API_KEY')
+            if api_key:
+                youtube_read = build_youtube(api_key=api_key)
+                playlists_cache = get_playlists_for_channel(youtube_read)
+                print(f"✅ Знайдено {len(playlists_cache)} плейлистів для використання")
+        except Exception as e:
+            print(f"⚠️  Не вдалося отримати плейлисти: {e}")
+            print("   Будуть використовуватись загальні посилання\n")
+    
+    if applied_hashes is None:
+        # Прев'ю нічого не записує, тому й каталог (catalog.sqlite3) не відкриває і не створює
+        applied_hashes = load_applied_hashes() if not preview_mode else {}
+    
+    # Для If-Match потрібен etag з читання тільки snippet (etag звіту включає statistics);
+    # одне читання на 50 відео, відео без свіжих даних перечитуються при оновленні
+    latest = {}
+    if not preview_mode and videos_data:
+        print("🔄 Перечитую snippet відео перед оновленням...")
+        try:
+            latest = fetch_update_snippets(youtube, [video_info['video_id'] for video_info in videos_data])
+        except QuotaExceededError as e:
+            print(f"⛔ {e}")
+            print("Відео буде оновлено після скидання квоти")
+            if journal is not None:
+                journal.stop(str(e))
+            return
     
     changes_log = []
+    pending_updates = []
+    generated_hashes = {}
     
     for i, video_info in enumerate(videos_data, 1):
         video_id = video_info['video_id']
@@ -301,10 +319,35 @@ def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
         print(f"\n[{i}/{total}] {current_title[:50]}...")
         print(f"  ID: {video_id}")
         
+        # Ті самі метадані вже відправлялись раніше - запис не потрібен
+        generated_hash = metadata_hash(optimized_title, optimized_description, optimized_tags)
+        if applied_hashes.get(video_id) == generated_hash:
+            print(f"  ✓ Ці метадані вже застосовано")
+            continue
+        
+        snippet = video_info.get('snippet')
+        etag = video_info.get('etag')
+        if not preview_mode:
+            video = latest.get(video_id)
+            snippet, etag = (video['snippet'], video.get('etag')) if video else (None, None)
+        current_snippet = snippet or {
+            'title': current_title,
+            'description': video_info.get('current_description', ''),
+            'tags': video_info['current'].get('tags', [])
+        }
+        if snippet_hash(current_snippet) == generated_hash:
+            print(f"  ✓ Вже оптимізовано")
+            continue
+        generated_hashes[video_id] = generated_hash
+        
         # Показуємо зміни
-        title_changed = current_title != optimized_title
-        desc_changed = len(optimized_description) != current_desc_len
-        tags_changed = len(optimized_tags) != current_tags_count
+        diff = metadata_diff(
+            current_snippet,
+            apply_metadata(current_snippet, optimized_title, optimized_description, optimized_tags)
+        )
+        title_changed = 'title' in diff
+        desc_changed = 'description' in diff
+        tags_changed = 'tags' in diff
         
         if title_changed:
             print(f"  📝 Заголовок:")
@@ -321,39 +364,93 @@ def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
             print(f"     Було: {current_tags_count} тегів")
             print(f"     Стане: {len(optimized_tags)} тегів")
         
-        if not title_changed and not desc_changed and not tags_changed:
-            print(f"  ✓ Вже оптимізовано")
-            continue
-        
-        if not preview_mode:
+        update_status = 'preview'
+        if not preview_mode and batch:
+            print(f"  📦 Додано до пакетного оновлення")
+            update_status = 'pending'
+            pending_updates.append({
+                'video_id': video_id,
+                'title': optimized_title,
+                'description': optimized_description,
+                'tags': optimized_tags,
+                'snippet': snippet,
+                'etag': etag
+            })
+            if journal is not None:
+                journal.planned(video_id, title=optimized_title, description=optimized_description,
+                                tags=optimized_tags)
+        elif not preview_mode:
             print(f"  🔄 Оновлюю...")
-            success = update_video_metadata(
-                youtube,
-                video_id,
-                optimized_title,
-                optimized_description,
-                optimized_tags
-            )
+            if journal is not None:
+                journal.planned(video_id, title=optimized_title, description=optimized_description,
+                                tags=optimized_tags)
+            try:
+                update_status = update_video_metadata(
+                    youtube,
+                    video_id,
+                    optimized_title,
+                    optimized_description,
+                    optimized_tags,
+                    snippet=snippet,
+                    etag=etag
+                )
+            except QuotaExceededError as e:
+                print(f"  ⛔ {e}")
+                print("  Решту відео буде оновлено після скидання квоти")
+                if journal is not None:
+                    journal.result(video_id, 'quota', str(e))
+                    journal.stop(str(e))
+                break
             
-            if success:
+            if update_status in DONE_STATUSES:
                 updated += 1
-                print(f"  ✅ Оновлено успішно!")
-                time.sleep(1)  # Затримка щоб не перевищити rate limits
+                save_applied_hash(video_id, generated_hash)
+                if update_status == 'updated':
+                    print(f"  ✅ Оновлено успішно!")
             else:
                 failed += 1
-                print(f"  ❌ Помилка оновлення")
+                if update_status == 'failed':
+                    print(f"  ❌ Помилка оновлення")
+            if journal is not None:
+                journal.result(video_id, update_status)
         
         changes_log.append({
             'video_id': video_id,
             'title': current_title,
             'optimized_title': optimized_title,
             'title_changed': title_changed,
-            'description_length_changed': desc_changed,
-            'tags_count_changed': tags_changed
+            'description_changed': desc_changed,
+            'tags_changed': tags_changed,
+            'update_status': update_status
         })
     
+    if pending_updates:
+        print(f"\n📦 Пакетне оновлення {len(pending_updates)} відео...")
+        results = batch_update_snippets(youtube, pending_updates)
+        quota_errors = [result['error'] for result in results.values() if result['status'] == 'quota']
+        if quota_errors:
+            print(f"  ⛔ Квоту вичерпано, не оновлено {len(quota_errors)} відео - "
+                  f"решту буде оновлено після скидання квоти")
+            if journal is not None:
+                journal.stop(quota_errors[0])
+        for change in changes_log:
+            result = results.get(change['video_id'])
+            if change['update_status'] != 'pending' or result is None:
+                continue
+            change['update_status'] = result['status']
+            change['retried'] = result['retried']
+            if journal is not None:
+                journal.result(change['video_id'], result['status'], result['error'])
+            if result['success']:
+                updated += 1
+                save_applied_hash(change['video_id'], generated_hashes[change['video_id']])
+            else:
+                failed += 1
+                change['error'] = result['error']
+                print(f"  ❌ {change['video_id']}: {result['error']}")
+    
     # Збереження логу
-    log_file = f"update_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    log_file = os.path.join(output_dir, f"update_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
     with open(log_file, 'w', encoding='utf-8') as f:
         json.dump({
             'timestamp': datetime.now().isoformat(),
@@ -375,6 +472,7 @@ def batch_update_videos(youtube, videos_data, preview_mode=True, limit=None):
         print(f"   Помилок: {failed}")
         print(f"   Лог збережено в {log_file}")
     print(f"{'='*70}")
+    print_api_usage()
 
 def main():
     import argparse
@@ -397,6 +495,32 @@ def main():
         action='store_true',
         help='Оновити тільки відео з високим пріоритетом (3+ проблем)'
     )
+    parser.add_argument(
+        '--catalog',
+        action='store_true',
+        help='Читати відео з локального каталогу (з інкрементальною синхронізацією)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Відправляти оновлення HTTP batch запитами (до 50 відео в одному запиті)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Кількість паралельних потоків для читання з API'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продовжити перерваний запуск: пропустити відео, вже оновлені за журналом'
+    )
+    parser.add_argument(
+        '--journal',
+        default=UPDATE_JOURNAL_FILE,
+        help='Файл журналу оновлень (JSON Lines)'
+    )
     
     args = parser.parse_args()
     
@@ -409,7 +533,7 @@ def main():
         return
     
     # Створюємо сервіс для читання
-    youtube_read = build('youtube', 'v3', developerKey=api_key)
+    youtube_read = build_youtube(api_key=api_key)
     channel_handle = os.getenv('CHANNEL_ID', '@SmartBabies')
     
     channel_id = get_channel_id(youtube_read, channel_handle)
@@ -417,9 +541,22 @@ def main():
         print(f"❌ Канал {channel_handle} не знайдено")
         return
     
-    # Отримуємо всі відео
-    print(f"📥 Отримую дані відео...")
-    videos = get_all_videos(youtube_read, channel_id, max_results=200)
+    # Отримуємо всі відео та плейлисти паралельно (кожен потік - зі своїм клієнтом)
+    print(f"📥 Отримую дані відео та плейлисти...")
+    with ParallelFetcher(lambda: build_youtube(api_key=api_key), args.workers) as fetcher:
+        playlists_future = fetcher.submit(get_playlists_for_channel, channel_handle)
+        if args.catalog:
+            videos = get_catalog_videos(youtube_read, channel_id, max_results=200)
+        else:
+            videos = get_all_videos(youtube_read, channel_id, max_results=200, fetcher=fetcher)
+        
+        try:
+            playlists_cache = playlists_future.result()
+            print(f"✅ Знайдено {len(playlists_cache)} плейлистів для використання")
+        except Exception as e:
+            playlists_cache = {}
+            print(f"⚠️  Не вдалося отримати плейлисти: {e}")
+            print("   Будуть використовуватись загальні посилання")
     
     if not videos:
         print("❌ Відео не знайдено")
@@ -429,18 +566,10 @@ def main():
     
     # Генеруємо оптимізаційний звіт
     print(f"🔧 Аналізую та оптимізую метадані...")
+    # Звіт містить повний snippet кожного відео (опис, теги, ETag) -
+    # повторно читати відео для оновлення не потрібно
     report = generate_optimization_report(videos)
     
-    # Отримуємо описи для кращої оптимізації
-    for video_info in report['videos']:
-        video_id = video_info['video_id']
-        video_response = youtube_read.videos().list(
-            part='snippet',
-            id=video_id
-        ).execute()
-        if video_response['items']:
-            video_info['current_description'] = video_response['items'][0]['snippet']['description']
-    
     # Фільтруємо за пріоритетом якщо потрібно
     if args.priority:
         report['videos'] = [v for v in report['videos'] if v['priority'] >= 3]
@@ -456,13 +585,29 @@ def main():
             print("📝 Запустіть спочатку: python3 auth_setup.py")
             return
     
+    # Журнал ведеться тільки для реальних оновлень
+    journal = UpdateJournal(args.journal, resume=args.resume) if args.apply else None
+    if journal is not None and journal.done:
+        print(f"⏭  За журналом вже оновлено {len(journal.done)} відео - їх буде пропущено")
+    
     # Виконуємо оновлення
-    batch_update_videos(
-        youtube_write or youtube_read,  # Використовуємо write тільки для реальних оновлень
-        report['videos'],
-        preview_mode=not args.apply,
-        limit=args.limit
-    )
+    try:
+        batch_update_videos(
+            youtube_write or youtube_read,  # Використовуємо write тільки для реальних оновлень
+            report['videos'],
+            preview_mode=not args.apply,
+            limit=args.limit,
+            playlists_cache=playlists_cache,
+            batch=args.batch,
+            journal=journal
+        )
+    except BaseException:
+        # Запуск перервався - без finish, щоб --resume міг його продовжити
+        if journal is not None:
+            journal.close(finished=False)
+        raise
+    if journal is not None:
+        journal.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Пакетне отримання даних відео через YouTube Data API
+videos().list приймає до 50 ID через кому - один запит замість 50
+"""
+
+from fields import PLAYLIST_PAGE_FIELDS
+from video_record import VideoRecord
+
+# YouTube дозволяє максимум 50 ID в одному videos().list
+MAX_IDS_PER_REQUEST = 50
+
+def chunked(items, size=MAX_IDS_PER_REQUEST):
+    """Розбиває список на частини по size елементів"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def fetch_videos_by_ids(youtube, video_ids, part='snippet,statistics,contentDetails', fields=None):
+    """
+    Отримує відео пачками по 50 ID.
+    fields - часткова відповідь (див. fields.read_params).
+
+    Returns:
+        (videos, missing_ids) - відео в порядку video_ids та ID, яких API не повернув
+    """
+    found = {}
+    for chunk in chunked(list(video_ids)):
+        response = youtube.videos().list(
+            part=part,
+            id=','.join(chunk),
+            maxResults=len(chunk),
+            fields=fields
+        ).execute()
+        for item in response.get('items', []):
+            found[item['id']] = item
+
+    videos = []
+    missing_ids = []
+    for video_id in video_ids:
+        if video_id in found:
+            videos.append(found[video_id])
+        else:
+            missing_ids.append(video_id)
+    return videos, missing_ids
+
+def iter_playlist_pages(youtube, playlist_id, max_results=None):
+    """Генератор сторінок плейлиста: список ID відео на кожну сторінку playlistItems"""
+    collected = 0
+    next_page_token = None
+
+    while max_results is None or collected < max_results:
+        page_size = 50 if max_results is None else min(50, max_results - collected)
+        response = youtube.playlistItems().list(
+            part='contentDetails',
+            playlistId=playlist_id,
+            maxResults=page_size,
+            pageToken=next_page_token,
+            fields=PLAYLIST_PAGE_FIELDS
+        ).execute()
+
+        page_ids = [item['contentDetails']['videoId'] for item in response['items']]
+        collected += len(page_ids)
+        yield page_ids
+
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            break
+
+def iter_playlist_videos(youtube, playlist_id, part='snippet,statistics,contentDetails',
+                         max_results=None, missing_ids=None, fields=None):
+    """
+    Генератор відео з плейлиста (наприклад uploads).
+
+    Кожна сторінка iter_playlist_pages одразу резолвиться одним videos().list.
+    ID, яких немає у відповіді (видалені/приватні), додаються в missing_ids
+    і не враховуються в max_results - тоді читається наступна сторінка.
+    """
+    if max_results is not None and max_results <= 0:
+        return
+    yielded = 0
+    for page_ids in iter_playlist_pages(youtube, playlist_id):
+        if max_results is not None:
+            page_ids = page_ids[:max_results - yielded]
+        videos, missing = fetch_videos_by_ids(youtube, page_ids, part=part, fields=fields)
+        if missing_ids is not None:
+            missing_ids.extend(missing)
+        yielded += len(videos)
+        yield from videos
+        if max_results is not None and yielded >= max_results:
+            return
+
+def format_video_details(video):
+    """Перетворює відповідь videos().list (або VideoRecord) у запис для аналізу"""
+    if isinstance(video, VideoRecord):
+        return video.to_details()
+    snippet = video['snippet']
+    stats = video['statistics']
+
+    return {
+        'id': video['id'],
+        'title': snippet['title'],
+        'description': snippet['description'],
+        'tags': snippet.get('tags', []),
+        'published_at': snippet['publishedAt'],
+        'views': int(stats.get('viewCount', 0)),
+        'likes': int(stats.get('likeCount', 0)),
+        'comments': int(stats.get('commentCount', 0)),
+        'duration': video['contentDetails']['duration'],
+        'category_id': snippet.get('categoryId', ''),
+        'thumbnails': snippet.get('thumbnails', {}),
+        'has_custom_thumbnail': 'high' in snippet.get('thumbnails', {})
+    }
+
+def report_missing(missing_ids):
+    """Виводить ID відео, які не вдалося отримати"""
+    if missing_ids:
+        print(f"⚠️  API не повернув {len(missing_ids)} відео: {', '.join(missing_ids[:10])}"
+              f"{'...' if len(missing_ids) > 10 else ''}")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Компактний запис відео замість вкладених словників відповіді API
+Зберігає тільки поля, які використовують скрипти; теги інтерновані,
+а опис може читатися з каталогу тільки при першому зверненні.
+Запис також підтримує доступ за ключем (video['snippet'], video['title']),
+тому його приймають функції, які працюють з відповіддю videos().list
+або з video_fetch.format_video_details
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from fields import CATALOG_VIDEO, VIDEO_UPDATE_SNIPPET
+
+class VideoRecord:
+    """
+    Відео з полями snippet/statistics/contentDetails, які використовуються в проекті.
+
+    description_loader - функція video_id -> опис; якщо задана, опис не зберігається
+    в записі до першого звернення до description
+    """
+
+    __slots__ = ('id', 'etag', 'title', 'tags', 'category_id', 'default_language', 'default_audio_language',
+                 'published_at', 'views', 'likes', 'comments', 'duration', 'has_custom_thumbnail',
+                 '_description', '_description_loader')
+
+    def __init__(self, id, title, description=None, tags=(), etag=None, category_id=None,
+                 default_language=None, default_audio_language=None, published_at=None,
+                 views=0, likes=0, comments=0, duration=None, has_custom_thumbnail=False,
+                 description_loader=None):
+        self.id = id
+        self.etag = etag
+        self.title = title
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+        self.category_id = category_id
+        self.default_language = default_language
+        self.default_audio_language = default_audio_language
+        self.published_at = published_at
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.duration = duration
+        self.has_custom_thumbnail = has_custom_thumbnail
+        self._description = description
+        self._description_loader = description_loader
+
+    @classmethod
+    def from_resource(cls, video, description_loader=None):
+        """Запис з ресурсу videos().list (запис повертається без змін)"""
+        if isinstance(video, cls):
+            return video
+        snippet = video['snippet']
+        stats = video.get('statistics', {})
+        return cls(
+            id=video['id'],
+            etag=video.get('etag'),
+            title=snippet['title'],
+            description=None if description_loader else snippet.get('description', ''),
+            tags=snippet.get('tags', ()),
+            category_id=snippet.get('categoryId'),
+            default_language=snippet.get('defaultLanguage'),
+            default_audio_language=snippet.get('defaultAudioLanguage'),
+            published_at=snippet.get('publishedAt'),
+            views=int(stats.get('viewCount', 0)),
+            likes=int(stats.get('likeCount', 0)),
+            comments=int(stats.get('commentCount', 0)),
+            duration=video.get('contentDetails', {}).get('duration'),
+            has_custom_thumbnail='high' in snippet.get('thumbnails', {}),
+            description_loader=description_loader,
+        )
+
+    @property
+    def description(self):
+        if self._description is None:
+            self._description = self._description_loader(self.id) if self._description_loader else ''
+        return self._description
+
+    def unload_description(self):
+        """Звільняє опис (буде прочитаний повторно при потребі; тільки з description_loader)"""
+        if self._description_loader is not None:
+            self._description = None
+
+    @property
+    def snippet(self):
+        """
+        snippet у форматі API з полями, які приймає videos().update (VIDEO_UPDATE_SNIPPET).
+        Щоразу новий словник, тому його можна змінювати і відправляти в update
+        """
+        values = {
+            'title': self.title,
+            'description': self.description,
+            'tags': list(self.tags) if self.tags else None,
+            'categoryId': self.category_id,
+            'defaultLanguage': self.default_language,
+            'defaultAudioLanguage': self.default_audio_language,
+        }
+        return {key: values[key] for key in VIDEO_UPDATE_SNIPPET if values[key] is not None}
+
+    @property
+    def statistics(self):
+        return {'viewCount': str(self.views), 'likeCount': str(self.likes), 'commentCount': str(self.comments)}
+
+    @property
+    def content_details(self):
+        return {'duration': self.duration} if self.duration is not None else {}
+
+    def to_details(self):
+        """Словник у форматі video_fetch.format_video_details (thumbnails не зберігаються)"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'tags': list(self.tags),
+            'published_at': self.published_at,
+            'views': self.views,
+            'likes': self.likes,
+            'comments': self.comments,
+            'duration': self.duration,
+            'category_id': self.category_id or '',
+            'thumbnails': {},
+            'has_custom_thumbnail': self.has_custom_thumbnail
+        }
+
+    # Доступ за ключем: ключі ресурсу videos().list та format_video_details
+    _KEYS = {
+        'id': lambda record: record.id,
+        'etag': lambda record: record.etag,
+        'snippet': lambda record: record.snippet,
+        'statistics': lambda record: record.statistics,
+        'contentDetails': lambda record: record.content_details,
+        'title': lambda record: record.title,
+        'description': lambda record: record.description,
+        'tags': lambda record: record.tags,
+        'published_at': lambda record: record.published_at,
+        'views': lambda record: record.views,
+        'likes': lambda record: record.likes,
+        'comments': lambda record: record.comments,
+        'duration': lambda record: record.duration,
+        'category_id': lambda record: record.category_id or '',
+        'has_custom_thumbnail': lambda record: record.has_custom_thumbnail,
+    }
+
+    def __getitem__(self, key):
+        getter = self._KEYS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self)
+
+    def get(self, key, default=None):
+        getter = self._KEYS.get(key)
+        return default if getter is None else getter(self)
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def __repr__(self):
+        return f"VideoRecord({self.id!r}, {self.title!r})"
+
+def to_records(videos, description_loader=None):
+    """Список записів з ресурсів videos().list"""
+    return [VideoRecord.from_resource(video, description_loader) for video in videos]
+
+def _synthetic_resources(count):
+    """Ресурси videos().list з повним snippet (як повертає API без fields=)"""
+    tag_pool = ['kids songs', 'nursery rhymes', 'SmartBabies', 'ScoopyCap', 'preschool', 'toddler learning',
+                'abc song', 'learn colors', 'educational videos for kids', 'baby songs']
+    description = ('Learn with SmartBabies! Educational content for preschoolers and toddlers. ' * 8
+                   + '#KidsEducation #SmartBabies')
+    return [{
+        'kind': 'youtube#video',
+        'etag': f'etag-{i:06d}-abcdefghijklmnopqrstuvwx',
+        'id': f'vid{i:08d}',
+        'snippet': {
+            'publishedAt': '2024-01-01T00:00:00Z',
+            'channelId': 'UCPBKtZdTxxqxU3c8iR44uhw',
+            'title': f'ABC Song for Kids | Learn with ScoopyCap {i}',
+            'description': description + f' {i}',
+            'thumbnails': {size: {'url': f'https://i.ytimg.com/vi/vid{i:08d}/{size}.jpg', 'width': 480, 'height': 360}
+                           for size in ('default', 'medium', 'high', 'standard', 'maxres')},
+            'channelTitle': 'SmartBabies',
+            # Теги приходять окремими рядками в кожній відповіді
+            'tags': [''.join(tag) for tag in tag_pool[i % 3:i % 3 + 8]],
+            'categoryId': '27',
+            'liveBroadcastContent': 'none',
+            'defaultAudioLanguage': 'en',
+            'localized': {'title': f'ABC Song for Kids | Learn with ScoopyCap {i}', 'description': description},
+        },
+        'statistics': {'viewCount': str(i * 13), 'likeCount': str(i % 500), 'favoriteCount': '0',
+                       'commentCount': str(i % 40)},
+        'contentDetails': {'duration': 'PT3M12S', 'dimension': '2d', 'definition': 'hd', 'caption': 'false',
+                           'licensedContent': True, 'contentRating': {}, 'projection': 'rectangular'},
+    } for i in range(count)]
+
+def _measure(build):
+    """Результат build() та пам'ять, яка залишилась зайнятою після нього"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+def benchmark(count=100000):
+    """Пам'ять на відео: ресурси API проти VideoRecord (з описом та з відкладеним описом)"""
+    # Відео розбираються з JSON, як з відповіді API або з рядків каталогу,
+    # тому кожне відео має власні копії рядків (в тому числі тегів)
+    resources = _synthetic_resources(count)
+    rows = [json.dumps(video, ensure_ascii=False) for video in resources]
+    # Ті самі відео з полями, які запитує каталог (fields.CATALOG_VIDEO)
+    masked_rows = [json.dumps(dict(
+        {'id': video['id'], 'etag': video['etag']},
+        **{part: {key: video[part][key] for key in keys if key in video[part]} for part, keys in CATALOG_VIDEO.items()}
+    ), ensure_ascii=False) for video in resources]
+    del resources
+    descriptions = {}
+
+    def load_description(video_id):
+        return descriptions[video_id]
+
+    def lazy_records():
+        records = []
+        for row in rows:
+            video = json.loads(row)
+            del video['snippet']['description']
+            records.append(VideoRecord.from_resource(video, description_loader=load_description))
+        return records
+
+    variants = (
+        ('ресурси videos().list', lambda: [json.loads(row) for row in rows]),
+        ('ресурси з fields= каталогу', lambda: [json.loads(row) for row in masked_rows]),
+        ('VideoRecord з описом', lambda: [VideoRecord.from_resource(json.loads(row)) for row in rows]),
+        ('VideoRecord, опис при зверненні', lazy_records),
+    )
+    print(f"🧮 Пам'ять для {count} синтетичних відео:")
+    for name, build in variants:
+        videos, size, elapsed = _measure(build)
+        del videos
+        print(f"   {name:34} {size / 2 ** 20:8.1f} MB  ({size / count:6.0f} байт/відео)  {elapsed:6.2f} с")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Створення YouTube API клієнтів для всіх скриптів
+Всі клієнти працюють через спільний ETag кеш (http_cache.py)
+журнал квоти (quota.py) та обмежувач швидкості (rate_limiter.py).
+Discovery документ читається локально один раз, а готові клієнти
+перевикористовуються (окремо для кожного потоку)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import httplib2
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
+from google_auth_httplib2 import AuthorizedHttp
+from dotenv import load_dotenv
+from http_cache import ETagCache, CachingHttp, DEFAULT_MAX_BYTES, print_cache_stats
+from quota import QuotaLedger
+from rate_limiter import RateLimiter
+
+load_dotenv()
+
+API_CACHE_FILE = os.getenv('YOUTUBE_API_CACHE', '.youtube_api_cache.json')
+API_CACHE_MAX_BYTES = int(os.getenv('YOUTUBE_API_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+# Локальна копія discovery документа (за замовчуванням - документ з google-api-python-client)
+DISCOVERY_FILE = os.getenv('YOUTUBE_DISCOVERY_FILE', '')
+
+_default_cache = None
+_default_ledger = None
+_default_limiter = None
+_defaults_lock = threading.Lock()
+
+_discovery_document = None
+# Готові клієнти: (ключ або відбиток OAuth токена, ledger, limiter, cache, транспорт, потік) -> клієнт.
+# Самі об'єкти в ключі (а не їх id()) не дають ключу збігтися з новим об'єктом за тією ж адресою
+_services = {}
+_services_lock = threading.Lock()
+
+def get_discovery_document():
+    """
+    Discovery документ YouTube Data API v3 (розібраний JSON, читається один раз).
+    None якщо локальної копії немає - тоді build() завантажить його з мережі.
+    """
+    global _discovery_document
+    with _defaults_lock:
+        if _discovery_document is None:
+            if DISCOVERY_FILE and os.path.exists(DISCOVERY_FILE):
+                with open(DISCOVERY_FILE, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            else:
+                content = get_static_doc('youtube', 'v3')
+            if content:
+                _discovery_document = json.loads(content)
+    return _discovery_document
+
+def get_default_cache():
+    """Спільний кеш процесу, зберігається на диск при завершенні"""
+    global _default_cache
+    with _defaults_lock:
+        if _default_cache is None:
+            _default_cache = ETagCache(API_CACHE_FILE, max_bytes=API_CACHE_MAX_BYTES)
+            atexit.register(_default_cache.save)
+    return _default_cache
+
+def get_default_ledger():
+    """Спільний журнал квоти процесу"""
+    global _default_ledger
+    with _defaults_lock:
+        if _default_ledger is None:
+            _default_ledger = QuotaLedger()
+    return _default_ledger
+
+def get_default_limiter():
+    """Спільний обмежувач швидкості процесу"""
+    global _default_limiter
+    with _defaults_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+    return _default_limiter
+
+def _credentials_fingerprint(credentials):
+    """Відбиток облікового запису: однаковий після повторного завантаження token.pickle"""
+    secret = getattr(credentials, 'refresh_token', None) or getattr(credentials, 'token', None)
+    if not secret:
+        return credentials
+    client_id = getattr(credentials, 'client_id', None) or ''
+    return ('oauth', hashlib.sha256(f"{client_id}\0{secret}".encode('utf-8')).hexdigest())
+
+def build_youtube(api_key=None, credentials=None, cache=None, ledger=None, limiter=None, http=None):
+    """
+    Повертає YouTube Data API v3 клієнт з ETag кешем та обліком квоти.
+
+    Повторний виклик з тим самим ключем або OAuth токеном (та тими самими
+    cache, ledger, limiter і http) в тому ж потоці повертає вже створений клієнт.
+    Між потоками клієнти не діляться, бо httplib2 не потокобезпечний.
+
+    Args:
+        api_key: API ключ (для читання)
+        credentials: OAuth credentials (для редагування)
+        cache: ETagCache; за замовчуванням - спільний кеш процесу
+        ledger: QuotaLedger; за замовчуванням - спільний журнал процесу
+        limiter: RateLimiter; за замовчуванням - спільний обмежувач процесу
+        http: транспорт під кешем (за замовчуванням build_http())
+    """
+    cache = cache or get_default_cache()
+    ledger = ledger or get_default_ledger()
+    limiter = limiter or get_default_limiter()
+
+    account = _credentials_fingerprint(credentials) if credentials is not None else ('key', api_key)
+    key = (account, ledger, limiter, cache, http, threading.get_ident())
+    with _services_lock:
+        service = _services.get(key)
+    if service is not None:
+        return service
+
+    http = CachingHttp(http or build_http(), cache)
+    if credentials is not None:
+        http = AuthorizedHttp(credentials, http=http)
+        api_key = None
+
+    document = get_discovery_document()
+    if document is not None:
+        service = build_from_document(document, developerKey=api_key, http=http,
+                                      requestBuilder=ledger.request_builder(limiter))
+    else:
+        service = build('youtube', 'v3', developerKey=api_key, http=http,
+                        requestBuilder=ledger.request_builder(limiter))
+    with _services_lock:
+        return _services.setdefault(key, service)
+
+def print_api_usage():
+    """Підсумок використання API в кінці запуску"""
+    if _default_cache is not None:
+        print_cache_stats(_default_cache)
+    if _default_ledger is not None:
+        _default_ledger.print_summary()
+    if _default_limiter is not None:
+        _default_limiter.print_summary()
+
+class _StubHttp:
+    """Транспорт без мережі для вимірювання накладних витрат клієнта"""
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        return httplib2.Response({'status': '200'}), b'{"items": []}'
+
+def _first_request(service):
+    service.videos().list(part='snippet', id='dQw4w9WgXcQ').execute()
+
+def benchmark(runs=20):
+    """
+    Час до першого запиту: створення клієнта + videos().list().execute()
+    з транспортом без мережі, тобто тільки витрати на стороні клієнта.
+    """
+    cache = ETagCache(None)
+    ledger = QuotaLedger(path=None, daily_budget=10 ** 9)
+    limiter = RateLimiter()
+
+    def measure(make_service):
+        started = time.perf_counter()
+        for _ in range(runs):
+            _first_request(make_service())
+        return (time.perf_counter() - started) / runs * 1000
+
+    def old_build():
+        return build('youtube', 'v3', developerKey='key', http=CachingHttp(_StubHttp(), cache),
+                     requestBuilder=ledger.request_builder(limiter))
+
+    def cold_build():
+        global _discovery_document
+        _discovery_document = None
+        _services.clear()
+        return build_youtube(api_key='key', cache=cache, ledger=ledger, limiter=limiter, http=stub)
+
+    stub = _StubHttp()
+    results = [
+        ('build() при кожному виклику', measure(old_build)),
+        ('build_youtube, перший виклик', measure(cold_build)),
+        ('build_youtube, повторний виклик', measure(
+            lambda: build_youtube(api_key='key', cache=cache, ledger=ledger, limiter=limiter, http=stub)
+        )),
+    ]
+    print(f"⏱  Час до першого запиту (середнє з {runs} запусків, без мережі):")
+    for name, ms in results:
+        print(f"   {name:34} {ms:8.2f} мс")